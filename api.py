@@ -1,28 +1,170 @@
-from flask import Blueprint, request, jsonify
-from game_engine import GameEngine
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import Blueprint, Response, current_app, request, jsonify
+from game_engine import GameEngine, configure as configure_engine, configured
+from game_pool import GamePool
+from bet_executor import BetExecutor, Saturated
+from metrics import GenerationMetrics
+from script_codec import MEDIA_TYPE as SCRIPT_MEDIA_TYPE, encode_bet_response
+from script_cache import ScriptCache
+from script_store import ScriptStore
+from stores import (MemoryStore, SQLiteStore, SessionSweeper,
+                    InsufficientBalance, SESSION_TTL)
 
 api_blueprint = Blueprint('api', __name__)
 
-sessions = {}
-wallets = {}
+# Wallets and sessions (see init_store)
+store = MemoryStore()
+session_sweeper = None
 
+# Optional pre-generated game pool (see init_game_pool)
+game_pool = None
 
-def get_wallet(user_id):
-    if user_id not in wallets:
-        wallets[user_id] = {'balance': 1000.0}
-    return wallets[user_id]
+# Optional bounded process pool for generation (see init_bet_executor)
+bet_executor = None
+
+# Optional memory-mapped precomputed scripts (see init_script_store)
+script_store = None
+
+# Optional process pool for an inline bet's validation attempts, and
+# its width (see init_attempt_executor)
+attempt_executor = None
+attempt_workers = None
+
+generation_metrics = GenerationMetrics()
+
+# Recent sessions and their serialized scripts, for /script replays
+script_cache = ScriptCache()
+
+
+def init_engine(render_only_strength=None, atlas_path=None):
+    """Engine settings for this process and the worker pools started after it"""
+    configure_engine(render_only_strength=render_only_strength, atlas_path=atlas_path)
+
+
+def init_game_pool(**kwargs):
+    """Serve bets from a background-refilled GamePool"""
+    global game_pool
+    game_pool = GamePool(**kwargs)
+    game_pool.start()
+    return game_pool
+
+
+def init_bet_executor(**kwargs):
+    """Generate bets off the request process, with 503 backpressure"""
+    global bet_executor
+    bet_executor = BetExecutor(**kwargs)
+    return bet_executor
+
+
+def init_attempt_executor(workers):
+    """Run an inline bet's validation attempts concurrently in this many processes"""
+    global attempt_executor, attempt_workers
+    attempt_executor = ProcessPoolExecutor(workers, initializer=configure_engine,
+                                           initargs=configured())
+    attempt_workers = workers
+    return attempt_executor
+
+
+def init_script_store(path):
+    """Serve bets from a script_store.py file built under the current engine settings"""
+    global script_store
+    store_file = ScriptStore(path)
+    if store_file.settings != tuple(configured()):
+        store_file.close()
+        raise ValueError(f"{path} was built with engine settings {store_file.settings}, "
+                         f"not {tuple(configured())}")
+    script_store = store_file
+    return script_store
+
+
+def init_store(db_path=None, session_ttl=SESSION_TTL, expiry_policy='forfeit'):
+    """Pick the store (SQLite if db_path) and start the session sweeper"""
+    global store, session_sweeper
+    if session_sweeper is not None:
+        session_sweeper.stop()
+    
+    if db_path:
+        store = SQLiteStore(db_path, session_ttl=session_ttl)
+    else:
+        store = MemoryStore(session_ttl=session_ttl)
+    
+    session_sweeper = SessionSweeper(store, policy=expiry_policy)
+    session_sweeper.start()
+    return store
+
+
+def script_media_type():
+    """JSON, or the compact binary script if the client asks for it (public/scriptcodec.js)"""
+    accepted = request.accept_mimetypes.best_match(['application/json', SCRIPT_MEDIA_TYPE])
+    return SCRIPT_MEDIA_TYPE if accepted == SCRIPT_MEDIA_TYPE else 'application/json'
+
+
+def encode_payload(payload, media_type):
+    if media_type == SCRIPT_MEDIA_TYPE:
+        return encode_bet_response(payload)
+    return current_app.json.response(payload).get_data()
+
+
+def script_response(body, media_type):
+    response = Response(body, mimetype=media_type)
+    response.vary.add('Accept')
+    return response
+
+
+def replay_key(session):
+    """Everything the script depends on (see replay_game)"""
+    return (session['seed'], session['betAmount'], session['bonusMode'],
+            session['outcomeType'], session['fallback'], session.get('atlas'))
+
+
+def atlas_digest():
+    """Build of the trajectory atlas games are generated with (None without one)"""
+    return configured()[2]
+
+
+def replay_game(session):
+    """Rebuild a session's game from its seed"""
+    engine = GameEngine()
+    if session['fallback']:
+        return engine._generate_death_fallback(session['betAmount'], session['bonusMode'],
+                                               session['seed'])
+    return engine.generate_game_from_seed(session['seed'], session['betAmount'],
+                                          session['bonusMode'], session['outcomeType'])
 
 
 @api_blueprint.route('/balance', methods=['GET'])
 def get_balance():
     user_id = request.args.get('userId', 'default')
-    wallet = get_wallet(user_id)
-    return jsonify({'balance': wallet['balance']})
+    return jsonify({'balance': store.balance(user_id)})
+
+
+@api_blueprint.route('/pool', methods=['GET'])
+def get_pool_metrics():
+    if game_pool is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(game_pool.metrics(), enabled=True))
+
+
+@api_blueprint.route('/metrics', methods=['GET'])
+def get_metrics():
+    snapshot = generation_metrics.snapshot()
+    if session_sweeper is not None:
+        snapshot['sessions'] = session_sweeper.metrics()
+    else:
+        snapshot['sessions'] = {'live': store.session_count()}
+    if bet_executor is not None:
+        snapshot['executor'] = bet_executor.metrics()
+    if script_store is not None:
+        snapshot['scriptStore'] = script_store.metrics()
+    snapshot['scriptCache'] = script_cache.metrics()
+    return jsonify(snapshot)
 
 
 @api_blueprint.route('/bet', methods=['POST'])
 def place_bet():
     try:
+        started = time.perf_counter()
         data = request.get_json()
         print(f"[BET] {data}")
         
@@ -33,35 +175,73 @@ def place_bet():
         if bet_amount <= 0:
             return jsonify({'error': 'Invalid bet amount'}), 400
         
-        wallet = get_wallet(user_id)
-        
-        if bet_amount > wallet['balance']:
+        try:
+            balance = store.debit(user_id, bet_amount)
+        except InsufficientBalance:
             return jsonify({'error': 'Insufficient balance'}), 400
         
-        wallet['balance'] -= bet_amount
+        try:
+            if script_store is not None:
+                game_result = script_store.take(bet_amount, bonus_mode)
+            elif game_pool is not None:
+                game_result = game_pool.take(bet_amount, bonus_mode)
+            elif bet_executor is not None:
+                game_result = bet_executor.generate_game(bet_amount, bonus_mode)
+            else:
+                engine = GameEngine()
+                game_result = engine.generate_game(bet_amount, bonus_mode,
+                                                   executor=attempt_executor,
+                                                   workers=attempt_workers)
+        except Saturated as e:
+            store.credit(user_id, bet_amount)
+            response = jsonify({'error': 'Server busy', 'retryAfter': e.retry_after})
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response, 503
+        except Exception:
+            # No game was dealt, so the stake goes back
+            store.credit(user_id, bet_amount)
+            raise
         
-        engine = GameEngine()
-        game_result = engine.generate_game(bet_amount, bonus_mode)
+        # Pooled games were generated ahead of time (see GamePool)
+        generation_metrics.observe_game(game_result.get('profile'),
+                                        game_result.get('source', 'bet'))
         
         session_id = game_result['sessionId']
-        sessions[session_id] = {
+        # Enough to rebuild the script on demand (see /script)
+        session = {
             'userId': user_id,
             'betAmount': bet_amount,
-            'targetPayout': game_result['targetPayout'],
-            'resolved': False
+            'bonusMode': bool(bonus_mode),
+            'seed': game_result['seed'],
+            'outcomeType': game_result['outcomeType'],
+            'fallback': game_result.get('fallback', False),
+            'atlas': atlas_digest(),
+            'targetPayout': game_result['targetPayout']
         }
+        store.open_session(session_id, session)
+        script_cache.remember(session_id, session)
         
-        print(f"[GAME] outcome={game_result['outcomeType']}, target=₹{game_result['targetPayout']}, stopAt={game_result['script']['stopAtY']}")
+        media_type = script_media_type()
+        if script_store is not None:
+            # Stored payload with this bet's values filled in
+            print(f"[GAME] outcome={game_result['outcomeType']}, target=₹{game_result['targetPayout']}, stopAt={game_result['stopAtY']} (stored)")
+            body = script_store.render(game_result, balance, media_type)
+        else:
+            print(f"[GAME] outcome={game_result['outcomeType']}, target=₹{game_result['targetPayout']}, stopAt={game_result['script']['stopAtY']}")
+            body = encode_payload({
+                'sessionId': session_id,
+                'seed': game_result['seed'],
+                'targetPayout': game_result['targetPayout'],
+                'multiplier': game_result['multiplier'],
+                'outcomeType': game_result['outcomeType'],
+                'script': game_result['script'],
+                'balance': balance
+            }, media_type)
+        response = script_response(body, media_type)
         
-        return jsonify({
-            'sessionId': session_id,
-            'seed': game_result['seed'],
-            'targetPayout': game_result['targetPayout'],
-            'multiplier': game_result['multiplier'],
-            'outcomeType': game_result['outcomeType'],
-            'script': game_result['script'],
-            'balance': wallet['balance']
-        })
+        generation_metrics.observe_request('bet', (time.perf_counter() - started) * 1000)
+        
+        return response
         
     except Exception as e:
         print(f"[ERROR] {e}")
@@ -70,6 +250,42 @@ def place_bet():
         return jsonify({'error': str(e)}), 500
 
 
+@api_blueprint.route('/script/<session_id>', methods=['GET'])
+def get_script(session_id):
+    """Script of a live or recently finished session, rebuilt from its seed"""
+    try:
+        started = time.perf_counter()
+        session = store.get_session(session_id) or script_cache.session(session_id)
+        if session is None:
+            return jsonify({'error': 'Invalid session'}), 404
+        if session.get('atlas') != atlas_digest():
+            # The layouts it was dealt from are gone; a replay would differ
+            return jsonify({'error': 'Session predates the current trajectory atlas'}), 409
+        
+        media_type = script_media_type()
+        key = replay_key(session)
+        body = script_cache.get(key, media_type)
+        
+        if body is None:
+            game_result = replay_game(session)
+            body = encode_payload({
+                'seed': session['seed'],
+                'targetPayout': game_result['targetPayout'],
+                'multiplier': game_result['multiplier'],
+                'outcomeType': game_result['outcomeType'],
+                'script': game_result['script']
+            }, media_type)
+            script_cache.put(key, media_type, body)
+        
+        generation_metrics.observe_request('script', (time.perf_counter() - started) * 1000)
+        
+        return script_response(body, media_type)
+        
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @api_blueprint.route('/resolve', methods=['POST'])
 def resolve_game():
     """
@@ -79,29 +295,20 @@ def resolve_game():
     try:
         data = request.get_json()
         session_id = data.get('sessionId')
-        user_id = data.get('userId', 'default')
         
-        if session_id not in sessions:
+        # Claiming removes the session, so a payout can only happen once
+        session = store.claim_session(session_id)
+        if session is None:
             return jsonify({'error': 'Invalid session'}), 400
         
-        session = sessions[session_id]
-        
-        if session['resolved']:
-            return jsonify({'error': 'Already resolved'}), 400
-        
-        session['resolved'] = True
-        
-        wallet = get_wallet(user_id)
         payout = session['targetPayout']
-        wallet['balance'] += payout
-        
-        print(f"[RESOLVE] payout=₹{payout}, balance=₹{wallet['balance']}")
+        balance = store.credit(session['userId'], payout)
         
-        del sessions[session_id]
+        print(f"[RESOLVE] payout=₹{payout}, balance=₹{balance}")
         
         return jsonify({
             'payout': payout,
-            'balance': wallet['balance']
+            'balance': balance
         })
         
     except Exception as e:
@@ -120,12 +327,10 @@ def cancel_game():
         session_id = data.get('sessionId')
         user_id = data.get('userId', 'default')
         
-        if session_id in sessions:
+        if store.claim_session(session_id) is not None:
             print(f"[CANCEL] session={session_id}")
-            del sessions[session_id]
         
-        wallet = get_wallet(user_id)
-        return jsonify({'balance': wallet['balance']})
+        return jsonify({'balance': store.balance(user_id)})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
@@ -1,5 +1,7 @@
+import os
 from flask import Flask, send_from_directory
-from api import api_blueprint
+from api import (api_blueprint, init_engine, init_game_pool, init_bet_executor,
+                 init_attempt_executor, init_script_store, init_store)
 
 app = Flask(__name__, static_folder='public', static_url_path='')
 
@@ -17,6 +19,44 @@ def serve_static(path):
 
 
 if __name__ == '__main__':
+    # WALLET_DB=path shares wallets and sessions between worker processes.
+    # Unresolved bets expire after SESSION_TTL seconds; EXPIRED_BET_POLICY
+    # is forfeit (default), refund or settle.
+    init_store(os.environ.get('WALLET_DB'),
+               session_ttl=float(os.environ.get('SESSION_TTL', 600)),
+               expiry_policy=os.environ.get('EXPIRED_BET_POLICY', 'forfeit'))
+    
+    # RENDER_ONLY_STRENGTH=s makes ambient clouds of strength <= s
+    # render-only (script.renderOnly, never collided). 0.5 covers them all.
+    # TRAJECTORY_ATLAS=path takes correction layouts from a prebuilt atlas
+    # (python trajectory_atlas.py build) instead of searching every bet.
+    render_only = os.environ.get('RENDER_ONLY_STRENGTH')
+    init_engine(float(render_only) if render_only else None,
+                atlas_path=os.environ.get('TRAJECTORY_ATLAS'))
+    
+    # SCRIPT_STORE=path serves every bet from precomputed scripts
+    # (python script_store.py build, with the same engine settings).
+    if os.environ.get('SCRIPT_STORE'):
+        init_script_store(os.environ['SCRIPT_STORE'])
+    
+    # GAME_POOL_WORKERS=N serves bets from a pre-generated pool.
+    # Only start it in the reloader's child, which serves requests.
+    pool_workers = int(os.environ.get('GAME_POOL_WORKERS', 0))
+    if pool_workers and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_game_pool(workers=pool_workers)
+    
+    # BET_WORKERS=N generates bets in N processes; once 2N are pending,
+    # /api/bet answers 503 with Retry-After instead of queueing.
+    bet_workers = int(os.environ.get('BET_WORKERS', 0))
+    if bet_workers and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_bet_executor(workers=bet_workers)
+    
+    # ATTEMPT_WORKERS=N runs an inline bet's validation attempts in N
+    # processes at once (used when none of the above serves bets).
+    attempt_workers = int(os.environ.get('ATTEMPT_WORKERS', 0))
+    if attempt_workers and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        init_attempt_executor(attempt_workers)
+    
     print("=" * 50)
     print("Server running on http://localhost:3000")
     print("=" * 50)
@@ -0,0 +1,455 @@
+"""
+DROP THE BOSS - NumPy Batch Engine
+==================================
+
+Vectorized counterparts of GameEngine hot paths for offline math work
+(RTP certification, tuning). Every function here reproduces the scalar
+engine exactly for the same seeds; the scalar engine stays the source
+of truth for live games.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from game_engine import (
+    OUTCOMES, TrajectoryPoint, CompiledClouds, CloudIndex,
+    ROLE_STOPPER, ROLE_AMBIENT,
+    SCREEN_W, SCREEN_CENTER, SPAWN_START_Y, GROUND_COLLISION_Y,
+    CORRECTION_INNER, CORRECTION_OUTER, GRAVITY, MAX_FALL, AIR_FRICTION,
+    GROUND_FRICTION, PLAYER_RADIUS, CHECKPOINT_PUSH_MARGIN, SAMPLE_INTERVAL,
+    AMBIENT_IMPULSE,
+)
+
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+# Full rows of samples per preallocated chunk
+SAMPLE_CHUNK_ROWS = 64
+
+MULBERRY_INCREMENT = 0x6D2B79F5
+
+# Cumulative tier thresholds, summed in the same order as roll_outcome
+_thresholds = []
+_cumulative = 0
+for _prob, _, _, _ in OUTCOMES:
+    _cumulative += _prob
+    _thresholds.append(_cumulative)
+TIER_THRESHOLDS = np.array(_thresholds, dtype=np.float64)
+
+TIER_MIN = np.array([row[1] for row in OUTCOMES], dtype=np.float64)
+TIER_MAX = np.array([row[2] for row in OUTCOMES], dtype=np.float64)
+
+# roll_outcome's fall-through result when r lands past the last threshold
+DEAD = TIERS.index('dead')
+
+
+# ============================================================================
+# RNG
+# ============================================================================
+
+def mulberry32_batch(seeds, count: int = 1, offset: int = 0) -> np.ndarray:
+    """
+    Mulberry32 outputs for many seeds at once.
+
+    Returns a (len(seeds), count) array holding draws offset .. offset +
+    count - 1 of each seed's stream, identical to calling
+    GameEngine.mulberry32(seed)() that many times. The state after k
+    draws is seed + k * increment, so any offset costs nothing extra.
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64) & 0xFFFFFFFF
+    steps = np.arange(offset + 1, offset + count + 1, dtype=np.uint64)
+    increments = (steps * MULBERRY_INCREMENT) & 0xFFFFFFFF
+
+    t = ((seeds[:, None] + increments[None, :]) & 0xFFFFFFFF).astype(np.uint32)
+
+    with np.errstate(over='ignore'):
+        x = (t ^ (t >> np.uint32(15))) * (t | np.uint32(1))
+        x = x ^ (x + (x ^ (x >> np.uint32(7))) * (x | np.uint32(61)))
+        x = x ^ (x >> np.uint32(14))
+
+    return x.astype(np.float64) / 4294967296
+
+
+# ============================================================================
+# OUTCOME DECISION
+# ============================================================================
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """round(value, 2) element-wise, matching Python's correctly-rounded round"""
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+
+    # x * 100 itself is rounded, so lanes sitting on a .5 boundary may
+    # disagree with Python; settle those few in Python
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    for i in np.flatnonzero(frac < 1e-6):
+        rounded[i] = round(float(values[i]), 2)
+
+    return rounded
+
+
+def roll_outcome_batch(seeds, offset: int = 0):
+    """
+    roll_outcome for a fresh mulberry32 stream per seed.
+
+    Returns (tier_codes, multipliers), where tier_codes index TIERS.
+    Lane i equals GameEngine.roll_outcome(GameEngine.mulberry32(seeds[i]))
+    (with the streams advanced by offset draws).
+    """
+    draws = mulberry32_batch(seeds, count=2, offset=offset)
+    r, spread_draw = draws[:, 0], draws[:, 1]
+
+    # First tier whose cumulative probability exceeds r
+    tiers = np.searchsorted(TIER_THRESHOLDS, r, side='right')
+    past_end = tiers >= len(TIERS)
+    tiers[past_end] = DEAD
+
+    low = TIER_MIN[tiers]
+    high = TIER_MAX[tiers]
+    multipliers = np.where(low == high, low, low + spread_draw * (high - low))
+    multipliers[past_end] = 0
+
+    return tiers, _round2(multipliers)
+
+
+# ============================================================================
+# PHYSICS SIMULATION
+# ============================================================================
+
+class TrajectoryBatch:
+    """
+    Sampled trajectories of a lockstep batch.
+
+    Row r of the samples is loop step r * sample_interval for the lanes
+    still running at that step: (x, y, vx, vy) columns starting at
+    row_at[r] = (chunk, column), one per lane of row_lanes[r] (ascending).
+    trajectory(i) rebuilds, as a list of points, the samples
+    simulate_trajectory would have returned for lane i.
+    """
+
+    def __init__(self, start, samples, end_state, end_step, stopped,
+                 sample_interval):
+        self.start = start            # (x, y, vx, vy, step) arrays
+        self.samples = samples        # ((4, C) chunks, row_at, row_lanes)
+        self.end_state = end_state    # (x, y, vx, vy, step) arrays
+        self.end_step = end_step      # loop step each lane ended at
+        self.stopped = stopped        # lane broke out (vs ran out of steps)
+        self.sample_interval = sample_interval
+
+    def __len__(self) -> int:
+        return len(self.end_step)
+
+    def trajectory(self, i: int) -> List[TrajectoryPoint]:
+        sx, sy, svx, svy = (float(a[i]) for a in self.start[:4])
+        sstep = int(self.start[4][i])
+        points = [TrajectoryPoint(sx, sy, svx, svy, sstep)]
+
+        chunks, row_at, row_lanes = self.samples
+        last_row = int(self.end_step[i]) // self.sample_interval
+        for row in range(min(last_row + 1, len(row_lanes))):
+            chunk, col = row_at[row]
+            col += int(np.searchsorted(row_lanes[row], i))
+            px, py, pvx, pvy = chunks[chunk][:, col].tolist()
+            points.append(TrajectoryPoint(px, py, pvx, pvy,
+                                          sstep + row * self.sample_interval + 1))
+
+        if self.stopped[i]:
+            ex, ey, evx, evy, estep = self.end_state
+            points.append(TrajectoryPoint(float(ex[i]), float(ey[i]),
+                                          float(evx[i]), float(evy[i]),
+                                          int(estep[i])))
+        return points
+
+
+class _PackedClouds:
+    """
+    Unique cloud sets as padded (sets, clouds) arrays, plus a y-bucket
+    table of candidate cloud indices (ascending, -1 padded) per set.
+    """
+
+    FIELDS = ('x', 'center_y', 'min_dist', 'push', 'role',
+              'bounce', 'friction', 'vx_delta', 'vy_delta')
+
+    def __init__(self, cloud_sets: List[List[Dict]]):
+        # Lanes sharing one cloud list share its arrays
+        unique: Dict[int, int] = {}
+        compiled = []
+        self.set_of = np.empty(len(cloud_sets), dtype=np.int64)
+        for lane, clouds in enumerate(cloud_sets):
+            if id(clouds) not in unique:
+                unique[id(clouds)] = len(compiled)
+                compiled.append(CompiledClouds(clouds))
+            self.set_of[lane] = unique[id(clouds)]
+
+        sets = len(compiled)
+        width = max([len(c) for c in compiled] + [1])
+        for name in self.FIELDS:
+            arr = np.zeros((sets, width), dtype=np.int8 if name == 'role' else np.float64)
+            for i, c in enumerate(compiled):
+                arr[i, :len(c)] = getattr(c, name)
+            setattr(self, name, arr)
+
+        # Candidate table, same reach rule as CloudIndex plus push margin
+        size = CloudIndex.BUCKET_SIZE
+        buckets = [{} for _ in compiled]
+        lo_b, hi_b = 0, 0
+        for i, c in enumerate(compiled):
+            for j, (cy, min_dist) in enumerate(zip(c.center_y, c.min_dist)):
+                reach = min_dist + CHECKPOINT_PUSH_MARGIN + 1
+                lo = int((cy - reach) // size)
+                hi = int((cy + reach) // size)
+                lo_b, hi_b = min(lo_b, lo), max(hi_b, hi)
+                for b in range(lo, hi + 1):
+                    buckets[i].setdefault(b, []).append(j)
+
+        # One empty bucket on each side catches everything out of range
+        self.bucket_size = size
+        self.first_bucket = lo_b - 1
+        self.last_bucket = hi_b + 1
+        depth = max([len(ids) for bs in buckets for ids in bs.values()] + [1])
+        self.table = np.full((sets, hi_b - lo_b + 3, depth), -1, dtype=np.int32)
+        for i, bs in enumerate(buckets):
+            for b, ids in bs.items():
+                self.table[i, b - self.first_bucket, :len(ids)] = ids
+
+    def candidates(self, sets: np.ndarray, y: np.ndarray) -> np.ndarray:
+        b = np.floor(y / self.bucket_size).astype(np.int64)
+        b = np.clip(b, self.first_bucket, self.last_bucket) - self.first_bucket
+        return self.table[sets, b]
+
+
+def _resolve_collisions(clouds: _PackedClouds, sets: np.ndarray,
+                        order: np.ndarray, x, y, vx, vy):
+    """
+    Sequential cloud-by-cloud collision response for a few lanes.
+
+    order holds each lane's candidate cloud indices in original order
+    (-1 padded); slot k is resolved for every lane before slot k + 1,
+    so each lane sees its clouds in the same order as simulate_step.
+    """
+    present = order >= 0
+    safe = np.maximum(order, 0)
+    rows = sets[:, None]
+    cx, cy = clouds.x[rows, safe], clouds.center_y[rows, safe]
+    min_dists, pushes = clouds.min_dist[rows, safe], clouds.push[rows, safe]
+    roles = clouds.role[rows, safe]
+    bounces, frictions = clouds.bounce[rows, safe], clouds.friction[rows, safe]
+    vx_deltas, vy_deltas = clouds.vx_delta[rows, safe], clouds.vy_delta[rows, safe]
+
+    for k in range(order.shape[1]):
+        dx = x - cx[:, k]
+        dy = y - cy[:, k]
+        dist_sq = dx * dx + dy * dy
+        min_dist = min_dists[:, k]
+
+        hit = present[:, k] & (dist_sq < min_dist * min_dist) & (dist_sq > 0.001)
+        if not hit.any():
+            continue
+
+        dist = np.sqrt(np.where(hit, dist_sq, 1.0))
+        nx = dx / dist
+        ny = dy / dist
+
+        # Push out
+        overlap = min_dist - dist
+        push = pushes[:, k]
+        x = np.where(hit, x + nx * overlap * push, x)
+        y = np.where(hit, y + ny * overlap * push, y)
+
+        # Velocity response
+        rel_vel = vx * nx + vy * ny
+        respond = hit & (rel_vel < 0)
+        if not respond.any():
+            continue
+
+        role = roles[:, k]
+        bounce = bounces[:, k]
+        friction = frictions[:, k]
+        new_vx, new_vy = vx, vy
+
+        stopper = respond & (role == ROLE_STOPPER)
+        if stopper.any():
+            new_vx = np.where(stopper, vx * (1 - friction * 0.6), new_vx)
+            new_vy = np.where(stopper, vy * np.where(vy > 0, -bounce, 0.2), new_vy)
+
+        ambient = respond & (role == ROLE_AMBIENT)
+        if ambient.any():
+            # Minimal bounce, almost no friction
+            a_vx = (vx - (1 + bounce) * rel_vel * nx * AMBIENT_IMPULSE) * friction
+            a_vy = (vy - (1 + bounce) * rel_vel * ny * AMBIENT_IMPULSE) * friction
+            new_vx = np.where(ambient, a_vx, new_vx)
+            new_vy = np.where(ambient, a_vy, new_vy)
+
+        normal = respond & ~stopper & ~ambient
+        if normal.any():
+            n_vx = vx - (1 + bounce) * rel_vel * nx
+            n_vy = vy - (1 + bounce) * rel_vel * ny
+            tang_x = n_vx - (n_vx * nx + n_vy * ny) * nx
+            tang_y = n_vy - (n_vx * nx + n_vy * ny) * ny
+            n_vx = n_vx - tang_x * (1 - friction)
+            n_vy = n_vy - tang_y * (1 - friction)
+
+            # Deltas, then damping
+            n_vx = (n_vx + vx_deltas[:, k]) * 0.92
+            n_vy = (n_vy + vy_deltas[:, k]) * 0.92
+            new_vx = np.where(normal, n_vx, new_vx)
+            new_vy = np.where(normal, n_vy, new_vy)
+
+        vx, vy = new_vx, new_vy
+
+    return x, y, vx, vy
+
+
+def simulate_trajectory_batch(cloud_sets, starts: List[TrajectoryPoint] = None,
+                              stop_y=None, max_steps: int = 25000,
+                              lanes: int = None,
+                              sample_interval: int = SAMPLE_INTERVAL) -> TrajectoryBatch:
+    """
+    Advance many (cloud set, start state) pairs in lockstep.
+
+    cloud_sets is one cloud list per lane, or a single list shared by
+    `lanes` lanes. Each step tests every lane's bucketed candidates at
+    once; only lanes that actually touch a cloud go through the masked,
+    slot-by-slot role branches. Each lane stops on its own (ground,
+    stop_y or stall) exactly like GameEngine.simulate_trajectory, and
+    finished lanes drop out of the working arrays.
+
+    Candidates within CHECKPOINT_PUSH_MARGIN of their collision band are
+    resolved; the scalar engine re-queries instead, so runs agree unless
+    one step's push-outs exceed that margin.
+    """
+    if cloud_sets and isinstance(cloud_sets[0], dict):
+        cloud_sets = [cloud_sets] * (lanes or 1)
+    elif not cloud_sets:
+        cloud_sets = [[]] * (lanes or 1)
+    n = len(cloud_sets)
+
+    if starts is None:
+        starts = [TrajectoryPoint(SCREEN_CENTER, SPAWN_START_Y, 0, 5)] * n
+    if stop_y is None:
+        stop_y = GROUND_COLLISION_Y
+
+    clouds = _PackedClouds(cloud_sets)
+
+    x = np.array([p.x for p in starts], dtype=np.float64)
+    y = np.array([p.y for p in starts], dtype=np.float64)
+    vx = np.array([p.vx for p in starts], dtype=np.float64)
+    vy = np.array([p.vy for p in starts], dtype=np.float64)
+    step0 = np.array([p.step for p in starts], dtype=np.int64)
+    start = (x.copy(), y.copy(), vx.copy(), vy.copy(), step0)
+
+    # Full-width state (frozen once a lane ends) for samples and results
+    full = [x.copy(), y.copy(), vx.copy(), vy.copy()]
+    end_step = np.full(n, max_steps - 1, dtype=np.int64)
+    end_steps_taken = np.full(n, max_steps, dtype=np.int64)
+    stopped = np.zeros(n, dtype=bool)
+
+    # Samples of running lanes only, in preallocated chunks of up to
+    # SAMPLE_CHUNK_ROWS full rows (fewer if max_steps needs fewer)
+    chunk_size = n * min(-(-max_steps // sample_interval), SAMPLE_CHUNK_ROWS)
+    chunks = [np.empty((4, chunk_size), dtype=np.float64)]
+    used = 0
+    row_at, row_lanes = [], []
+
+    # Working arrays only hold running lanes
+    lane = np.arange(n)
+    sets = clouds.set_of.copy()
+    stop_at = np.broadcast_to(np.asarray(stop_y, dtype=np.float64) - 20, (n,)).copy()
+
+    for step in range(max_steps):
+        # Gravity
+        vy = np.minimum(vy + GRAVITY, MAX_FALL)
+
+        # Nothing moves unless a candidate overlaps at the step's start
+        order = clouds.candidates(sets, y)
+        safe = np.maximum(order, 0)
+        dx = x[:, None] - clouds.x[sets[:, None], safe]
+        dy = y[:, None] - clouds.center_y[sets[:, None], safe]
+        dist_sq = dx * dx + dy * dy
+        min_dist = clouds.min_dist[sets[:, None], safe]
+        touching = (order >= 0) & (dist_sq < min_dist * min_dist) & (dist_sq > 0.001)
+        busy = np.flatnonzero(touching.any(axis=1))
+
+        if len(busy):
+            # Candidates close enough to matter after push-outs, in order,
+            # starting at the first one touched (nothing moves before it)
+            reach = min_dist[busy] + CHECKPOINT_PUSH_MARGIN
+            near = (order[busy] >= 0) & (dist_sq[busy] < reach * reach)
+            first = np.argmax(touching[busy], axis=1)
+            near &= np.arange(order.shape[1]) >= first[:, None]
+            slots = int(near.sum(axis=1).max())
+            pick = np.argsort(~near, axis=1, kind='stable')[:, :slots]
+            sub_order = np.where(np.take_along_axis(near, pick, axis=1),
+                                 np.take_along_axis(order[busy], pick, axis=1), -1)
+
+            bx, by, bvx, bvy = _resolve_collisions(
+                clouds, sets[busy], sub_order, x[busy], y[busy], vx[busy], vy[busy])
+            x[busy], y[busy], vx[busy], vy[busy] = bx, by, bvx, bvy
+
+        # Update position
+        new_x = x + vx
+        new_y = y + vy
+        new_vx = vx * AIR_FRICTION
+        new_vy = vy
+
+        # Soft envelope
+        new_vx = np.where(new_x < CORRECTION_INNER,
+                          new_vx + (CORRECTION_INNER - new_x) * 0.008,
+                          np.where(new_x > CORRECTION_OUTER,
+                                   new_vx - (new_x - CORRECTION_OUTER) * 0.008,
+                                   new_vx))
+
+        # Hard bounds
+        low_wall = new_x < 50
+        high_wall = new_x > SCREEN_W - 50
+        new_vx = np.where(low_wall, np.abs(new_vx) * 0.3,
+                          np.where(high_wall, -np.abs(new_vx) * 0.3, new_vx))
+        new_x = np.where(low_wall, 50.0, np.where(high_wall, SCREEN_W - 50.0, new_x))
+
+        # Ground
+        grounded = new_y >= GROUND_COLLISION_Y - PLAYER_RADIUS
+        bouncing = grounded & (vy > 2)
+        resting = grounded & ~(vy > 2)
+        new_y = np.where(grounded, GROUND_COLLISION_Y - PLAYER_RADIUS, new_y)
+        new_vy = np.where(bouncing, -vy * 0.2, np.where(resting, 0.0, new_vy))
+        new_vx = np.where(bouncing, new_vx * 0.7,
+                          np.where(resting, new_vx * GROUND_FRICTION, new_vx))
+
+        x, y, vx, vy = new_x, new_y, new_vx, new_vy
+
+        if step % sample_interval == 0:
+            if used + len(lane) > chunk_size:
+                chunks.append(np.empty((4, chunk_size), dtype=np.float64))
+                used = 0
+            chunks[-1][:, used:used + len(lane)] = (x, y, vx, vy)
+            row_at.append((len(chunks) - 1, used))
+            row_lanes.append(lane)
+            used += len(lane)
+
+        # Per-lane termination
+        speed = np.sqrt(vx * vx + vy * vy)
+        ended = (y >= stop_at) | ((y > SPAWN_START_Y) & (speed < 0.8))
+        if ended.any():
+            done = lane[ended]
+            stopped[done] = True
+            end_step[done] = step
+            end_steps_taken[done] = step + 1
+            for arr, value in zip(full, (x, y, vx, vy)):
+                arr[done] = value[ended]
+
+            keep = ~ended
+            lane, sets, stop_at = lane[keep], sets[keep], stop_at[keep]
+            x, y, vx, vy = x[keep], y[keep], vx[keep], vy[keep]
+            if not len(lane):
+                break
+
+    # Lanes that ran out of steps end on their last state
+    for arr, value in zip(full, (x, y, vx, vy)):
+        arr[lane] = value
+
+    end_state = tuple(full) + (step0 + end_steps_taken,)
+    chunks[-1] = chunks[-1][:, :used].copy()
+    samples = (chunks, row_at, row_lanes)
+    return TrajectoryBatch(start, samples, end_state, end_step,
+                           stopped, sample_interval)
@@ -0,0 +1,222 @@
+"""
+DROP THE BOSS - Engine Benchmarks
+=================================
+
+Fixed-seed timings of the GameEngine hot paths:
+
+- simulate_step: 1000 steps over a compiled, game-sized cloud set
+- simulate_trajectory: a full drop through every cloud of a game
+- place_correction_clouds / place_ambient_clouds / validate_run
+- generate_game:<tier>: end-to-end generate_game_from_seed per tier
+
+Each benchmark runs once to warm up, then --repeat times; the median is
+reported. --save writes the medians as a JSON baseline, --compare
+fails (exit status 1) when any median is more than --threshold slower
+than the baseline. Baselines are machine-specific and are not committed:
+record one locally on the box you compare on. --save stores the host it
+was recorded on, and --compare warns when that host differs from this one.
+
+Usage:
+    python benchmark.py --save benchmark_baseline.json
+    python benchmark.py --compare benchmark_baseline.json [--threshold 0.15]
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import contextlib
+import statistics
+from typing import Callable, Dict, List, Tuple
+
+from game_engine import (GameEngine, CompiledClouds, TrajectoryPoint, OUTCOMES,
+                         SCREEN_CENTER, SPAWN_START_Y)
+
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+# Seed and tier of the game whose layout the component benchmarks use
+FIXTURE_SEED = 12345
+FIXTURE_TIER = 'medium'
+
+# Seeds averaged by each generate_game benchmark run
+GAME_SEEDS = [101, 202, 303]
+
+STEPS = 1000
+
+
+def rng_at(engine: GameEngine, seed: int, draws: int) -> Callable:
+    """Fresh mulberry32(seed) advanced by draws"""
+    rng = engine.mulberry32(seed)
+    for _ in range(draws):
+        rng()
+    return rng
+
+
+def build_fixture(engine: GameEngine, seed: int, tier: str) -> Dict:
+    """Replay _build_game's layout stages for one seed"""
+    base = engine.mulberry32(seed)
+    draws = [0]
+
+    def rng():
+        draws[0] += 1
+        return base()
+
+    outcome = engine.roll_outcome(rng, tier)
+    engine.determine_narrative_flags(outcome, rng)
+    target_x, target_y, _ = engine._determine_target(outcome, rng)
+    segments = engine.generate_pipeline(target_x, target_y, outcome, rng)
+
+    correction_draws = draws[0]
+    control = engine.place_correction_clouds(segments, rng)
+    ambient_draws = draws[0]
+    ambient = engine.place_ambient_clouds(segments, control, rng)
+
+    clouds = control + ambient
+    return {
+        'segments': segments,
+        'control': control,
+        'clouds': clouds,
+        'trajectory': engine.simulate_trajectory(clouds),
+        'correction_rng': lambda: rng_at(engine, seed, correction_draws),
+        'ambient_rng': lambda: rng_at(engine, seed, ambient_draws),
+    }
+
+
+def make_benchmarks(engine: GameEngine, fixture: Dict) -> List[Tuple[str, Callable]]:
+    compiled = CompiledClouds(fixture['clouds'])
+    segments = fixture['segments']
+
+    def steps():
+        point = TrajectoryPoint(SCREEN_CENTER, SPAWN_START_Y, 0, 5)
+        for _ in range(STEPS):
+            point = engine.simulate_step(point, compiled)
+
+    benchmarks = [
+        ('simulate_step', steps),
+        ('simulate_trajectory',
+         lambda: engine.simulate_trajectory(fixture['clouds'])),
+        ('place_correction_clouds',
+         lambda: engine.place_correction_clouds(segments, fixture['correction_rng']())),
+        ('place_ambient_clouds',
+         lambda: engine.place_ambient_clouds(segments, fixture['control'],
+                                             fixture['ambient_rng']())),
+        ('validate_run',
+         lambda: engine.validate_run(fixture['clouds'], fixture['trajectory'], segments)),
+    ]
+
+    for tier in TIERS:
+        def game(tier=tier):
+            for seed in GAME_SEEDS:
+                engine.generate_game_from_seed(seed, 1.0, False, tier)
+        benchmarks.append((f'generate_game:{tier}', game))
+
+    return benchmarks
+
+
+def time_ms(fn: Callable, repeat: int) -> float:
+    """Median wall time of fn in milliseconds (after one warm-up run)"""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run(repeat: int, only: List[str] = None) -> Dict[str, float]:
+    engine = GameEngine()
+    quiet = io.StringIO()
+
+    with contextlib.redirect_stdout(quiet):
+        fixture = build_fixture(engine, FIXTURE_SEED, FIXTURE_TIER)
+
+    results = {}
+    for name, fn in make_benchmarks(engine, fixture):
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        with contextlib.redirect_stdout(quiet):
+            results[name] = time_ms(fn, repeat)
+        quiet.seek(0)
+        quiet.truncate()
+        print(f"  {name:28s} {results[name]:10.2f} ms", file=sys.stderr)
+
+    return results
+
+
+def host() -> Dict[str, object]:
+    """Identity of the machine the timings come from"""
+    return {
+        'node': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float],
+            threshold: float) -> List[str]:
+    """Names of benchmarks slower than baseline * (1 + threshold)"""
+    print(f"\n{'benchmark':28s} {'baseline':>10s} {'now':>10s} {'change':>8s}")
+    regressions = []
+    for name, ms in results.items():
+        if name not in baseline:
+            print(f"{name:28s} {'-':>10s} {ms:10.2f}      new")
+            continue
+        change = ms / baseline[name] - 1
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:28s} {baseline[name]:10.2f} {ms:10.2f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timed runs per benchmark (median is kept)')
+    parser.add_argument('--only', nargs='*',
+                        help='benchmark name prefixes to run')
+    parser.add_argument('--save', metavar='PATH',
+                        help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed slowdown before failing (0.15 = 15%%)')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'host': host(),
+                'recorded': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('host') != host():
+            print(f"\nWARNING: {args.compare} was recorded on a different host "
+                  f"({baseline.get('host')}); timings are not comparable")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: "
+                  f"{', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
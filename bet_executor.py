@@ -0,0 +1,123 @@
+"""
+DROP THE BOSS - Bounded Bet Executor
+====================================
+
+Runs game generation in a process pool so the physics never holds the
+GIL of the web process: light routes (/balance, /cancel, ...) keep
+answering while bets are being generated.
+
+The executor admits at most max_pending jobs (running + queued). Past
+that, submit() raises Saturated instead of queueing, and the API answers
+503 with a Retry-After estimated from the backlog. A pool broken by a
+dead worker is replaced on the next submit.
+"""
+
+import math
+import time
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+from game_engine import GameEngine, configure, configured
+
+
+class Saturated(Exception):
+    """No free slot; retry_after is the suggested wait in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"executor saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _generate(bet_amount: float, bonus_mode: bool) -> Dict:
+    """Worker entry point: one full game"""
+    return GameEngine().generate_game(bet_amount, bonus_mode)
+
+
+class BetExecutor:
+    """Process-pool generation with a hard cap on pending jobs"""
+
+    def __init__(self, workers: int = 2, max_pending: int = None):
+        self.workers = workers
+        self.max_pending = max_pending or 2 * workers
+        self.pool = self._new_pool()
+
+        self.lock = threading.Lock()
+        self.pending = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.avg_ms = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.workers, initializer=configure,
+                                   initargs=configured())
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def submit(self, bet_amount: float, bonus_mode: bool) -> Future:
+        """Queue one game, or raise Saturated if max_pending is reached"""
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise Saturated(self._retry_after())
+            self.pending += 1
+
+        started = time.perf_counter()
+        try:
+            future = self._submit(bet_amount, bonus_mode)
+        except BaseException:
+            # Never admitted, so it must not hold a slot
+            with self.lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(lambda f: self._on_done(f, started))
+        return future
+
+    def _submit(self, bet_amount: float, bonus_mode: bool) -> Future:
+        pool = self.pool
+        try:
+            return pool.submit(_generate, bet_amount, bonus_mode)
+        except BrokenProcessPool:
+            # A worker died; replace the pool (once, if threads race) and retry
+            with self.lock:
+                if self.pool is pool:
+                    self.pool = self._new_pool()
+                    self.restarts += 1
+            pool.shutdown(wait=False)
+            return self.pool.submit(_generate, bet_amount, bonus_mode)
+
+    def generate_game(self, bet_amount: float, bonus_mode: bool = False) -> Dict:
+        """Submit and wait for the result on the calling thread"""
+        return self.submit(bet_amount, bonus_mode).result()
+
+    def _on_done(self, future: Future, started: float):
+        ms = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.pending -= 1
+            self.completed += 1
+            # Exponential moving average of submit-to-done time
+            self.avg_ms = ms if self.avg_ms is None else 0.9 * self.avg_ms + 0.1 * ms
+
+    def _retry_after(self) -> int:
+        """Seconds until the workers should have drained the current backlog"""
+        if self.avg_ms is None:
+            return 1
+        backlog_ms = self.pending * self.avg_ms / self.workers
+        return max(1, math.ceil(backlog_ms / 1000))
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'maxPending': self.max_pending,
+                'pending': self.pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'restarts': self.restarts,
+                'avgMs': self.avg_ms,
+            }
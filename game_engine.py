@@ -14,6 +14,13 @@ import hashlib
 import time
 import struct
 import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager, nullcontext
+from itertools import accumulate, repeat
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -79,6 +86,19 @@ DEFAULT_FRICTION = 0.85
 AMBIENT_BOUNCE = 0.15      # Very weak bounce
 AMBIENT_FRICTION = 0.98    # Almost no friction loss
 AMBIENT_RADIUS_SCALE = 0.85  # Slightly smaller collision
+AMBIENT_IMPULSE = 0.3      # Share of a normal bounce impulse
+
+# Suggested render-only threshold: above every ambient cloud's strength
+AMBIENT_RENDER_ONLY_STRENGTH = 0.5
+
+# Max x shift (px) applied to each trajectory-atlas cloud before re-verifying
+ATLAS_JITTER = 3
+
+# Checkpoint resume: slack for push-outs moving the player down within a step
+CHECKPOINT_PUSH_MARGIN = 200
+
+# Physics steps between recorded trajectory samples
+SAMPLE_INTERVAL = 15
 
 # Object sizes
 TANK_W, TANK_H = 400, 300
@@ -118,6 +138,68 @@ class TrajectoryPoint:
         return TrajectoryPoint(self.x, self.y, self.vx, self.vy, self.step)
 
 
+class Trajectory:
+    """
+    Sampled run stored as parallel array columns.
+
+    The physics loop appends samples in place; indexing and iteration
+    hand out TrajectoryPoint copies, so list-style callers keep working,
+    while hot scans read the x / y / vx / vy / step columns directly.
+    peak[i] is the deepest y reached up to sample i, including the
+    unsampled steps in between.
+    """
+
+    __slots__ = ('x', 'y', 'vx', 'vy', 'step', 'peak')
+
+    def __init__(self, start: TrajectoryPoint = None):
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.step = array('q')
+        self.peak = array('d')
+        if start is not None:
+            self.append(start.x, start.y, start.vx, start.vy, start.step, start.y)
+
+    @classmethod
+    def from_points(cls, points: List[TrajectoryPoint]) -> 'Trajectory':
+        """Columns for a list of points (peaks are taken from the samples)"""
+        trajectory = cls()
+        peak = -math.inf
+        for p in points:
+            peak = max(peak, p.y)
+            trajectory.append(p.x, p.y, p.vx, p.vy, p.step, peak)
+        return trajectory
+
+    def append(self, x: float, y: float, vx: float, vy: float,
+               step: int, peak: float):
+        self.x.append(x)
+        self.y.append(y)
+        self.vx.append(vx)
+        self.vy.append(vy)
+        self.step.append(step)
+        self.peak.append(peak)
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            part = Trajectory()
+            for name in self.__slots__:
+                setattr(part, name, getattr(self, name)[i])
+            return part
+        return TrajectoryPoint(self.x[i], self.y[i], self.vx[i], self.vy[i],
+                               self.step[i])
+
+    def __iter__(self):
+        for sample in zip(self.x, self.y, self.vx, self.vy, self.step):
+            yield TrajectoryPoint(*sample)
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+
 @dataclass
 class PathSegment:
     """Metadata for pipeline segment"""
@@ -140,6 +222,360 @@ class NarrativeFlags:
     tension_profile: List[TensionLevel] = None
 
 
+class CloudIndex:
+    """
+    Y-bucketed collision lookup, built once per cloud set.
+
+    Each bucket holds the indices (in original list order) of every cloud
+    a player inside the bucket's y band could touch, so simulate_step only
+    tests nearby clouds and still resolves them in the same order.
+    """
+
+    BUCKET_SIZE = 200
+    MARGIN = 64
+
+    def __init__(self, center_ys: List[float], min_dists: List[float]):
+        buckets: Dict[int, List[int]] = {}
+
+        for i, (cy, min_dist) in enumerate(zip(center_ys, min_dists)):
+            # A collision needs |dy| < min_dist
+            reach = min_dist + self.MARGIN + 1
+            lo = int((cy - reach) // self.BUCKET_SIZE)
+            hi = int((cy + reach) // self.BUCKET_SIZE)
+
+            for b in range(lo, hi + 1):
+                buckets.setdefault(b, []).append(i)
+
+        self.buckets = {b: tuple(ids) for b, ids in buckets.items()}
+
+    def query(self, y: float, after: int = -1) -> Tuple[Tuple[int, ...], float, float]:
+        """
+        Cloud indices near y (only those > after), plus the y range
+        the answer stays valid for.
+        """
+        b = int(y // self.BUCKET_SIZE)
+        ids = self.buckets.get(b, ())
+        if after >= 0:
+            ids = ids[bisect_right(ids, after):]
+
+        lo_y = b * self.BUCKET_SIZE - self.MARGIN
+        hi_y = (b + 1) * self.BUCKET_SIZE + self.MARGIN
+        return ids, lo_y, hi_y
+
+
+class PlacementGrid:
+    """
+    Spatial hash for overlap rejection while placing clouds.
+
+    A candidate overlaps a placed cloud when |dx| < SPACING_X and
+    |dy| < SPACING_Y. Cells are one spacing in size, so only the 3x3
+    block of cells around a candidate can hold an overlap.
+    """
+
+    SPACING_X = 220
+    SPACING_Y = 200
+
+    def __init__(self, positions: List[Tuple[float, float]] = ()):
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+        for x, y in positions:
+            self.add(x, y)
+
+    def add(self, x: float, y: float):
+        cell = (int(x // self.SPACING_X), int(y // self.SPACING_Y))
+        self.cells.setdefault(cell, []).append((x, y))
+
+    def overlaps(self, x: float, y: float) -> bool:
+        col, row = int(x // self.SPACING_X), int(y // self.SPACING_Y)
+        for c in (col - 1, col, col + 1):
+            for r in (row - 1, row, row + 1):
+                for px, py in self.cells.get((c, r), ()):
+                    if abs(px - x) < self.SPACING_X and abs(py - y) < self.SPACING_Y:
+                        return True
+        return False
+
+
+class TrajectoryIndex:
+    """
+    Bisect lookups of "first sample at or below y" on a sampled trajectory.
+
+    Bounces make y non-monotone, so the search runs on the running max of
+    the sampled y values: its first entry >= y is the first sample >= y.
+    """
+
+    def __init__(self, trajectory):
+        self.trajectory = trajectory
+        ys = (trajectory.y if isinstance(trajectory, Trajectory)
+              else [point.y for point in trajectory])
+        self.reach = list(accumulate(ys, max))
+
+    def first_at(self, y: float) -> int:
+        """Index of the first sample with y >= the given y (len if none)"""
+        return bisect_left(self.reach, y)
+
+    def first_at_many(self, ys: List[float]) -> List[int]:
+        """first_at for every y, in one merge pass over the sorted queries"""
+        order = sorted(range(len(ys)), key=ys.__getitem__)
+        result = [0] * len(ys)
+        reach = self.reach
+        i = 0
+        for q in order:
+            while i < len(reach) and reach[i] < ys[q]:
+                i += 1
+            result[q] = i
+        return result
+
+
+class PipelineIndex:
+    """
+    Bisect lookups of the segment containing y (see get_ideal_x_at_y).
+
+    Segments are matched first-wins on y_start <= y <= y_end. When the
+    non-empty spans are in increasing y order, that segment is the first
+    span ending at or below y, if it also starts above y. Pipelines
+    that aren't ordered that way fall back to the linear scan.
+    """
+
+    def __init__(self, segments: List['PathSegment']):
+        self.segments = segments
+        self.spans = [seg for seg in segments if seg.y_start <= seg.y_end]
+        self.y_starts = [seg.y_start for seg in self.spans]
+        self.y_ends = [seg.y_end for seg in self.spans]
+        self.ordered = all(a <= b for a, b in zip(self.y_starts, self.y_starts[1:])) and \
+            all(a <= b for a, b in zip(self.y_ends, self.y_ends[1:]))
+
+    def segment_at(self, y: float) -> Optional['PathSegment']:
+        if not self.ordered:
+            for seg in self.spans:
+                if seg.y_start <= y <= seg.y_end:
+                    return seg
+            return None
+
+        i = bisect_left(self.y_ends, y)
+        if i < len(self.spans) and self.y_starts[i] <= y:
+            return self.spans[i]
+        return None
+
+    def segments_at(self, ys: List[float]) -> List[Optional['PathSegment']]:
+        """segment_at for every y, in one merge pass over the sorted queries"""
+        if not self.ordered:
+            return [self.segment_at(y) for y in ys]
+
+        order = sorted(range(len(ys)), key=ys.__getitem__)
+        result = [None] * len(ys)
+        y_ends = self.y_ends
+        i = 0
+        for q in order:
+            y = ys[q]
+            while i < len(y_ends) and y_ends[i] < y:
+                i += 1
+            if i < len(self.spans) and self.y_starts[i] <= y:
+                result[q] = self.spans[i]
+        return result
+
+
+# Collision role codes
+ROLE_NORMAL = 0
+ROLE_STOPPER = 1
+ROLE_AMBIENT = 2
+
+
+class CompiledClouds:
+    """
+    Array-backed cloud set for the physics hot loop.
+
+    Resolves each create_cloud dict once (effective radius, push factor,
+    role code, influence values) into parallel lists, so simulate_step
+    never touches the dicts. The dicts themselves are left untouched.
+    """
+
+    __slots__ = ('x', 'center_y', 'min_dist', 'push', 'role',
+                 'bounce', 'friction', 'vx_delta', 'vy_delta', 'index',
+                 'tested')
+
+    def __init__(self, clouds: List[Dict]):
+        self.x = []
+        self.center_y = []
+        self.min_dist = []
+        self.push = []
+        self.role = []
+        self.bounce = []
+        self.friction = []
+        self.vx_delta = []
+        self.vy_delta = []
+
+        for cloud in clouds:
+            role = cloud.get('role', 'normal')
+            influence = cloud.get('influence', {})
+            base_radius = cloud.get('radius', DEFAULT_CLOUD_RADIUS)
+
+            if role == 'ambient':
+                # AMBIENT clouds have smaller collision radius
+                cr = base_radius * AMBIENT_RADIUS_SCALE
+                code = ROLE_AMBIENT
+                push = 0.3
+                bounce = AMBIENT_BOUNCE
+                friction = AMBIENT_FRICTION
+            elif role == 'stopper':
+                cr = base_radius
+                code = ROLE_STOPPER
+                push = 0.65
+                bounce = influence.get('bounce', 0.05)
+                friction = influence.get('friction', 0.95)
+            else:
+                cr = base_radius
+                code = ROLE_NORMAL
+                push = 0.65
+                bounce = influence.get('bounce', DEFAULT_BOUNCE)
+                friction = influence.get('friction', DEFAULT_FRICTION)
+
+            self.x.append(cloud['x'])
+            self.center_y.append(cloud['centerY'])
+            self.min_dist.append(PLAYER_RADIUS + cr)
+            self.push.append(push)
+            self.role.append(code)
+            self.bounce.append(bounce)
+            self.friction.append(friction)
+            self.vx_delta.append(influence.get('vx_delta', 0))
+            self.vy_delta.append(influence.get('vy_delta', 0))
+
+        self.index = CloudIndex(self.center_y, self.min_dist)
+
+        # Collision tests run against this set (for profiling)
+        self.tested = 0
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+class TrajectoryCache:
+    """
+    Per-game memo of simulate_trajectory runs.
+
+    Runs are keyed by cloud set, start state, stop_y, max_steps and
+    sample interval, so identical simulations run once. A run whose clouds extend a cached
+    run's clouds (and whose stop_y is no higher) resumes from the last
+    cached sample the appended clouds cannot have touched yet.
+    """
+
+    def __init__(self):
+        self.runs: Dict[tuple, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cloud_key(cloud: Dict) -> tuple:
+        influence = cloud.get('influence') or {}
+        return (cloud['x'], cloud['centerY'], cloud.get('radius'),
+                cloud.get('role'), tuple(sorted(influence.items())))
+
+    @staticmethod
+    def start_key(start: TrajectoryPoint, max_steps: int,
+                  sample_interval: int = SAMPLE_INTERVAL) -> tuple:
+        return (start.x, start.y, start.vx, start.vy, start.step, max_steps,
+                sample_interval)
+
+    def get(self, clouds: List[Dict], start: TrajectoryPoint, stop_y: float,
+            max_steps: int,
+            sample_interval: int = SAMPLE_INTERVAL) -> Optional[Trajectory]:
+        """The cached run for these arguments, if any"""
+        cloud_keys = tuple(self.cloud_key(c) for c in clouds)
+        start_key = self.start_key(start, max_steps, sample_interval)
+
+        cached = self.runs.get((cloud_keys, start_key, stop_y))
+        if cached is None:
+            return None
+        self.hits += 1
+        return cached[3]
+
+    def simulate(self, engine: 'GameEngine', clouds: List[Dict],
+                 start: TrajectoryPoint, stop_y: float, max_steps: int,
+                 sample_interval: int = SAMPLE_INTERVAL) -> Trajectory:
+        """Cached simulate_trajectory"""
+        cloud_keys = tuple(self.cloud_key(c) for c in clouds)
+        start_key = self.start_key(start, max_steps, sample_interval)
+
+        cached = self.runs.get((cloud_keys, start_key, stop_y))
+        if cached is not None:
+            self.hits += 1
+            return cached[3]
+
+        self.misses += 1
+        compiled = CompiledClouds(clouds)
+        trajectory = Trajectory(start)
+
+        # Longest reusable prefix among cached runs
+        for old_keys, old_start, old_stop, old_traj in self.runs.values():
+            if old_start != start_key or old_stop > stop_y:
+                continue
+            if len(old_keys) > len(cloud_keys) or cloud_keys[:len(old_keys)] != old_keys:
+                continue
+
+            j = engine._last_checkpoint(old_traj, compiled, len(old_keys))
+            if old_traj.step[j] > trajectory.step[-1]:
+                trajectory = old_traj[:j + 1]
+
+        engine._run_trajectory(compiled, trajectory, stop_y, max_steps,
+                               sample_interval)
+
+        self.runs[(cloud_keys, start_key, stop_y)] = (
+            cloud_keys, start_key, stop_y, trajectory)
+        return trajectory
+
+    def store(self, clouds: List[Dict], start: TrajectoryPoint, stop_y: float,
+              max_steps: int, trajectory: Trajectory):
+        """Record a run simulated outside the cache"""
+        cloud_keys = tuple(self.cloud_key(c) for c in clouds)
+        start_key = self.start_key(start, max_steps)
+        self.runs[(cloud_keys, start_key, stop_y)] = (
+            cloud_keys, start_key, stop_y, trajectory)
+
+
+class GameProfile:
+    """
+    Wall time and call counts per generation stage for one game.
+
+    Stages nest (a correction pass contains its physics run), so stage
+    times don't add up to the total. Physics runs also count steps
+    executed and cloud collision tests.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {'calls': 0, 'ms': 0.0}
+            if name == 'physics':
+                entry.update(steps=0, collisionsTested=0)
+        return entry
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time one call of a stage; yields its entry for extra counters"""
+        entry = self._entry(name)
+        t0 = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['calls'] += 1
+            entry['ms'] += (time.perf_counter() - t0) * 1000
+
+    def merge(self, other: Dict):
+        """Fold in another profile's as_dict() (e.g. from a worker)"""
+        for name, counts in other['stages'].items():
+            entry = self._entry(name)
+            for key, value in counts.items():
+                entry[key] = entry.get(key, 0) + value
+
+    def as_dict(self) -> Dict:
+        return {
+            'totalMs': (time.perf_counter() - self.started) * 1000,
+            'stages': {name: dict(entry) for name, entry in self.stages.items()},
+        }
+
+
 # ============================================================================
 # GAME ENGINE
 # ============================================================================
@@ -147,8 +583,20 @@ class NarrativeFlags:
 class GameEngine:
     """The Master Puppeteer"""
     
-    def __init__(self):
+    # Ambient clouds with strength <= this are render-only (None: off).
+    # Set process-wide with configure().
+    render_only_strength: Optional[float] = None
+    
+    # TrajectoryAtlas of prebuilt correction layouts (None: always search).
+    # Set process-wide with configure().
+    atlas = None
+    
+    def __init__(self, render_only_strength: float = None):
         self.rng_state = None
+        self.trajectory_cache = None
+        self.profile = None
+        if render_only_strength is not None:
+            self.render_only_strength = render_only_strength
     
     # ========================================================================
     # RNG (DETERMINISTIC)
@@ -178,14 +626,24 @@ class GameEngine:
     # OUTCOME DECISION
     # ========================================================================
     
-    def roll_outcome(self, rng) -> Dict:
-        """Roll for outcome type and multiplier"""
+    def roll_outcome(self, rng, forced_type: str = None) -> Dict:
+        """
+        Roll for outcome type and multiplier.
+        
+        forced_type pins the tier (the multiplier is still rolled), for
+        callers that drew the tier themselves, e.g. the game pool.
+        """
         r = rng()
         cumulative = 0
         
         for prob, min_mult, max_mult, outcome_type in OUTCOMES:
             cumulative += prob
-            if r < cumulative:
+            if forced_type is None:
+                hit = r < cumulative
+            else:
+                hit = outcome_type == forced_type
+            
+            if hit:
                 if min_mult == max_mult:
                     multiplier = min_mult
                 else:
@@ -313,59 +771,88 @@ class GameEngine:
         
         return segments
     
-    def get_ideal_x_at_y(self, segments: List[PathSegment], y: float) -> float:
-        """Get ideal X position at given Y"""
-        for seg in segments:
-            if seg.y_start <= y <= seg.y_end:
-                if abs(seg.y_end - seg.y_start) < 0.001:
-                    return seg.ideal_x_start
-                
-                t = (y - seg.y_start) / (seg.y_end - seg.y_start)
-                return seg.ideal_x_start + (seg.ideal_x_end - seg.ideal_x_start) * t
+    def get_ideal_x_at_y(self, segments, y: float) -> float:
+        """
+        Get ideal X position at given Y.
+        
+        Takes segments or a PipelineIndex; callers querying repeatedly
+        should index once, or batch through get_ideal_xs_at_ys.
+        """
+        pipeline = self._pipeline(segments)
+        return self._ideal_x(pipeline, pipeline.segment_at(y), y)
+    
+    def get_ideal_xs_at_ys(self, segments, ys: List[float]) -> List[float]:
+        """get_ideal_x_at_y for many ys in one pass"""
+        pipeline = self._pipeline(segments)
+        return [self._ideal_x(pipeline, seg, y)
+                for seg, y in zip(pipeline.segments_at(ys), ys)]
+    
+    def get_tolerance_at_y(self, segments, y: float) -> float:
+        """Get tolerance at given Y"""
+        seg = self._pipeline(segments).segment_at(y)
+        return seg.tolerance if seg is not None else 200
+    
+    def _pipeline(self, segments) -> PipelineIndex:
+        if isinstance(segments, PipelineIndex):
+            return segments
+        return PipelineIndex(segments)
+    
+    def _ideal_x(self, pipeline: PipelineIndex,
+                 seg: Optional[PathSegment], y: float) -> float:
+        if seg is not None:
+            if abs(seg.y_end - seg.y_start) < 0.001:
+                return seg.ideal_x_start
+            
+            t = (y - seg.y_start) / (seg.y_end - seg.y_start)
+            return seg.ideal_x_start + (seg.ideal_x_end - seg.ideal_x_start) * t
         
+        segments = pipeline.segments
         if y < segments[0].y_start:
             return segments[0].ideal_x_start
         return segments[-1].ideal_x_end
     
-    def get_tolerance_at_y(self, segments: List[PathSegment], y: float) -> float:
-        """Get tolerance at given Y"""
-        for seg in segments:
-            if seg.y_start <= y <= seg.y_end:
-                return seg.tolerance
-        return 200
-    
     # ========================================================================
     # PHYSICS SIMULATION
     # ========================================================================
     
     def simulate_step(self, point: TrajectoryPoint, 
-                     clouds: List[Dict]) -> TrajectoryPoint:
+                     clouds) -> TrajectoryPoint:
         """
         Simulate ONE physics step.
         MUST match frontend exactly.
+        
+        Takes cloud dicts or a CompiledClouds set; callers stepping
+        repeatedly should compile once and pass the compiled set.
         """
-        x, y = point.x, point.y
-        vx, vy = point.vx, point.vy
+        if not isinstance(clouds, CompiledClouds):
+            clouds = CompiledClouds(clouds)
         
+        x, y, vx, vy = self._step(point.x, point.y, point.vx, point.vy, clouds)
+        return TrajectoryPoint(x, y, vx, vy, point.step + 1)
+    
+    def _step(self, x: float, y: float, vx: float, vy: float,
+              clouds: CompiledClouds) -> Tuple[float, float, float, float]:
+        """simulate_step on bare state, so the physics loop allocates no points"""
         # Gravity
         vy = min(vy + GRAVITY, MAX_FALL)
         
-        # Cloud collisions
-        for cloud in clouds:
-            cx = cloud['x']
-            cy = cloud['centerY']
-            base_radius = cloud.get('radius', DEFAULT_CLOUD_RADIUS)
-            
-            # AMBIENT clouds have smaller collision radius
-            if cloud.get('role') == 'ambient':
-                cr = base_radius * AMBIENT_RADIUS_SCALE
-            else:
-                cr = base_radius
+        cloud_x = clouds.x
+        cloud_y = clouds.center_y
+        min_dists = clouds.min_dist
+        index = clouds.index
+        
+        # Cloud collisions (only clouds near the player's y band)
+        nearby, lo_y, hi_y = index.query(y)
+        clouds.tested += len(nearby)
+        k = 0
+        while k < len(nearby):
+            i = nearby[k]
+            k += 1
             
-            dx = x - cx
-            dy = y - cy
+            dx = x - cloud_x[i]
+            dy = y - cloud_y[i]
             dist_sq = dx * dx + dy * dy
-            min_dist = PLAYER_RADIUS + cr
+            min_dist = min_dists[i]
             
             if dist_sq < min_dist * min_dist and dist_sq > 0.001:
                 dist = math.sqrt(dist_sq)
@@ -374,31 +861,33 @@ class GameEngine:
                 
                 # Push out (tightened for precision)
                 overlap = min_dist - dist
-                push_factor = 0.65 if cloud.get('role') != 'ambient' else 0.3
+                push_factor = clouds.push[i]
                 x += nx * overlap * push_factor
                 y += ny * overlap * push_factor
                 
+                # Pushed out of the indexed band: re-query the rest
+                if not lo_y <= y < hi_y:
+                    nearby, lo_y, hi_y = index.query(y, after=i)
+                    clouds.tested += len(nearby)
+                    k = 0
+                
                 # Velocity response
                 rel_vel = vx * nx + vy * ny
                 
                 if rel_vel < 0:
-                    role = cloud.get('role', 'normal')
-                    influence = cloud.get('influence', {})
+                    role = clouds.role[i]
+                    bounce = clouds.bounce[i]
+                    friction = clouds.friction[i]
                     
-                    if role == 'stopper':
-                        bounce = influence.get('bounce', 0.05)
-                        friction = influence.get('friction', 0.95)
+                    if role == ROLE_STOPPER:
                         vx *= (1 - friction * 0.6)
                         vy *= -bounce if vy > 0 else 0.2
                     
-                    elif role == 'ambient':
+                    elif role == ROLE_AMBIENT:
                         # AMBIENT: Very weak interaction
-                        bounce = AMBIENT_BOUNCE
-                        friction = AMBIENT_FRICTION
-                        
                         # Minimal bounce
-                        vx -= (1 + bounce) * rel_vel * nx * 0.3
-                        vy -= (1 + bounce) * rel_vel * ny * 0.3
+                        vx -= (1 + bounce) * rel_vel * nx * AMBIENT_IMPULSE
+                        vy -= (1 + bounce) * rel_vel * ny * AMBIENT_IMPULSE
                         
                         # Almost no friction
                         vx *= friction
@@ -406,19 +895,17 @@ class GameEngine:
                     
                     else:
                         # Normal control clouds
-                        bounce = influence.get('bounce', DEFAULT_BOUNCE)
                         vx -= (1 + bounce) * rel_vel * nx
                         vy -= (1 + bounce) * rel_vel * ny
                         
-                        friction = influence.get('friction', DEFAULT_FRICTION)
                         tang_x = vx - (vx * nx + vy * ny) * nx
                         tang_y = vy - (vx * nx + vy * ny) * ny
                         vx -= tang_x * (1 - friction)
                         vy -= tang_y * (1 - friction)
                         
                         # Apply deltas
-                        vx += influence.get('vx_delta', 0)
-                        vy += influence.get('vy_delta', 0)
+                        vx += clouds.vx_delta[i]
+                        vy += clouds.vy_delta[i]
                         
                         # Damping
                         vx *= 0.92
@@ -457,60 +944,224 @@ class GameEngine:
                 vy = 0
                 vx *= GROUND_FRICTION
         
-        return TrajectoryPoint(x, y, vx, vy, point.step + 1)
+        return x, y, vx, vy
     
     def simulate_trajectory(self, clouds: List[Dict],
                            start: TrajectoryPoint = None,
                            stop_y: float = None,
-                           max_steps: int = 25000) -> List[TrajectoryPoint]:
-        """Simulate full trajectory"""
+                           max_steps: int = 25000,
+                           sample_interval: int = SAMPLE_INTERVAL) -> Trajectory:
+        """
+        Simulate full trajectory, sampled every sample_interval steps.
+        
+        While a game is being generated, runs go through the per-game
+        TrajectoryCache; the returned trajectory may be shared, so treat
+        it as read-only.
+        """
         if start is None:
             start = TrajectoryPoint(SCREEN_CENTER, SPAWN_START_Y, 0, 5)
         if stop_y is None:
             stop_y = GROUND_COLLISION_Y
         
-        point = start.copy()
-        trajectory = [point.copy()]
-        sample_interval = 15
+        with self._stage('simulate_trajectory'):
+            if self.trajectory_cache is not None:
+                return self.trajectory_cache.simulate(self, clouds, start, stop_y,
+                                                      max_steps, sample_interval)
+            
+            trajectory = Trajectory(start)
+            self._run_trajectory(CompiledClouds(clouds), trajectory,
+                                 stop_y, max_steps, sample_interval)
+            return trajectory
+    
+    def iter_trajectory(self, clouds: List[Dict],
+                        start: TrajectoryPoint = None,
+                        stop_y: float = None,
+                        max_steps: int = 25000,
+                        sample_interval: int = SAMPLE_INTERVAL):
+        """
+        Lazily yield the samples simulate_trajectory would return.
         
-        for step in range(max_steps):
-            point = self.simulate_step(point, clouds)
+        Physics only runs as far as the consumer reads, so a consumer
+        that stops early (verify_corrections, find_point_at_y on the
+        stream) skips the rest of the fall. A run already in the per-game
+        TrajectoryCache is replayed instead of simulated.
+        """
+        if start is None:
+            start = TrajectoryPoint(SCREEN_CENTER, SPAWN_START_Y, 0, 5)
+        if stop_y is None:
+            stop_y = GROUND_COLLISION_Y
+        
+        if self.trajectory_cache is not None:
+            cached = self.trajectory_cache.get(clouds, start, stop_y,
+                                               max_steps, sample_interval)
+            if cached is not None:
+                yield from cached
+                return
+        
+        yield start.copy()
+        samples = self._samples(CompiledClouds(clouds), start.x, start.y,
+                                start.vx, start.vy, start.y, 0, start.step,
+                                stop_y, max_steps, sample_interval)
+        for x, y, vx, vy, step, _ in samples:
+            yield TrajectoryPoint(x, y, vx, vy, step)
+    
+    def _run_trajectory(self, clouds: CompiledClouds, trajectory: Trajectory,
+                        stop_y: float, max_steps: int,
+                        sample_interval: int = SAMPLE_INTERVAL):
+        """
+        Advance a run from its last sample until it stops.
+        
+        trajectory[0] is the start state; a trajectory cut after any
+        regular sample resumes exactly where the full run would be.
+        """
+        if self.profile is not None:
+            with self.profile.stage('physics') as stage:
+                first_step, first_tested = trajectory.step[-1], clouds.tested
+                self._advance(clouds, trajectory, stop_y, max_steps, sample_interval)
+                stage['steps'] += trajectory.step[-1] - first_step
+                stage['collisionsTested'] += clouds.tested - first_tested
+        else:
+            self._advance(clouds, trajectory, stop_y, max_steps, sample_interval)
+    
+    def _advance(self, clouds: CompiledClouds, trajectory: Trajectory,
+                 stop_y: float, max_steps: int, sample_interval: int):
+        """Append the samples of _samples from the last one on"""
+        start_step = trajectory.step[0]
+        append = trajectory.append
+        for sample in self._samples(clouds, trajectory.x[-1], trajectory.y[-1],
+                                    trajectory.vx[-1], trajectory.vy[-1],
+                                    trajectory.peak[-1],
+                                    trajectory.step[-1] - start_step, start_step,
+                                    stop_y, max_steps, sample_interval):
+            append(*sample)
+    
+    def _samples(self, clouds: CompiledClouds, x: float, y: float,
+                 vx: float, vy: float, peak: float, first_step: int,
+                 start_step: int, stop_y: float, max_steps: int,
+                 sample_interval: int):
+        """
+        Physics loop: yield (x, y, vx, vy, step, peak) every
+        sample_interval loop steps, and once more for the step the run
+        stops on (ground, stop_y or stall).
+        """
+        step_fn = self._step
+        
+        for step in range(first_step, max_steps):
+            x, y, vx, vy = step_fn(x, y, vx, vy, clouds)
+            
+            if y > peak:
+                peak = y
             
             if step % sample_interval == 0:
-                trajectory.append(point.copy())
+                yield x, y, vx, vy, start_step + step + 1, peak
             
-            if point.y >= stop_y - 20:
-                trajectory.append(point.copy())
+            if y >= stop_y - 20:
+                yield x, y, vx, vy, start_step + step + 1, peak
                 break
             
-            if point.y > SPAWN_START_Y and point.speed < 0.8:
-                trajectory.append(point.copy())
+            if y > SPAWN_START_Y and math.sqrt(vx ** 2 + vy ** 2) < 0.8:
+                yield x, y, vx, vy, start_step + step + 1, peak
                 break
+    
+    def _last_checkpoint(self, trajectory: Trajectory, clouds: CompiledClouds,
+                         first_new: int) -> int:
+        """
+        Index of the last sample a run can resume from after clouds
+        from first_new on were appended to its cloud set.
         
-        return trajectory
+        Appended clouds can't act before the player nears their band,
+        and only regular samples taken before the run ended can resume.
+        """
+        limit = math.inf
+        for i in range(first_new, len(clouds)):
+            limit = min(limit, clouds.center_y[i] - clouds.min_dist[i])
+        limit -= CHECKPOINT_PUSH_MARGIN
+        
+        peaks, steps = trajectory.peak, trajectory.step
+        end_step = steps[-1]
+        j = 0
+        while (j + 1 < len(steps) and peaks[j + 1] < limit
+               and steps[j + 1] < end_step):
+            j += 1
+        
+        return j
     
-    def find_point_at_y(self, trajectory: List[TrajectoryPoint],
+    def find_point_at_y(self, trajectory,
                        target_y: float) -> Optional[TrajectoryPoint]:
-        """Find point at Y via interpolation"""
-        for i, point in enumerate(trajectory):
-            if point.y >= target_y:
-                if i == 0:
-                    return point.copy()
-                
-                prev = trajectory[i - 1]
-                if abs(point.y - prev.y) < 0.001:
-                    return point.copy()
-                
-                t = (target_y - prev.y) / (point.y - prev.y)
-                return TrajectoryPoint(
-                    prev.x + (point.x - prev.x) * t,
-                    target_y,
-                    prev.vx + (point.vx - prev.vx) * t,
-                    prev.vy + (point.vy - prev.vy) * t,
-                    prev.step
-                )
+        """
+        Find point at Y via interpolation.
         
-        return trajectory[-1].copy() if trajectory else None
+        Takes a trajectory, a TrajectoryIndex, or a sample stream from
+        iter_trajectory (read only up to the crossing). Callers querying
+        one trajectory repeatedly should index once, or batch through
+        find_points_at_ys.
+        """
+        if isinstance(trajectory, Iterator):
+            prev = None
+            for point in trajectory:
+                if point.y >= target_y:
+                    return self._interpolate(prev, point, target_y)
+                prev = point
+            return prev
+        
+        index = self._trajectory_index(trajectory)
+        return self._point_at(index.trajectory, index.first_at(target_y), target_y)
+    
+    def find_points_at_ys(self, trajectory,
+                          ys: List[float]) -> List[Optional[TrajectoryPoint]]:
+        """find_point_at_y for many ys in one pass"""
+        index = self._trajectory_index(trajectory)
+        return [self._point_at(index.trajectory, i, y)
+                for i, y in zip(index.first_at_many(ys), ys)]
+    
+    def iter_points_at_ys(self, samples: Iterator[TrajectoryPoint],
+                          ys: List[float]) -> Iterator[Optional[TrajectoryPoint]]:
+        """
+        find_points_at_ys for ascending ys on a sample stream (see
+        iter_trajectory): each point is yielded once the stream crosses
+        its y, so the stream is read no further than the consumer needs.
+        """
+        prev = point = None
+        i = 0
+        for point in samples:
+            while i < len(ys) and point.y >= ys[i]:
+                yield self._interpolate(prev, point, ys[i])
+                i += 1
+            if i == len(ys):
+                return
+            prev = point
+        
+        for _ in range(i, len(ys)):
+            yield point.copy() if point is not None else None
+    
+    def _trajectory_index(self, trajectory) -> TrajectoryIndex:
+        if isinstance(trajectory, TrajectoryIndex):
+            return trajectory
+        return TrajectoryIndex(trajectory)
+    
+    def _point_at(self, trajectory, i: int,
+                  target_y: float) -> Optional[TrajectoryPoint]:
+        """Interpolate between sample i - 1 and the first sample >= target_y"""
+        if i == len(trajectory):
+            return trajectory[-1].copy() if trajectory else None
+        
+        return self._interpolate(trajectory[i - 1] if i > 0 else None,
+                                 trajectory[i], target_y)
+    
+    def _interpolate(self, prev: Optional[TrajectoryPoint], point: TrajectoryPoint,
+                     target_y: float) -> TrajectoryPoint:
+        """Point at target_y between prev and point (point itself if no prev)"""
+        if prev is None or abs(point.y - prev.y) < 0.001:
+            return point.copy()
+        
+        t = (target_y - prev.y) / (point.y - prev.y)
+        return TrajectoryPoint(
+            prev.x + (point.x - prev.x) * t,
+            target_y,
+            prev.vx + (point.vx - prev.vx) * t,
+            prev.vy + (point.vy - prev.vy) * t,
+            prev.step
+        )
     
     # ========================================================================
     # CLOUD CREATION
@@ -586,26 +1237,40 @@ class GameEngine:
     
     def place_correction_clouds(self, segments: List[PathSegment],
                                 rng, max_attempts: int = 10) -> List[Dict]:
-        """Place correction clouds to guide player along pipeline"""
+        """
+        Place correction clouds to guide player along pipeline.
+        
+        Each pass only appends clouds, so its re-simulation resumes from
+        the last checkpoint above the highest new cloud instead of
+        replaying the whole drop.
+        """
         clouds = []
+        start = TrajectoryPoint(SCREEN_CENTER, SPAWN_START_Y, 0, 5)
+        max_steps = 25000
+        trajectory = Trajectory(start)
+        simulated = 0
+        
+        # Check points and their pipeline targets are the same every pass
+        check_ys, check_segs, ideal_xs = self._correction_checks(segments)
         
         for attempt in range(max_attempts):
-            trajectory = self.simulate_trajectory(clouds)
-            
-            corrections_needed = 0
-            
-            for seg in segments:
-                num_checks = 3
-                for i in range(num_checks):
-                    progress = (i + 1) / (num_checks + 1)
-                    check_y = seg.y_start + (seg.y_end - seg.y_start) * progress
-                    
-                    point = self.find_point_at_y(trajectory, check_y)
+            with self._stage('correction_pass'):
+                compiled = CompiledClouds(clouds)
+                if attempt > 0:
+                    j = self._last_checkpoint(trajectory, compiled, simulated)
+                    trajectory = trajectory[:j + 1]
+                self._run_trajectory(compiled, trajectory,
+                                     GROUND_COLLISION_Y, max_steps)
+                simulated = len(clouds)
+                
+                corrections_needed = 0
+                
+                points = self.find_points_at_ys(trajectory, check_ys)
+                for point, seg, ideal_x in zip(points, check_segs, ideal_xs):
                     if point is None:
                         continue
                     
-                    ideal_x = self.get_ideal_x_at_y(segments, check_y)
-                    tolerance = self.get_tolerance_at_y(segments, check_y)
+                    tolerance = seg.tolerance if seg is not None else 200
                     
                     deviation = point.x - ideal_x
                     
@@ -620,6 +1285,65 @@ class GameEngine:
             if corrections_needed == 0:
                 break
         
+        # Later passes extend this cloud set; let them resume from it
+        if self.trajectory_cache is not None and simulated == len(clouds):
+            self.trajectory_cache.store(clouds, start, GROUND_COLLISION_Y,
+                                        max_steps, trajectory)
+        
+        return clouds
+    
+    def _correction_checks(self, segments: List[PathSegment]
+                           ) -> Tuple[List[float], List[Optional[PathSegment]], List[float]]:
+        """Check ys (3 per segment), their segments and ideal xs"""
+        num_checks = 3
+        check_ys = [seg.y_start + (seg.y_end - seg.y_start) * ((i + 1) / (num_checks + 1))
+                    for seg in segments for i in range(num_checks)]
+        pipeline = PipelineIndex(segments)
+        return (check_ys, pipeline.segments_at(check_ys),
+                self.get_ideal_xs_at_ys(pipeline, check_ys))
+    
+    def verify_corrections(self, segments: List[PathSegment],
+                           clouds: List[Dict]) -> bool:
+        """
+        True if a drop through clouds is within tolerance at every check point.
+        
+        The drop is streamed, top check point first, so a layout that
+        misses one stops the physics there instead of running the fall out.
+        """
+        check_ys, check_segs, ideal_xs = self._correction_checks(segments)
+        order = sorted(range(len(check_ys)), key=check_ys.__getitem__)
+        points = self.iter_points_at_ys(self.iter_trajectory(clouds),
+                                        [check_ys[k] for k in order])
+        
+        for k, point in zip(order, points):
+            if point is None:
+                continue
+            seg = check_segs[k]
+            tolerance = seg.tolerance if seg is not None else 200
+            if abs(point.x - ideal_xs[k]) > tolerance:
+                return False
+        
+        return True
+    
+    def atlas_corrections(self, target_x: float, target_y: float,
+                          stop_method: str, segments: List[PathSegment],
+                          rng) -> Optional[List[Dict]]:
+        """
+        Correction clouds from the trajectory atlas: a layout built for
+        the target's bucket, jittered, and kept only if it re-verifies
+        against this game's pipeline. None sends the caller to the
+        place_correction_clouds search.
+        """
+        count = self.atlas.layout_count_at(target_x, target_y, stop_method)
+        if count == 0:
+            return None
+        
+        clouds = self.atlas.layout(target_x, target_y, stop_method, int(rng() * count))
+        for cloud in clouds:
+            cloud['x'] += int((rng() - 0.5) * 2 * ATLAS_JITTER)
+        
+        if not self.verify_corrections(segments, clouds):
+            return None
         return clouds
     
     def _place_correction_cloud(self, point: TrajectoryPoint,
@@ -664,12 +1388,13 @@ class GameEngine:
         These should NOT interfere with gameplay:
         - Weak physics (minimal bounce/friction)
         - Placed away from control path
+        - No overlaps with control or other ambient clouds
         - SAME SIZE as control clouds for consistency
         """
         ambient = []
         
-        # Get control cloud positions for avoidance
-        control_positions = [(c['x'], c['centerY']) for c in control_clouds]
+        # Placed cloud positions for avoidance
+        grid = PlacementGrid([(c['x'], c['centerY']) for c in control_clouds])
         
         # INCREASED: 70-100 ambient clouds
         num_ambient = 70 + int(rng() * 30)
@@ -689,13 +1414,8 @@ class GameEngine:
                 # Middle (sparse)
                 x = ENVELOPE_INNER + rng() * (ENVELOPE_OUTER - ENVELOPE_INNER)
             
-            # Check not overlapping control clouds
-            too_close = any(
-                abs(cx - x) < 220 and abs(cy - y) < 200
-                for cx, cy in control_positions
-            )
-            
-            if too_close:
+            # Check not overlapping placed clouds
+            if grid.overlaps(x, y):
                 continue
             
             # SAME radius as control clouds (consistency)
@@ -705,14 +1425,39 @@ class GameEngine:
                 x, y, 'ambient',
                 radius=radius
             ))
+            grid.add(x, y)
         
         # Add floating layers
-        ambient.extend(self._add_cloud_layers(control_positions, rng))
+        ambient.extend(self._add_cloud_layers(grid, rng))
         
         return ambient
     
-    def _add_cloud_layers(self, control_positions: List[Tuple[float, float]], 
-                         rng) -> List[Dict]:
+    def ambient_strength(self, cloud: Dict) -> float:
+        """
+        How hard an ambient cloud can deflect the player: its share of a
+        normal bounce impulse, scaled by size against a default cloud.
+        """
+        radius = cloud.get('radius', DEFAULT_CLOUD_RADIUS)
+        return AMBIENT_IMPULSE * (1 + AMBIENT_BOUNCE) * radius / DEFAULT_CLOUD_RADIUS
+    
+    def split_render_only(self, ambient: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split ambient clouds into (physics, render-only) at
+        render_only_strength. Render-only clouds are drawn by the client
+        but left out of every collision test, server and client side.
+        """
+        if self.render_only_strength is None:
+            return ambient, []
+        
+        physics, render_only = [], []
+        for cloud in ambient:
+            if self.ambient_strength(cloud) <= self.render_only_strength:
+                render_only.append(cloud)
+            else:
+                physics.append(cloud)
+        return physics, render_only
+    
+    def _add_cloud_layers(self, grid: PlacementGrid, rng) -> List[Dict]:
         """Add horizontal cloud layers at key heights"""
         layers = []
         
@@ -735,18 +1480,14 @@ class GameEngine:
                 x += (rng() - 0.5) * 180
                 y = layer_y + (rng() - 0.5) * 400
                 
-                # Check not overlapping control
-                too_close = any(
-                    abs(cx - x) < 220 and abs(cy - y) < 200
-                    for cx, cy in control_positions
-                )
-                
-                if not too_close:
+                # Check not overlapping placed clouds
+                if not grid.overlaps(x, y):
                     radius = int(90 + rng() * 45)
                     layers.append(self.create_cloud(
                         x, y, 'ambient',
                         radius=radius
                     ))
+                    grid.add(x, y)
         
         return layers
     
@@ -763,7 +1504,8 @@ class GameEngine:
         
         dark_clouds = []
         
-        trajectory = self.simulate_trajectory(clouds)
+        trajectory = TrajectoryIndex(self.simulate_trajectory(clouds))
+        pipeline = PipelineIndex(segments)
         
         tension_segments = [
             seg for seg in segments 
@@ -784,8 +1526,8 @@ class GameEngine:
             if point is None:
                 continue
             
-            ideal_x = self.get_ideal_x_at_y(segments, check_y)
-            tolerance = self.get_tolerance_at_y(segments, check_y)
+            ideal_x = self.get_ideal_x_at_y(pipeline, check_y)
+            tolerance = self.get_tolerance_at_y(pipeline, check_y)
             
             offset = tolerance * (0.8 + rng() * 0.4)
             offset *= 1 if rng() < 0.5 else -1
@@ -823,22 +1565,23 @@ class GameEngine:
         mid_start_y = SPAWN_START_Y + (SPAWN_END_Y - SPAWN_START_Y) * 0.3
         mid_end_y = SPAWN_START_Y + (SPAWN_END_Y - SPAWN_START_Y) * 0.7
         
-        for point in trajectory:
-            if mid_start_y <= point.y <= mid_end_y:
-                ideal_x = self.get_ideal_x_at_y(segments, point.y)
-                deviation = abs(point.x - ideal_x)
-                
-                if deviation < best_deviation:
-                    best_deviation = deviation
-                    best_point = point
+        band = [i for i, y in enumerate(trajectory.y) if mid_start_y <= y <= mid_end_y]
+        ideal_xs = self.get_ideal_xs_at_ys(segments, [trajectory.y[i] for i in band])
+        
+        for i, ideal_x in zip(band, ideal_xs):
+            deviation = abs(trajectory.x[i] - ideal_x)
+            
+            if deviation < best_deviation:
+                best_deviation = deviation
+                best_point = i
         
         if best_point is None:
             return None
         
         return {
             'type': 'blackhole',
-            'x': int(best_point.x),
-            'y': int(best_point.y),
+            'x': int(trajectory.x[best_point]),
+            'y': int(trajectory.y[best_point]),
             'multiplier': multiplier,
             'payout': target_payout
         }
@@ -879,11 +1622,10 @@ class GameEngine:
                 break
             
             idx = 1 + int(rng() * (len(trajectory) - 2))
-            point = trajectory[idx]
             
             # WIDER scatter (±600px, was ±350)
-            cx = point.x + (rng() - 0.5) * 600
-            cy = point.y + (rng() - 0.5) * 400
+            cx = trajectory.x[idx] + (rng() - 0.5) * 600
+            cy = trajectory.y[idx] + (rng() - 0.5) * 400
             
             cx = max(CORRECTION_INNER - 100,
                     min(CORRECTION_OUTER + 100, cx))
@@ -1026,9 +1768,13 @@ class GameEngine:
     # RUN VALIDATION (QUALITY FILTER)
     # ========================================================================
     
-    def validate_run(self, clouds: List[Dict], trajectory: List[TrajectoryPoint],
+    def validate_run(self, clouds: List[Dict], trajectory,
                     segments: List[PathSegment]) -> Tuple[bool, str]:
-        """Validate run quality"""
+        """Validate run quality (trajectory: Trajectory or list of points)"""
+        if not isinstance(trajectory, Trajectory):
+            trajectory = Trajectory.from_points(trajectory)
+        xs, ys, vxs, vys = trajectory.x, trajectory.y, trajectory.vx, trajectory.vy
+        
         # Too many correction clouds?
         correction_clouds = [c for c in clouds if c.get('role') in ['guide', 'redirect']]
         if len(correction_clouds) > 25:
@@ -1037,9 +1783,7 @@ class GameEngine:
         # Check oscillation
         if len(trajectory) > 10:
             direction_changes = 0
-            for i in range(1, len(trajectory) - 1):
-                prev_vx = trajectory[i - 1].vx
-                curr_vx = trajectory[i].vx
+            for prev_vx, curr_vx in zip(vxs, vxs[1:-1]):
                 if abs(prev_vx) > 0.5 and abs(curr_vx) > 0.5:
                     if (prev_vx > 0) != (curr_vx > 0):
                         direction_changes += 1
@@ -1049,8 +1793,8 @@ class GameEngine:
         
         # Check stalls
         stall_count = 0
-        for point in trajectory:
-            if point.y > SPAWN_START_Y + 1000 and point.speed < 1.5:
+        for y, vx, vy in zip(ys, vxs, vys):
+            if y > SPAWN_START_Y + 1000 and math.sqrt(vx ** 2 + vy ** 2) < 1.5:
                 stall_count += 1
         
         if stall_count > len(trajectory) * 0.15:
@@ -1059,10 +1803,8 @@ class GameEngine:
         # Check sharp turns
         if len(trajectory) > 5:
             sharp_turns = 0
-            for i in range(2, len(trajectory)):
-                prev = trajectory[i - 2]
-                curr = trajectory[i]
-                dx = curr.x - prev.x
+            for prev_x, curr_x in zip(xs, xs[2:]):
+                dx = curr_x - prev_x
                 if abs(dx) > 400:
                     sharp_turns += 1
             
@@ -1077,83 +1819,231 @@ class GameEngine:
     
     def generate_game(self, bet_amount: float,
                      bonus_mode: bool = False,
-                     max_retries: int = 5) -> Dict:
-        """Generate complete game"""
+                     max_retries: int = 5,
+                     outcome_type: str = None,
+                     executor: Executor = None,
+                     workers: int = None) -> Dict:
+        """
+        Generate complete game (outcome_type pins the outcome tier).
+        
+        With a process-pool executor, up to workers attempts (default:
+        all of them) run concurrently and the first valid one in seed
+        order wins. Attempt
+        seeds are retry_seeds of a fresh root seed, so the result is the
+        one generate_game_from_seed gives for that root.
+        
+        The per-stage GameProfile of the run is attached as 'profile'.
+        """
+        profile = self.profile = GameProfile()
+        try:
+            if executor is not None:
+                result = self._generate_game_parallel(bet_amount, bonus_mode,
+                                                      max_retries, outcome_type,
+                                                      executor, workers)
+            else:
+                result = self._generate_game(bet_amount, bonus_mode,
+                                             max_retries, outcome_type)
+        finally:
+            self.profile = None
+        
+        result['profile'] = profile.as_dict()
+        return result
+    
+    def generate_game_from_seed(self, seed: int, bet_amount: float,
+                                bonus_mode: bool = False,
+                                outcome_type: str = None,
+                                max_retries: int = 5) -> Dict:
+        """
+        Deterministic generate_game: the same arguments give the same script.
+        
+        Attempt 1 uses seed itself and retries use retry_seeds(seed). The
+        returned 'seed' is the accepted attempt's, which replays on its
+        first attempt, so storing that one seed is enough to rebuild the
+        game. Only sessionId (and the profile) differ between calls.
+        """
+        profile = self.profile = GameProfile()
+        try:
+            result = self._generate_game(bet_amount, bonus_mode, max_retries,
+                                         outcome_type, seed)
+        finally:
+            self.profile = None
+        
+        result['profile'] = profile.as_dict()
+        return result
+    
+    def retry_seeds(self, seed: int):
+        """Attempt seeds for a root seed: itself, then a derived stream"""
+        rng = self.mulberry32(seed ^ 0x9E3779B9)
+        yield seed
+        while True:
+            yield int(rng() * 4294967296)
+    
+    def _stage(self, name: str):
+        """Profile a stage of the game being generated (no-op otherwise)"""
+        if self.profile is None:
+            return nullcontext({})
+        return self.profile.stage(name)
+    
+    def _generate_game(self, bet_amount: float, bonus_mode: bool,
+                       max_retries: int, outcome_type: str,
+                       seed: int = None) -> Dict:
+        """Sequential attempts (fresh seeds, or retry_seeds of a root seed)"""
+        seeds = self.retry_seeds(seed) if seed is not None else repeat(None)
         for attempt in range(max_retries):
-            try:
-                result = self._generate_game_attempt(bet_amount, bonus_mode)
-                
-                # Validate
-                all_clouds = [s for s in result['script']['spawns'] if s['type'] == 'cloud']
-                trajectory = result.get('_trajectory', [])
-                segments = result.get('_segments', [])
-                
-                if trajectory and segments:
-                    valid, reason = self.validate_run(all_clouds, trajectory, segments)
-                    if not valid:
-                        print(f"  Attempt {attempt + 1}: Rejected ({reason})")
-                        continue
-                
-                # Clean internal data
-                result.pop('_trajectory', None)
-                result.pop('_segments', None)
-                
+            result = self._validated_attempt(bet_amount, bonus_mode,
+                                             outcome_type, attempt, next(seeds))
+            if result is not None:
                 return result
-            
-            except Exception as e:
-                print(f"  Attempt {attempt + 1}: Error ({e})")
-                continue
         
         # Fallback
         print("  All attempts failed - returning death")
-        return self._generate_death_fallback(bet_amount, bonus_mode)
+        return self._generate_death_fallback(bet_amount, bonus_mode, seed)
+    
+    def _generate_game_parallel(self, bet_amount: float, bonus_mode: bool,
+                                max_retries: int, outcome_type: str,
+                                executor: Executor, workers: int = None) -> Dict:
+        """Seeded attempts across a process pool (see generate_game)"""
+        root = self.generate_seed()
+        seeds = self.retry_seeds(root)
+        # Attempts past the pool's width are submitted as earlier ones
+        # fail, so a first-attempt success costs one window
+        width = min(max_retries, workers or max_retries)
+        # This engine's settings, for workers configured differently
+        atlas = self.atlas
+        settings = (self.render_only_strength,
+                    atlas.path if atlas is not None else None,
+                    atlas.digest if atlas is not None else None)
+        
+        futures = deque()
+        
+        def submit(attempt: int):
+            futures.append(executor.submit(_run_validated_attempt, bet_amount, bonus_mode,
+                                           outcome_type, attempt, next(seeds), settings))
+        
+        for attempt in range(width):
+            submit(attempt)
+        
+        for attempt in range(max_retries):
+            with self._stage('parallel_wait'):
+                result = futures.popleft().result()
+            if result is not None:
+                self.profile.merge(result.pop('profile'))
+                # Attempts that haven't started yet are dropped
+                for leftover in futures:
+                    leftover.cancel()
+                return result
+            if attempt + width < max_retries:
+                submit(attempt + width)
+        
+        # Fallback
+        print("  All attempts failed - returning death")
+        return self._generate_death_fallback(bet_amount, bonus_mode, root)
+    
+    def _validated_attempt(self, bet_amount: float, bonus_mode: bool,
+                           outcome_type: str, attempt: int,
+                           seed: int = None) -> Optional[Dict]:
+        """One attempt that passed validate_run, or None"""
+        try:
+            result = self._generate_game_attempt(bet_amount, bonus_mode,
+                                                 outcome_type, seed)
+            
+            # Validate
+            all_clouds = [s for s in result['script']['spawns'] if s['type'] == 'cloud']
+            trajectory = result.get('_trajectory', [])
+            segments = result.get('_segments', [])
+            
+            if trajectory and segments:
+                with self._stage('validation'):
+                    valid, reason = self.validate_run(all_clouds, trajectory, segments)
+                if not valid:
+                    print(f"  Attempt {attempt + 1}: Rejected ({reason})")
+                    return None
+            
+            # Clean internal data
+            result.pop('_trajectory', None)
+            result.pop('_segments', None)
+            
+            return result
+        
+        except Exception as e:
+            print(f"  Attempt {attempt + 1}: Error ({e})")
+            return None
     
     def _generate_game_attempt(self, bet_amount: float,
-                               bonus_mode: bool) -> Dict:
+                               bonus_mode: bool,
+                               outcome_type: str = None,
+                               seed: int = None) -> Dict:
         """Single generation attempt"""
+        self.trajectory_cache = TrajectoryCache()
+        try:
+            return self._build_game(bet_amount, bonus_mode, outcome_type, seed)
+        finally:
+            self.trajectory_cache = None
+    
+    def _build_game(self, bet_amount: float, bonus_mode: bool,
+                    outcome_type: str = None, seed: int = None) -> Dict:
+        """Build one game script (see _generate_game_attempt)"""
         # RNG
-        seed = self.generate_seed()
-        rng = self.mulberry32(seed)
+        with self._stage('seed'):
+            if seed is None:
+                seed = self.generate_seed()
+            rng = self.mulberry32(seed)
         
         # Outcome
-        outcome = self.roll_outcome(rng)
-        effective_bet = bet_amount * (10 if bonus_mode else 1)
-        target_payout = round(effective_bet * outcome['multiplier'], 2)
-        
-        # Narrative flags
-        flags = self.determine_narrative_flags(outcome, rng)
-        
-        # Target
-        target_x, target_y, stop_method = self._determine_target(outcome, rng)
-        
-        # Pipeline
-        segments = self.generate_pipeline(target_x, target_y, outcome, rng)
-        
-        # CONTROL clouds (these actually guide)
-        control_clouds = self.place_correction_clouds(segments, rng)
+        with self._stage('outcome'):
+            outcome = self.roll_outcome(rng, outcome_type)
+            effective_bet = bet_amount * (10 if bonus_mode else 1)
+            target_payout = round(effective_bet * outcome['multiplier'], 2)
+            
+            # Narrative flags
+            flags = self.determine_narrative_flags(outcome, rng)
         
-        # Add stopper trap if needed
-        if stop_method == 'trap':
-            trap = self.build_stopper_trap(target_x, target_y, rng)
-            control_clouds.extend(trap)
+        with self._stage('pipeline'):
+            # Target
+            target_x, target_y, stop_method = self._determine_target(outcome, rng)
+            
+            # Pipeline
+            segments = self.generate_pipeline(target_x, target_y, outcome, rng)
+        
+        with self._stage('corrections'):
+            # CONTROL clouds (these actually guide): a prebuilt layout if
+            # one holds for this pipeline, else search
+            control_clouds = None
+            if self.atlas is not None:
+                with self._stage('atlas'):
+                    control_clouds = self.atlas_corrections(target_x, target_y,
+                                                            stop_method, segments, rng)
+            if control_clouds is None:
+                control_clouds = self.place_correction_clouds(segments, rng)
+            
+            # Add stopper trap if needed
+            if stop_method == 'trap':
+                trap = self.build_stopper_trap(target_x, target_y, rng)
+                control_clouds.extend(trap)
         
         # AMBIENT clouds (visual only, minimal physics)
-        ambient_clouds = self.place_ambient_clouds(segments, control_clouds, rng)
+        with self._stage('ambient'):
+            ambient_clouds = self.place_ambient_clouds(segments, control_clouds, rng)
+            ambient_clouds, render_only = self.split_render_only(ambient_clouds)
         
-        # Simulate with ALL clouds
+        # Simulate with ALL physics clouds
         all_clouds = control_clouds + ambient_clouds
         trajectory = self.simulate_trajectory(all_clouds, stop_y=target_y + 300)
         
         # Special actors
-        dark_clouds = self.place_dark_clouds(segments, all_clouds, flags, rng)
-        collectibles = self.place_collectibles(segments, all_clouds, flags, rng)
-        ground_objects = self.place_ground_objects(target_x, outcome, target_payout, rng)
+        with self._stage('dark_clouds'):
+            dark_clouds = self.place_dark_clouds(segments, all_clouds, flags, rng)
+        with self._stage('collectibles'):
+            collectibles = self.place_collectibles(segments, all_clouds, flags, rng)
+        with self._stage('ground_objects'):
+            ground_objects = self.place_ground_objects(target_x, outcome, target_payout, rng)
         
         # Black hole
         black_hole = None
         if flags.allow_black_hole:
-            black_hole = self.place_black_hole(segments, all_clouds, target_payout,
-                                              outcome['multiplier'], rng)
+            with self._stage('black_hole'):
+                black_hole = self.place_black_hole(segments, all_clouds, target_payout,
+                                                  outcome['multiplier'], rng)
         
         # Build spawns list
         spawns = all_clouds + dark_clouds
@@ -1177,12 +2067,17 @@ class GameEngine:
             'immediateDeath': outcome['type'] == 'dead' and target_payout == 0,
             'deathAnimation': 'implode' if outcome['type'] == 'dead' else None
         }
+        if self.render_only_strength is not None:
+            # Drawn only; clients must not collide with these
+            script['renderOnly'] = render_only
         
         session_id = hashlib.sha256(f"{seed}{time.time()}".encode()).hexdigest()[:16]
         
         print(f"✅ Generated: {outcome['type']} → ₹{target_payout}")
         print(f"   Control clouds: {len(control_clouds)}")
         print(f"   Ambient clouds: {len(ambient_clouds)}")
+        if render_only:
+            print(f"   Render-only clouds: {len(render_only)}")
         print(f"   Collectibles: {len(collectibles)}")
         
         return {
@@ -1196,6 +2091,44 @@ class GameEngine:
             '_segments': segments
         }
     
+    def rescale_game(self, game: Dict, bet_amount: float,
+                     bonus_mode: bool) -> Dict:
+        """
+        Re-target a generated game to another bet amount.
+        
+        Layout and multiplier are kept; every payout-bearing field is
+        recomputed for the new bet and a fresh session id is issued.
+        """
+        effective_bet = bet_amount * (10 if bonus_mode else 1)
+        target_payout = round(effective_bet * game['multiplier'], 2)
+        
+        script = dict(game['script'])
+        script['spawns'] = [
+            dict(s, payout=target_payout) if s['type'] == 'blackhole' else s
+            for s in script['spawns']
+        ]
+        script['groundObjects'] = [
+            dict(o, payout=target_payout) if o['payout'] else o
+            for o in script['groundObjects']
+        ]
+        # Same milestones as generate_score_progression for this bet, even
+        # when the payout rounds to 0; the y values are kept because
+        # stopAtY is truncated from the real stop_y
+        milestones = script['scoreProgression']
+        num_steps = len(milestones) - 1
+        script['scoreProgression'] = [
+            {'y': m['y'],
+             'score': round(target_payout * self._ease(i / num_steps if num_steps else 1.0), 2)}
+            for i, m in enumerate(milestones)
+        ]
+        script['targetPayout'] = target_payout
+        script['betAmount'] = effective_bet
+        
+        session_id = hashlib.sha256(f"{game['seed']}{time.time()}".encode()).hexdigest()[:16]
+        
+        return dict(game, sessionId=session_id, targetPayout=target_payout,
+                    script=script)
+    
     def _determine_target(self, outcome: Dict, rng) -> Tuple[float, float, str]:
         """Determine target position and stop method"""
         otype = outcome['type']
@@ -1233,9 +2166,10 @@ class GameEngine:
         return SCREEN_CENTER, GROUND_COLLISION_Y, 'ground'
     
     def _generate_death_fallback(self, bet_amount: float,
-                                 bonus_mode: bool) -> Dict:
+                                 bonus_mode: bool, seed: int = None) -> Dict:
         """Generate immediate death (fallback)"""
-        seed = self.generate_seed()
+        if seed is None:
+            seed = self.generate_seed()
         effective_bet = bet_amount * (10 if bonus_mode else 1)
         
         script = {
@@ -1260,7 +2194,8 @@ class GameEngine:
             'multiplier': 0,
             'targetPayout': 0,
             'outcomeType': 'dead',
-            'script': script
+            'script': script,
+            'fallback': True
         }
     
     # ========================================================================
@@ -1284,6 +2219,55 @@ class GameEngine:
 
 _engine = GameEngine()
 
+def configure(render_only_strength: float = None, atlas_path: str = None,
+              atlas_digest: str = None):
+    """
+    Process-wide engine settings; also the initializer for worker pools
+    (initargs=configured()), so pooled and replayed games match games
+    generated inline.
+    
+    With atlas_digest, the atlas at atlas_path must be that build; an
+    atlas rebuilt since the settings were taken raises ValueError
+    instead of silently changing the layouts.
+    """
+    from trajectory_atlas import TrajectoryAtlas
+    
+    atlas = GameEngine.atlas
+    if atlas is None or atlas.path != atlas_path or atlas_digest not in (None, atlas.digest):
+        loaded = TrajectoryAtlas(atlas_path) if atlas_path else None
+        if atlas_digest is not None and (loaded is None or loaded.digest != atlas_digest):
+            if loaded is not None:
+                loaded.close()
+            raise ValueError(f"{atlas_path} is no longer atlas build {atlas_digest}")
+        GameEngine.atlas = loaded
+        if atlas is not None:
+            atlas.close()
+    
+    GameEngine.render_only_strength = render_only_strength
+
+
+def configured() -> Tuple:
+    """Arguments to configure() reproducing this process's settings"""
+    atlas = GameEngine.atlas
+    if atlas is None:
+        return GameEngine.render_only_strength, None, None
+    return GameEngine.render_only_strength, atlas.path, atlas.digest
+
+
 def generate_game(bet_amount: float, bonus_mode: bool = False) -> Dict:
     """Public API"""
-    return _engine.generate_game(bet_amount, bonus_mode)
\ No newline at end of file
+    return _engine.generate_game(bet_amount, bonus_mode)
+
+
+def _run_validated_attempt(bet_amount: float, bonus_mode: bool,
+                           outcome_type: str, attempt: int,
+                           seed: int, settings: Tuple = (None, None, None)) -> Optional[Dict]:
+    """Process-pool entry point for parallel generate_game (settings as configured())"""
+    configure(*settings)
+    engine = GameEngine()
+    profile = engine.profile = GameProfile()
+    result = engine._validated_attempt(bet_amount, bonus_mode,
+                                       outcome_type, attempt, seed)
+    if result is not None:
+        result['profile'] = profile.as_dict()
+    return result
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+DROP THE BOSS - Pre-generated Game Pool
+=======================================
+
+Keeps a bounded queue of finished games per bonus_mode, generated for a
+unit bet by a multiprocessing worker pool. A bet pops a game and
+rescales it to the bet amount, so serving a bet is a queue pop instead
+of a physics run.
+
+Pooled games are generated exactly like inline ones: the tier is rolled
+inside generate_game and re-rolled on every validation retry, so the
+served tier mix (and RTP, retries and death fallbacks included) is the
+inline one. Queues are refilled in the background whenever they drop
+below the low-water mark; an empty queue means an inline game.
+
+Served pooled games carry source='pool': their profile is background
+refill work, not latency of the bet they are served to.
+"""
+
+import time
+import threading
+import multiprocessing
+from collections import Counter, deque
+from typing import Dict
+
+from game_engine import GameEngine, configure, configured
+
+
+# Pooled games are generated for this bet and rescaled when served
+UNIT_BET = 1.0
+
+# Window for the refill-rate metric (seconds)
+RATE_WINDOW = 60.0
+
+
+def _pregenerate(bonus_mode: bool) -> Dict:
+    """Worker entry point: one game at UNIT_BET"""
+    return GameEngine().generate_game(UNIT_BET, bonus_mode)
+
+
+class GamePool:
+    """Queues of pre-generated games with background refill"""
+
+    def __init__(self, workers: int = None, capacity: int = 32,
+                 low_water: int = 8):
+        if not 0 <= low_water <= capacity:
+            raise ValueError("low_water must be between 0 and capacity")
+
+        self.workers = workers or multiprocessing.cpu_count()
+        self.capacity = capacity
+        self.low_water = low_water
+
+        self.queues = {bonus: deque() for bonus in (False, True)}
+        self.in_flight = {key: 0 for key in self.queues}
+
+        self.lock = threading.Lock()
+        self.process_pool = None
+        self.engine = GameEngine()
+
+        # Metrics
+        self.generated = 0
+        self.failed = 0
+        self.served_pooled = 0
+        self.served_inline = 0
+        self.completions = deque()
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    def start(self):
+        """Start the worker pool and fill every queue"""
+        if self.process_pool is None:
+            self.process_pool = multiprocessing.Pool(
+                self.workers, initializer=configure, initargs=configured())
+            for key in self.queues:
+                self._refill(key)
+
+    def close(self):
+        """Stop the worker pool (queued games are kept)"""
+        if self.process_pool is not None:
+            self.process_pool.terminate()
+            self.process_pool.join()
+            self.process_pool = None
+
+    # ========================================================================
+    # SERVING
+    # ========================================================================
+
+    def take(self, bet_amount: float, bonus_mode: bool = False) -> Dict:
+        """Serve a pooled game (inline if the queue is empty) for this bet"""
+        key = bool(bonus_mode)
+
+        with self.lock:
+            queue = self.queues[key]
+            game = queue.popleft() if queue else None
+            if game is None:
+                self.served_inline += 1
+            else:
+                self.served_pooled += 1
+
+        self._refill(key)
+
+        if game is None:
+            return GameEngine().generate_game(bet_amount, bonus_mode)
+
+        return dict(self.engine.rescale_game(game, bet_amount, bonus_mode), source='pool')
+
+    # ========================================================================
+    # REFILL
+    # ========================================================================
+
+    def _refill(self, key):
+        """Top up a queue once it drops below the low-water mark"""
+        if self.process_pool is None:
+            return
+
+        with self.lock:
+            pending = len(self.queues[key]) + self.in_flight[key]
+            if pending >= self.low_water:
+                return
+            needed = self.capacity - pending
+            self.in_flight[key] += needed
+
+        for _ in range(needed):
+            self.process_pool.apply_async(
+                _pregenerate, (key,),
+                callback=lambda game, key=key: self._on_generated(key, game),
+                error_callback=lambda e, key=key: self._on_failed(key, e)
+            )
+
+    def _on_generated(self, key, game: Dict):
+        with self.lock:
+            self.in_flight[key] -= 1
+            self.queues[key].append(game)
+            self.generated += 1
+            self.completions.append(time.time())
+
+    def _on_failed(self, key, error: BaseException):
+        print(f"[POOL] generation failed for {key}: {error}")
+        with self.lock:
+            self.in_flight[key] -= 1
+            self.failed += 1
+
+    # ========================================================================
+    # METRICS
+    # ========================================================================
+
+    def metrics(self) -> Dict:
+        """Pool depth per queue plus refill and serving counters"""
+        with self.lock:
+            cutoff = time.time() - RATE_WINDOW
+            while self.completions and self.completions[0] < cutoff:
+                self.completions.popleft()
+
+            depth = {'bonus' if bonus else 'base': len(queue)
+                     for bonus, queue in self.queues.items()}
+            tiers = Counter(game['outcomeType'] for queue in self.queues.values()
+                            for game in queue)
+
+            return {
+                'depth': depth,
+                'queuedTiers': dict(tiers),
+                'inFlight': sum(self.in_flight.values()),
+                'capacity': self.capacity,
+                'lowWater': self.low_water,
+                'workers': self.workers,
+                'refillRate': len(self.completions) / RATE_WINDOW,
+                'generated': self.generated,
+                'failed': self.failed,
+                'servedPooled': self.served_pooled,
+                'servedInline': self.served_inline,
+            }
@@ -0,0 +1,268 @@
+"""
+DROP THE BOSS - API Load Test
+=============================
+
+Drives the bet lifecycle the browser runs:
+
+    POST /api/bet -> POST /api/resolve (paid outcome)
+                  -> POST /api/cancel  (death, or a tab closed mid-run)
+
+from --concurrency threads over --users wallets. By default requests go
+to app.py in-process through Flask's test client; --url targets a
+running server instead.
+
+Reports bet throughput, latency percentiles and status counts per
+route, and checks balance conservation over every wallet touched:
+
+    sum(start balances) - sum(end balances) == debits - credits
+
+where debits are accepted bets and credits are /resolve payouts, so the
+difference is the house take. A mismatch means the wallet path lost or
+created money under concurrency.
+
+Usage:
+    python loadtest.py --bets 500 --concurrency 8 --users 20 [--bonus-mix 0.2]
+    python loadtest.py --url http://localhost:3000 --bets 200
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import contextlib
+import statistics
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+
+class LocalClient:
+    """Flask test client against the in-process app"""
+
+    def __init__(self):
+        from app import app
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method: str, path: str, body: Dict = None) -> Tuple[int, Dict]:
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.get_json(silent=True) or {}
+
+
+class HttpClient:
+    """urllib client against a running server"""
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, body: Dict = None) -> Tuple[int, Dict]:
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b'{}')
+        except urllib.error.HTTPError as e:
+            try:
+                return e.code, json.loads(e.read() or b'{}')
+            except ValueError:
+                return e.code, {}
+
+
+class LoadTest:
+    def __init__(self, client, users: int, bet_amount: float,
+                 bonus_mix: float, cancel_rate: float, seed: int):
+        self.client = client
+        self.users = [f"load-{seed}-{i}" for i in range(users)]
+        self.bet_amount = bet_amount
+        self.bonus_mix = bonus_mix
+        self.cancel_rate = cancel_rate
+        self.seed = seed
+
+        self.lock = threading.Lock()
+        self.latency: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.debits = 0.0
+        self.credits = 0.0
+        self.bets = 0
+        self.outcomes = Counter()
+
+    def call(self, route: str, method: str, path: str, body: Dict = None):
+        started = time.perf_counter()
+        try:
+            status, data = self.client.request(method, path, body)
+        except Exception as e:
+            status, data = 'exception', {'error': str(e)}
+        ms = (time.perf_counter() - started) * 1000
+        with self.lock:
+            self.latency[route].append(ms)
+            self.statuses[route][status] += 1
+        return status, data
+
+    def balances(self) -> Dict[str, float]:
+        result = {}
+        for user in self.users:
+            status, data = self.call('balance', 'GET', f"/api/balance?userId={user}")
+            if status != 200:
+                raise RuntimeError(f"balance check failed for {user}: {status}")
+            result[user] = data['balance']
+        return result
+
+    def round(self, rng: random.Random):
+        """One bet and its resolve/cancel"""
+        user = rng.choice(self.users)
+        bonus_mode = rng.random() < self.bonus_mix
+        amount = self.bet_amount * (10 if bonus_mode else 1)
+
+        status, game = self.call('bet', 'POST', '/api/bet', {
+            'userId': user, 'betAmount': amount, 'bonusMode': bonus_mode
+        })
+        if status != 200:
+            return
+
+        with self.lock:
+            self.debits += amount
+            self.bets += 1
+            self.outcomes[game['outcomeType']] += 1
+
+        session = {'sessionId': game['sessionId'], 'userId': user}
+        dies = game['script'].get('immediateDeath') or game['script'].get('stopMethod') == 'death'
+
+        if dies or rng.random() < self.cancel_rate:
+            self.call('cancel', 'POST', '/api/cancel', session)
+            return
+
+        status, result = self.call('resolve', 'POST', '/api/resolve', session)
+        if status == 200:
+            with self.lock:
+                self.credits += result['payout']
+
+    def run(self, bets: int, concurrency: int) -> Dict:
+        start_balances = self.balances()
+
+        remaining = [bets]
+
+        def worker(index: int):
+            rng = random.Random(self.seed * 1000 + index)
+            while True:
+                with self.lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                self.round(rng)
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        end_balances = self.balances()
+        return self.report(elapsed, concurrency, start_balances, end_balances)
+
+    def report(self, elapsed: float, concurrency: int,
+               start: Dict[str, float], end: Dict[str, float]) -> Dict:
+        routes = {}
+        for route, samples in self.latency.items():
+            ordered = sorted(samples)
+            total = sum(self.statuses[route].values())
+            errors = sum(n for status, n in self.statuses[route].items()
+                         if status == 'exception' or status >= 500)
+            routes[route] = {
+                'requests': total,
+                'statuses': {str(k): v for k, v in self.statuses[route].items()},
+                'errorRate': errors / total if total else 0.0,
+                'p50': statistics.median(ordered),
+                'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+                'max': ordered[-1],
+            }
+
+        wallet_delta = sum(start.values()) - sum(end.values())
+        house_take = self.debits - self.credits
+
+        return {
+            'bets': self.bets,
+            'concurrency': concurrency,
+            'users': len(self.users),
+            'seconds': elapsed,
+            'betsPerSecond': self.bets / elapsed if elapsed else 0.0,
+            'outcomes': dict(self.outcomes),
+            'routesMs': routes,
+            'conservation': {
+                'debits': round(self.debits, 2),
+                'credits': round(self.credits, 2),
+                'houseTake': round(house_take, 2),
+                'walletDelta': round(wallet_delta, 2),
+                'holds': abs(wallet_delta - house_take) < 0.01,
+            },
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n{report['bets']} bets in {report['seconds']:.1f}s "
+          f"= {report['betsPerSecond']:.1f} bets/s "
+          f"({report['concurrency']} threads, {report['users']} users)")
+    print(f"Outcomes: {report['outcomes']}")
+
+    print(f"\n{'route':10s} {'requests':>9s} {'errors':>7s} "
+          f"{'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}  statuses")
+    for route, r in report['routesMs'].items():
+        print(f"{route:10s} {r['requests']:9d} {r['errorRate']:7.1%} "
+              f"{r['p50']:9.1f} {r['p95']:9.1f} {r['p99']:9.1f} {r['max']:9.1f}  {r['statuses']}")
+
+    c = report['conservation']
+    print(f"\nDebits ₹{c['debits']} - credits ₹{c['credits']} = house take ₹{c['houseTake']}")
+    print(f"Wallet balances fell by ₹{c['walletDelta']}: "
+          f"{'conserved' if c['holds'] else 'MISMATCH'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help='server to hit (default: in-process app)')
+    parser.add_argument('--bets', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--bet', type=float, default=1.0,
+                        help='base bet (bonus bets are 10x)')
+    parser.add_argument('--bonus-mix', type=float, default=0.0,
+                        help='fraction of bets in bonus mode')
+    parser.add_argument('--cancel-rate', type=float, default=0.05,
+                        help='fraction of paid games cancelled (tab closed)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    client = HttpClient(args.url) if args.url else LocalClient()
+    test = LoadTest(client, args.users, args.bet, args.bonus_mix,
+                    args.cancel_rate, args.seed)
+
+    # The engine logs every game; keep the report readable in-process
+    with open(os.devnull, 'w') as devnull:
+        quiet = contextlib.redirect_stdout(devnull) if not args.url else contextlib.nullcontext()
+        with quiet:
+            report = test.run(args.bets, args.concurrency)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if not report['conservation']['holds']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+DROP THE BOSS - Latency Metrics
+===============================
+
+Process-wide histograms of game generation latency, fed with the
+per-game GameProfile attached by GameEngine.generate_game and served
+at /api/metrics.
+
+Profiles are kept per source: 'bet' for games generated while the bet
+waited (inline or in the bet executor), 'pool' for games a GamePool
+generated ahead of time. Only 'bet' games are per-bet latency; they
+are the top-level numbers, the other sources are listed under
+'sources'.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional
+
+
+# Bucket upper bounds in milliseconds (last bucket is open-ended)
+LATENCY_BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100,
+                      250, 500, 1000, 2500, 5000, 10000]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and bucketed percentiles"""
+
+    def __init__(self, bounds: List[float] = None):
+        self.bounds = bounds or LATENCY_BUCKETS_MS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict:
+        labels = [str(b) for b in self.bounds] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'max': self.max,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class GameStats:
+    """Aggregate of the generation profiles of one source"""
+
+    def __init__(self):
+        self.games = 0
+        self.total = Histogram()
+        self.stages: Dict[str, Histogram] = {}
+        self.stage_calls: Dict[str, int] = {}
+        self.counters: Dict[str, float] = {}
+
+    def observe(self, profile: Dict):
+        self.games += 1
+        self.total.observe(profile['totalMs'])
+        for name, entry in profile['stages'].items():
+            self.stages.setdefault(name, Histogram()).observe(entry['ms'])
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + entry['calls']
+            for key, value in entry.items():
+                if key not in ('calls', 'ms'):
+                    self.counters[key] = self.counters.get(key, 0) + value
+
+    def snapshot(self) -> Dict:
+        return {
+            'games': self.games,
+            'generationMs': self.total.snapshot(),
+            'stagesMs': {name: dict(h.snapshot(), calls=self.stage_calls[name])
+                         for name, h in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+
+class GenerationMetrics:
+    """Thread-safe aggregate of generation profiles and request latency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sources: Dict[str, GameStats] = {'bet': GameStats()}
+        self.requests: Dict[str, Histogram] = {}
+
+    def observe_game(self, profile: Optional[Dict], source: str = 'bet'):
+        """Record one game's GameProfile.as_dict() under its source"""
+        if not profile:
+            return
+        with self.lock:
+            self.sources.setdefault(source, GameStats()).observe(profile)
+
+    def observe_request(self, route: str, ms: float):
+        with self.lock:
+            self.requests.setdefault(route, Histogram()).observe(ms)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return dict(
+                self.sources['bet'].snapshot(),
+                sources={source: stats.snapshot()
+                         for source, stats in self.sources.items() if source != 'bet'},
+                requestsMs={route: h.snapshot() for route, h in self.requests.items()},
+            )
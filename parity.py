@@ -0,0 +1,123 @@
+"""
+DROP THE BOSS - Render-only Parity Check
+========================================
+
+Checks the render-only ambient contract (GameEngine.render_only_strength)
+over fixed seeds, generating every game twice: with ambient clouds in the
+physics set (full) and with them split off into script.renderOnly.
+
+For each mode it measures px beyond the pipeline's tolerance at every
+pipeline checkpoint. Render-only mode must not leave the pipeline more
+often than full physics does; exit status 1 if it does.
+
+Usage:
+    python parity.py [--seeds 30] [--strength 0.5]
+"""
+
+import io
+import sys
+import json
+import argparse
+import contextlib
+import statistics
+from typing import Dict, List
+
+from game_engine import GameEngine, OUTCOMES, AMBIENT_RENDER_ONLY_STRENGTH
+
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+# Checkpoints per pipeline segment (fractions of its height)
+CHECKPOINTS = (0.25, 0.5, 0.75)
+
+
+def checkpoint_ys(segments) -> List[float]:
+    return [seg.y_start + (seg.y_end - seg.y_start) * f
+            for seg in segments for f in CHECKPOINTS]
+
+
+def pipeline_excess(engine: GameEngine, game: Dict) -> List[float]:
+    """px beyond pipeline tolerance at each checkpoint the run reached"""
+    segments = game['_segments']
+    ys = checkpoint_ys(segments)
+    points = engine.find_points_at_ys(game['_trajectory'], ys)
+    ideal_xs = engine.get_ideal_xs_at_ys(segments, ys)
+    return [max(0.0, abs(point.x - ideal_x) - engine.get_tolerance_at_y(segments, y))
+            for point, y, ideal_x in zip(points, ys, ideal_xs)
+            if point is not None and point.y >= y - 1]
+
+
+def run(seeds: int, strength: float) -> Dict:
+    full = GameEngine()
+    full.render_only_strength = None  # whatever configure() set
+    inert = GameEngine(render_only_strength=strength)
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for seed in range(1, seeds + 1):
+            tier = TIERS[seed % len(TIERS)]
+            full_game = full._generate_game_attempt(1.0, False, tier, seed)
+            inert_game = inert._generate_game_attempt(1.0, False, tier, seed)
+
+            full_excess = pipeline_excess(full, full_game)
+            inert_excess = pipeline_excess(inert, inert_game)
+            rows.append({
+                'seed': seed,
+                'tier': tier,
+                'renderOnly': len(inert_game['script']['renderOnly']),
+                'physicsClouds': sum(s['type'] == 'cloud'
+                                     for s in inert_game['script']['spawns']),
+                'fullOffPipeline': sum(e > 0 for e in full_excess),
+                'inertOffPipeline': sum(e > 0 for e in inert_excess),
+                'fullMaxExcess': max(full_excess, default=0.0),
+                'inertMaxExcess': max(inert_excess, default=0.0),
+            })
+
+    full_off = sum(r['fullOffPipeline'] for r in rows)
+    inert_off = sum(r['inertOffPipeline'] for r in rows)
+    return {
+        'strength': strength,
+        'games': rows,
+        'fullOffPipeline': full_off,
+        'inertOffPipeline': inert_off,
+        'fullMeanExcess': statistics.mean(r['fullMaxExcess'] for r in rows),
+        'inertMeanExcess': statistics.mean(r['inertMaxExcess'] for r in rows),
+        'pipelineHolds': inert_off <= full_off,
+    }
+
+
+def print_report(report: Dict):
+    print(f"{'seed':>4s} {'tier':8s} {'renderOnly':>10s} {'physics':>8s} "
+          f"{'off pipeline full/inert':>24s}")
+    for r in report['games']:
+        print(f"{r['seed']:4d} {r['tier']:8s} {r['renderOnly']:10d} {r['physicsClouds']:8d} "
+              f"{r['fullOffPipeline']:>11d} / {r['inertOffPipeline']:<10d}")
+
+    print(f"\nPipeline: checkpoints off pipeline {report['fullOffPipeline']} full, "
+          f"{report['inertOffPipeline']} render-only; mean worst excess "
+          f"{report['fullMeanExcess']:.0f}px full, {report['inertMeanExcess']:.0f}px "
+          f"render-only: {'holds' if report['pipelineHolds'] else 'WORSE'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--seeds', type=int, default=30)
+    parser.add_argument('--strength', type=float, default=AMBIENT_RENDER_ONLY_STRENGTH,
+                        help='render-only threshold to check')
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = run(args.seeds, args.strength)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if not report['pipelineHolds']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
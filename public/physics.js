@@ -26,6 +26,8 @@ export function resolveCollisions() {
 
     // ===== CLOUDS =====
     for (const cloud of objects.clouds) {
+        // script.renderOnly clouds are scenery: the server simulated without them
+        if (cloud.renderOnly) continue;
         if (Math.abs(cloud.centerY - py) > C.ACTIVE_WINDOW_BELOW + 100) continue;
 
         const dx = px - cloud.x;
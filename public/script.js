@@ -3,6 +3,7 @@
 // ===============================================================
 
 import { createRNG } from './rng.js';
+import { SCRIPT_MEDIA_TYPE, readBetResponse } from './scriptcodec.js';
 
 // ===============================================================
 // CONSTANTS (MUST MATCH BACKEND EXACTLY)
@@ -980,6 +981,8 @@ function resolveCollisions() {
     
     // Cloud collisions
     for (const cloud of clouds) {
+        // script.renderOnly clouds are scenery: the server simulated without them
+        if (cloud.renderOnly) continue;
         const dx = px - cloud.x;
         const dy = py - cloud.centerY;
         const distSq = dx * dx + dy * dy;
@@ -1283,7 +1286,10 @@ async function placeBet(event) {
         console.log("📡 Placing bet...");
         const res = await fetch('/api/bet', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': `${SCRIPT_MEDIA_TYPE}, application/json;q=0.9`
+            },
             body: JSON.stringify({
                 userId: 'default',
                 betAmount: effectiveBet,
@@ -1298,7 +1304,7 @@ async function placeBet(event) {
             return;
         }
         
-        const data = await res.json();
+        const data = await readBetResponse(res);
         console.log('🎯 Game Generated:', data.outcomeType, '→ ₹' + data.targetPayout);
         
         currentSession = {
@@ -1547,6 +1553,11 @@ function spawnFromScript(script) {
         spawnCollectible(c.x, c.y, c.type);
     }
     
+    // Drawn only: never added to collisions (see resolveCollisions)
+    for (const s of script.renderOnly || []) {
+        spawnCloud(s, true);
+    }
+    
     console.log(`☁️ Spawned: ${clouds.length} clouds, ${darkClouds.length} dark, ${blackHoles.length} BH`);
 }
 
@@ -1554,7 +1565,7 @@ function spawnFromScript(script) {
 // SPAWNERS
 // ===============================================================
 
-function spawnCloud(data) {
+function spawnCloud(data, renderOnly = false) {
     const pick = visualRng() < 0.5 ? 1 : 2;
     const el = document.createElement("div");
     el.className = "cloud";
@@ -1602,6 +1613,7 @@ function spawnCloud(data) {
         el,
         role,
         influence: data.influence || {},
+        renderOnly,
         W, H
     });
 }
@@ -0,0 +1,146 @@
+/**
+ * Compact script decoder - mirror of script_codec.py
+ *
+ * Request with `Accept: SCRIPT_MEDIA_TYPE, application/json` and pass the
+ * response to readBetResponse(); the result has the same shape as the
+ * JSON /api/bet body.
+ */
+export const SCRIPT_MEDIA_TYPE = 'application/vnd.dtb.script';
+
+const MAGIC = [0x44, 0x54, 0x42, 0x01]; // "DTB\x01"
+
+function createReader(bytes, pos) {
+    const reader = {
+        pos,
+        uvarint() {
+            let value = 0;
+            let scale = 1;
+            for (;;) {
+                const byte = bytes[reader.pos++];
+                value += (byte & 0x7F) * scale;
+                if (byte < 0x80) return value;
+                scale *= 128;
+            }
+        },
+        zigzag() {
+            const value = reader.uvarint();
+            return value % 2 === 0 ? value / 2 : -(value + 1) / 2;
+        },
+        column(n, read) {
+            const out = new Array(n);
+            for (let i = 0; i < n; i++) out[i] = read();
+            return out;
+        }
+    };
+    return reader;
+}
+
+function readPositions(reader) {
+    const n = reader.uvarint();
+    const index = reader.column(n, reader.uvarint);
+    const ys = new Array(n);
+    for (let i = 0; i < n; i++) {
+        ys[i] = i === 0 ? reader.zigzag() : ys[i - 1] + reader.uvarint();
+    }
+    const xs = reader.column(n, reader.zigzag);
+    return { n, index, ys, xs };
+}
+
+function readClouds(reader, codec, out) {
+    const clouds = readPositions(reader);
+    const offsets = reader.column(clouds.n, reader.zigzag);
+    const radii = reader.column(clouds.n, reader.uvarint);
+    const roles = reader.column(clouds.n, reader.uvarint);
+    const presets = reader.column(clouds.n, reader.uvarint);
+    for (let k = 0; k < clouds.n; k++) {
+        out[clouds.index[k]] = {
+            type: 'cloud',
+            x: clouds.xs[k],
+            y: clouds.ys[k],
+            centerY: clouds.ys[k] + offsets[k],
+            radius: radii[k],
+            role: codec.roles[roles[k]],
+            influence: { ...codec.presets[presets[k]] }
+        };
+    }
+}
+
+export function decodeBetResponse(buffer) {
+    const bytes = new Uint8Array(buffer);
+    for (let i = 0; i < MAGIC.length; i++) {
+        if (bytes[i] !== MAGIC[i]) throw new Error('Not a compact script payload');
+    }
+
+    const reader = createReader(bytes, MAGIC.length);
+    const headerLen = reader.uvarint();
+    const header = JSON.parse(
+        new TextDecoder().decode(bytes.subarray(reader.pos, reader.pos + headerLen))
+    );
+    reader.pos += headerLen;
+
+    const codec = header.codec;
+    delete header.codec;
+    const spawns = new Array(codec.spawns);
+    const collectibles = new Array(codec.collectibles);
+
+    // Clouds
+    readClouds(reader, codec, spawns);
+
+    // Dark clouds
+    const darks = readPositions(reader);
+    for (let k = 0; k < darks.n; k++) {
+        spawns[darks.index[k]] = { type: 'darkcloud', x: darks.xs[k], y: darks.ys[k] };
+    }
+
+    // Collectibles
+    const items = readPositions(reader);
+    const kinds = reader.column(items.n, reader.uvarint);
+    for (let k = 0; k < items.n; k++) {
+        collectibles[items.index[k]] = {
+            type: codec.kinds[kinds[k]],
+            x: items.xs[k],
+            y: items.ys[k]
+        };
+    }
+
+    // Render-only clouds (drawn, never collided)
+    let renderOnly = null;
+    if (codec.renderOnly !== null) {
+        renderOnly = new Array(codec.renderOnly);
+        readClouds(reader, codec, renderOnly);
+        for (const [i, c] of codec.extraRenderOnly) renderOnly[i] = c;
+    }
+
+    for (const [i, s] of codec.extraSpawns) spawns[i] = s;
+    for (const [i, c] of codec.extraCollectibles) collectibles[i] = c;
+
+    // Score milestones
+    let scoreProgression = codec.scoreProgression;
+    if (scoreProgression === null) {
+        const n = reader.uvarint();
+        const ys = new Array(n);
+        let y = 0;
+        for (let i = 0; i < n; i++) {
+            y += reader.zigzag();
+            ys[i] = y;
+        }
+        scoreProgression = ys.map(my => ({ y: my, score: reader.zigzag() / 100 }));
+    }
+
+    header.script.spawns = spawns;
+    header.script.collectibles = collectibles;
+    header.script.scoreProgression = scoreProgression;
+    if (renderOnly !== null) header.script.renderOnly = renderOnly;
+    return header;
+}
+
+/**
+ * Parse a fetch() response from /api/bet in whichever format the server chose
+ */
+export async function readBetResponse(res) {
+    const type = res.headers.get('Content-Type') || '';
+    if (type.startsWith(SCRIPT_MEDIA_TYPE)) {
+        return decodeBetResponse(await res.arrayBuffer());
+    }
+    return res.json();
+}
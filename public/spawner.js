@@ -3,9 +3,9 @@ import { state, objects } from './state.js';
 import { elements } from './ui.js';
 
 /**
- * Spawn a cloud from script data
+ * Spawn a cloud from script data (renderOnly: drawn, never collided)
  */
-export function spawnCloud(data) {
+export function spawnCloud(data, renderOnly = false) {
     const role = data.role || 'normal';
 
     // ===== VISUAL THINNING (CONTROL CLOUD CULLING) =====
@@ -83,6 +83,7 @@ export function spawnCloud(data) {
         el,
         role,
         influence: data.influence || {},
+        renderOnly,
         W,
         H
     });
@@ -0,0 +1,329 @@
+"""
+DROP THE BOSS - RTP / Volatility Simulator
+==========================================
+
+Offline harness for the Python engine's return-to-player.
+
+Two phases, both spread over every core and aggregated as chunks
+stream in, so memory stays flat no matter how many rounds are run:
+
+- Rolls: millions of roll_outcome draws (vectorized through
+  batch_engine), one fresh mulberry32 seed per round exactly like a
+  bet, giving RTP, hit frequency and volatility with confidence
+  intervals plus a per-tier histogram.
+- Games: a sample of full generate_game runs, which adds the effect of
+  validation retries and of _generate_death_fallback turning a rolled
+  paid outcome into a death.
+
+Usage:
+    python rtp_sim.py --rounds 10000000 --games 2000 [--bonus] [--json]
+"""
+
+import sys
+import io
+import json
+import math
+import time
+import random
+import argparse
+import contextlib
+import multiprocessing
+from typing import Dict, List
+
+import numpy as np
+
+from game_engine import GameEngine, OUTCOMES
+from batch_engine import roll_outcome_batch
+
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+# z for two-sided 95% confidence intervals
+Z_95 = 1.96
+
+
+# ============================================================================
+# STREAMING AGGREGATE
+# ============================================================================
+
+class Tally:
+    """Running sums for a stream of rounds (mergeable across workers)"""
+
+    def __init__(self):
+        self.rounds = 0
+        self.hits = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.tiers = {tier: [0, 0.0] for tier in TIERS}
+
+    def add(self, tier: str, ret: float):
+        """One round returning ret times the debited bet"""
+        self.rounds += 1
+        self.total += ret
+        self.total_sq += ret * ret
+        if ret > 0:
+            self.hits += 1
+        self.tiers[tier][0] += 1
+        self.tiers[tier][1] += ret
+
+    def add_batch(self, tier_codes: np.ndarray, returns: np.ndarray):
+        """Many rounds at once (tier_codes index TIERS)"""
+        self.rounds += len(returns)
+        self.total += float(returns.sum())
+        self.total_sq += float((returns * returns).sum())
+        self.hits += int((returns > 0).sum())
+
+        counts = np.bincount(tier_codes, minlength=len(TIERS))
+        sums = np.bincount(tier_codes, weights=returns, minlength=len(TIERS))
+        for i, tier in enumerate(TIERS):
+            self.tiers[tier][0] += int(counts[i])
+            self.tiers[tier][1] += float(sums[i])
+
+    def merge(self, other: 'Tally'):
+        self.rounds += other.rounds
+        self.hits += other.hits
+        self.total += other.total
+        self.total_sq += other.total_sq
+        for tier, (count, ret) in other.tiers.items():
+            self.tiers[tier][0] += count
+            self.tiers[tier][1] += ret
+
+    def report(self) -> Dict:
+        n = max(self.rounds, 1)
+        mean = self.total / n
+        variance = max(self.total_sq / n - mean * mean, 0.0)
+        std = math.sqrt(variance)
+
+        return {
+            'rounds': self.rounds,
+            'rtp': mean,
+            'rtpCI95': _interval(mean, Z_95 * std / math.sqrt(n)),
+            'hitFrequency': self.hits / n,
+            'hitFrequencyCI95': _proportion_ci(self.hits, n),
+            'volatility': std,
+            'tiers': {
+                tier: {
+                    'count': count,
+                    'frequency': count / n,
+                    'frequencyCI95': _proportion_ci(count, n),
+                    'meanReturn': ret / count if count else 0.0,
+                    'rtpShare': ret / n,
+                }
+                for tier, (count, ret) in self.tiers.items()
+            },
+        }
+
+
+def _interval(center: float, half_width: float) -> List[float]:
+    return [center - half_width, center + half_width]
+
+
+def _proportion_ci(k: int, n: int) -> List[float]:
+    """Wilson score interval"""
+    if n == 0:
+        return [0.0, 0.0]
+    p = k / n
+    denom = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denom
+    half = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denom
+    return [max(0.0, center - half), min(1.0, center + half)]
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+class SeededEngine(GameEngine):
+    """GameEngine drawing its seeds from a reproducible stream"""
+
+    def __init__(self, seed_rng: random.Random):
+        super().__init__()
+        self.seed_rng = seed_rng
+        self.seeds = []
+
+    def generate_seed(self) -> int:
+        seed = self.seed_rng.getrandbits(32)
+        self.seeds.append(seed)
+        return seed
+
+
+def _bet_factor(bonus_mode: bool) -> float:
+    # Bonus mode pays on 10x the bet but only debits the bet itself
+    return 10 if bonus_mode else 1
+
+
+def _roll_chunk(args) -> Tally:
+    """n roll_outcome rounds, one fresh seed each"""
+    chunk_seed, n, bonus_mode = args
+    seeds = np.random.default_rng(chunk_seed).integers(0, 2 ** 32, n,
+                                                       dtype=np.uint64)
+    tier_codes, multipliers = roll_outcome_batch(seeds)
+
+    tally = Tally()
+    tally.add_batch(tier_codes, _bet_factor(bonus_mode) * multipliers)
+    return tally
+
+
+def _game_chunk(args) -> Dict:
+    """n full generate_game rounds"""
+    chunk_seed, n, bonus_mode = args
+    seed_rng = random.Random(chunk_seed)
+    tally = Tally()
+    first_tiers = {tier: 0 for tier in TIERS}
+    fallbacks = {tier: 0 for tier in TIERS}
+    rerolled = 0
+
+    for _ in range(n):
+        engine = SeededEngine(seed_rng)
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = engine.generate_game(1.0, bonus_mode)
+
+        tally.add(game['outcomeType'], game['targetPayout'])
+
+        # What the first attempt rolled, before retries and fallback
+        first_tier = engine.roll_outcome(engine.mulberry32(engine.seeds[0]))['type']
+        first_tiers[first_tier] += 1
+        if game.get('fallback'):
+            fallbacks[first_tier] += 1
+        elif game['outcomeType'] != first_tier:
+            # A rejected attempt was retried with a fresh roll
+            rerolled += 1
+
+    return {'tally': tally, 'firstTiers': first_tiers, 'fallbacks': fallbacks,
+            'rerolled': rerolled}
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def _chunks(total: int, size: int, base_seed: int, bonus_mode: bool):
+    index = 0
+    while total > 0:
+        n = min(size, total)
+        yield (base_seed * 1_000_003 + index, n, bonus_mode)
+        total -= n
+        index += 1
+
+
+def _progress(label: str, done: int, total: int, started: float):
+    elapsed = time.time() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"[{label}] {done}/{total} ({rate:,.0f}/s)", file=sys.stderr)
+
+
+def run_rolls(pool, rounds: int, chunk: int, seed: int,
+              bonus_mode: bool) -> Dict:
+    tally = Tally()
+    started = time.time()
+    for part in pool.imap_unordered(_roll_chunk,
+                                    _chunks(rounds, chunk, seed, bonus_mode)):
+        tally.merge(part)
+        _progress('rolls', tally.rounds, rounds, started)
+    return tally.report()
+
+
+def run_games(pool, games: int, chunk: int, seed: int,
+              bonus_mode: bool) -> Dict:
+    tally = Tally()
+    first_tiers = {tier: 0 for tier in TIERS}
+    fallbacks = {tier: 0 for tier in TIERS}
+    rerolled = 0
+    started = time.time()
+
+    for part in pool.imap_unordered(_game_chunk,
+                                    _chunks(games, chunk, seed + 1, bonus_mode)):
+        tally.merge(part['tally'])
+        for tier in TIERS:
+            first_tiers[tier] += part['firstTiers'][tier]
+            fallbacks[tier] += part['fallbacks'][tier]
+        rerolled += part['rerolled']
+        _progress('games', tally.rounds, games, started)
+
+    report = tally.report()
+    report['rerolledTier'] = rerolled
+    total_fallbacks = sum(fallbacks.values())
+    paid_fallbacks = total_fallbacks - fallbacks['dead']
+    report['fallbacks'] = {
+        'count': total_fallbacks,
+        'rate': total_fallbacks / max(tally.rounds, 1),
+        'rateCI95': _proportion_ci(total_fallbacks, tally.rounds),
+        'paidToDeath': paid_fallbacks,
+        'paidToDeathRate': paid_fallbacks / max(tally.rounds, 1),
+        'byFirstTier': {
+            tier: {
+                'rolled': first_tiers[tier],
+                'fallbacks': fallbacks[tier],
+                'rate': fallbacks[tier] / first_tiers[tier] if first_tiers[tier] else 0.0,
+            }
+            for tier in TIERS
+        },
+    }
+    return report
+
+
+def print_report(name: str, report: Dict):
+    lo, hi = report['rtpCI95']
+    print(f"\n=== {name} ({report['rounds']:,} rounds) ===")
+    print(f"RTP:           {report['rtp']:.4%}  (95% CI {lo:.4%} .. {hi:.4%})")
+    lo, hi = report['hitFrequencyCI95']
+    print(f"Hit frequency: {report['hitFrequency']:.4%}  (95% CI {lo:.4%} .. {hi:.4%})")
+    print(f"Volatility:    {report['volatility']:.4f} (std dev of return)")
+
+    print(f"{'tier':<10}{'count':>14}{'freq':>10}{'95% CI':>22}{'mean x':>10}{'RTP share':>11}")
+    for tier, row in report['tiers'].items():
+        lo, hi = row['frequencyCI95']
+        print(f"{tier:<10}{row['count']:>14,}{row['frequency']:>10.4%}"
+              f"{f'{lo:.4%}..{hi:.4%}':>22}{row['meanReturn']:>10.3f}"
+              f"{row['rtpShare']:>11.4%}")
+
+    fallbacks = report.get('fallbacks')
+    if fallbacks:
+        print(f"Retries that changed the rolled tier: {report['rerolledTier']:,}")
+        print(f"Death fallbacks: {fallbacks['count']:,} ({fallbacks['rate']:.4%}), "
+              f"paid outcomes turned into deaths: {fallbacks['paidToDeath']:,} "
+              f"({fallbacks['paidToDeathRate']:.4%})")
+        for tier, row in fallbacks['byFirstTier'].items():
+            print(f"  {tier:<10} rolled {row['rolled']:>8,}  "
+                  f"fallback {row['fallbacks']:>6,}  ({row['rate']:.2%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=1_000_000,
+                        help='roll_outcome draws')
+    parser.add_argument('--games', type=int, default=0,
+                        help='full generate_game runs')
+    parser.add_argument('--bonus', action='store_true',
+                        help='simulate bonus-mode bets')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--chunk', type=int, default=1_000_000,
+                        help='roll rounds per worker task')
+    parser.add_argument('--game-chunk', type=int, default=20,
+                        help='games per worker task')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = {'bonusMode': args.bonus, 'seed': args.seed}
+    with multiprocessing.Pool(args.workers) as pool:
+        if args.rounds:
+            report['rolls'] = run_rolls(pool, args.rounds, args.chunk,
+                                        args.seed, args.bonus)
+        if args.games:
+            report['games'] = run_games(pool, args.games, args.game_chunk,
+                                        args.seed, args.bonus)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    if 'rolls' in report:
+        print_report('roll_outcome', report['rolls'])
+    if 'games' in report:
+        print_report('generate_game', report['games'])
+
+
+if __name__ == '__main__':
+    main()
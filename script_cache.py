@@ -0,0 +1,120 @@
+"""
+DROP THE BOSS - Replay Script Cache
+===================================
+
+Bounded LRU/TTL cache for /api/script. Holds two kinds of entries in
+one LRU order:
+
+- ('session', session_id) -> the session's replay parameters, recorded
+  at bet time so recent rounds stay replayable after /resolve removed
+  the session from the store.
+- ('script', replay key, media type) -> the serialized response body,
+  so replaying a hot round doesn't rerun the physics.
+
+Entries are evicted least-recently-used first once the total size
+passes max_bytes, and dropped on access once older than ttl.
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+# Rough in-memory size of one session entry (small dict of scalars)
+SESSION_ENTRY_BYTES = 512
+
+
+class ScriptCache:
+    """Thread-safe LRU of serialized scripts, bounded by bytes and age"""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, ttl: float = 3600.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, size, value)
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+        # Metrics (hits/misses per entry kind)
+        self.hits = {'session': 0, 'script': 0}
+        self.misses = {'session': 0, 'script': 0}
+        self.evictions = 0
+        self.expirations = 0
+
+    # ========================================================================
+    # SESSIONS
+    # ========================================================================
+
+    def remember(self, session_id: str, params: Dict):
+        """Keep a session's replay parameters beyond its store lifetime"""
+        self._put(('session', session_id), params, SESSION_ENTRY_BYTES)
+
+    def session(self, session_id: str) -> Optional[Dict]:
+        return self._get(('session', session_id))
+
+    # ========================================================================
+    # SCRIPTS
+    # ========================================================================
+
+    def get(self, key: Hashable, media_type: str) -> Optional[bytes]:
+        return self._get(('script', key, media_type))
+
+    def put(self, key: Hashable, media_type: str, body: bytes):
+        self._put(('script', key, media_type), body, sys.getsizeof(body))
+
+    # ========================================================================
+    # LRU
+    # ========================================================================
+
+    def _get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses[key[0]] += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits[key[0]] += 1
+            return entry[2]
+
+    def _put(self, key, value, size: int):
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (time.time() + self.ttl, size, value)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+
+    def metrics(self) -> Dict:
+        with self.lock:
+            hit_rate = {}
+            for kind, hits in self.hits.items():
+                lookups = hits + self.misses[kind]
+                hit_rate[kind] = hits / lookups if lookups else None
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'maxBytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': dict(self.hits),
+                'misses': dict(self.misses),
+                'hitRate': hit_rate,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -0,0 +1,345 @@
+"""
+DROP THE BOSS - Compact Script Encoding
+=======================================
+
+Binary encoding of a /api/bet response, served when the client sends
+Accept: application/vnd.dtb.script (decoder: public/scriptcodec.js).
+
+Layout:
+    MAGIC | uvarint len | header JSON | cloud | darkcloud | collectible
+          | [renderOnly cloud] | scores
+
+The header JSON is the response without the bulky script lists, plus
+the string tables (roles, influence presets, collectible kinds). Each
+record section is struct-of-arrays, sorted by y:
+
+    count, index[], y (first zigzag, then uvarint deltas), x[] (zigzag),
+    then the section columns:
+      cloud        centerY - y (zigzag), radius, role code, preset code
+      darkcloud    -
+      collectible  kind code
+
+The renderOnly section (cloud columns) is only present when the script
+has a renderOnly list. index[] is each record's position in its
+original list, so the decoder rebuilds every list in its original order (the client's
+visual RNG is consumed per spawn). Records that don't fit a section
+(black hole, anything with extra keys or non-int coordinates) travel in
+the header as [index, record] pairs. Score milestones are y deltas plus
+score in cents when every score is a whole number of cents.
+
+Decoding is exact: decode_bet_response(encode_bet_response(r)) == r.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+MEDIA_TYPE = 'application/vnd.dtb.script'
+MAGIC = b'DTB\x01'
+
+CLOUD_KEYS = {'type', 'x', 'y', 'centerY', 'radius', 'role', 'influence'}
+POINT_KEYS = {'type', 'x', 'y'}
+
+
+# ============================================================================
+# VARINTS
+# ============================================================================
+
+def _put_uvarint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _put_zigzag(out: bytearray, value: int):
+    _put_uvarint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+def _put_uvarints(out: bytearray, values):
+    """A column of uvarints; most values fit one byte"""
+    for value in values:
+        if value < 0x80:
+            out.append(value)
+        else:
+            _put_uvarint(out, value)
+
+
+def _put_zigzags(out: bytearray, values):
+    _put_uvarints(out, [v * 2 if v >= 0 else -v * 2 - 1 for v in values])
+
+
+class _Reader:
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def uvarint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def zigzag(self) -> int:
+        value = self.uvarint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class _Table:
+    """First-seen list of values (strings or flat dicts)"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value) -> int:
+        key = tuple(sorted(value.items())) if isinstance(value, dict) else value
+        if key not in self.codes:
+            self.codes[key] = len(self.values)
+            self.values.append(value)
+        return self.codes[key]
+
+
+# ============================================================================
+# ENCODE
+# ============================================================================
+
+def _fits_cloud(s: Dict) -> bool:
+    return (s.get('type') == 'cloud' and s.keys() == CLOUD_KEYS
+            and type(s['x']) is int and type(s['y']) is int
+            and type(s['centerY']) is int and type(s['radius']) is int
+            and s['radius'] >= 0 and isinstance(s['role'], str)
+            and isinstance(s['influence'], dict)
+            and all(type(v) in (int, float) for v in s['influence'].values()))
+
+
+def _fits_point(s: Dict, kind: str = None) -> bool:
+    return ((kind is None or s.get('type') == kind) and s.keys() == POINT_KEYS
+            and isinstance(s['type'], str) and type(s['x']) is int and type(s['y']) is int)
+
+
+def _put_positions(out: bytearray, records: List[Tuple[int, Dict]]):
+    """count, index[], y[], x[] for records sorted by y"""
+    _put_uvarint(out, len(records))
+    _put_uvarints(out, [index for index, _ in records])
+    ys = [r['y'] for _, r in records]
+    if ys:
+        _put_zigzag(out, ys[0])
+        _put_uvarints(out, [b - a for a, b in zip(ys, ys[1:])])
+    _put_zigzags(out, [r['x'] for _, r in records])
+
+
+def _by_y(records: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+    return sorted(records, key=lambda item: item[1]['y'])
+
+
+def _put_clouds(out: bytearray, records: List[Tuple[int, Dict]],
+                roles: '_Table', presets: '_Table'):
+    records = _by_y(records)
+    _put_positions(out, records)
+    _put_zigzags(out, [c['centerY'] - c['y'] for _, c in records])
+    _put_uvarints(out, [c['radius'] for _, c in records])
+    _put_uvarints(out, [roles.code(c['role']) for _, c in records])
+    _put_uvarints(out, [presets.code(c['influence']) for _, c in records])
+
+
+def _split_clouds(records: List[Dict]) -> Tuple[List[Tuple[int, Dict]], List[list]]:
+    """(index, cloud) pairs for the cloud section, [index, record] extras"""
+    fits, extras = [], []
+    for i, r in enumerate(records):
+        if _fits_cloud(r):
+            fits.append((i, r))
+        else:
+            extras.append([i, r])
+    return fits, extras
+
+
+def _has_cents(milestones: List[Dict]) -> bool:
+    return all(m.keys() == {'y', 'score'} and type(m['y']) is int
+               and isinstance(m['score'], (int, float))
+               and round(m['score'] * 100) / 100 == m['score']
+               for m in milestones)
+
+
+def encode_bet_response(response: Dict) -> bytes:
+    """Encode a /api/bet JSON payload (with its 'script')"""
+    header, body, cents = encode_bet_sections(response)
+    return frame_bet_response(header, body, encode_score_cents(cents or []))
+
+
+def encode_bet_sections(response: Dict) -> Tuple[bytes, bytearray, Optional[List[int]]]:
+    """
+    encode_bet_response before framing: the header JSON, the sections up
+    to the score cents, and the cents (None when the milestones travel in
+    the header). script_store fills the header and cents in per bet.
+    """
+    script = response['script']
+    spawns = script['spawns']
+    collectibles = script['collectibles']
+    milestones = script['scoreProgression']
+    render_only = script.get('renderOnly')
+
+    roles, presets, kinds = _Table(), _Table(), _Table()
+
+    clouds, darks, extra_spawns = [], [], []
+    for i, s in enumerate(spawns):
+        if _fits_cloud(s):
+            clouds.append((i, s))
+        elif _fits_point(s, 'darkcloud'):
+            darks.append((i, s))
+        else:
+            extra_spawns.append([i, s])
+
+    items, extra_collectibles = [], []
+    for i, c in enumerate(collectibles):
+        if _fits_point(c):
+            items.append((i, c))
+        else:
+            extra_collectibles.append([i, c])
+
+    scores_as_cents = _has_cents(milestones)
+
+    body = bytearray()
+
+    _put_clouds(body, clouds, roles, presets)
+
+    _put_positions(body, _by_y(darks))
+
+    items = _by_y(items)
+    _put_positions(body, items)
+    _put_uvarints(body, [kinds.code(c['type']) for _, c in items])
+
+    extra_render_only = []
+    if render_only is not None:
+        decor, extra_render_only = _split_clouds(render_only)
+        _put_clouds(body, decor, roles, presets)
+
+    cents = None
+    if scores_as_cents:
+        ys = [m['y'] for m in milestones]
+        _put_uvarint(body, len(milestones))
+        _put_zigzags(body, [b - a for a, b in zip([0] + ys, ys)])
+        cents = [round(m['score'] * 100) for m in milestones]
+
+    header = dict(response)
+    header['script'] = {k: v for k, v in script.items()
+                        if k not in ('spawns', 'collectibles', 'scoreProgression',
+                                     'renderOnly')}
+    header['codec'] = {
+        'spawns': len(spawns),
+        'collectibles': len(collectibles),
+        'roles': roles.values,
+        'presets': presets.values,
+        'kinds': kinds.values,
+        'extraSpawns': extra_spawns,
+        'extraCollectibles': extra_collectibles,
+        'renderOnly': None if render_only is None else len(render_only),
+        'extraRenderOnly': extra_render_only,
+        'scoreProgression': None if scores_as_cents else milestones,
+    }
+
+    return json.dumps(header, separators=(',', ':')).encode(), body, cents
+
+
+def encode_score_cents(cents: List[int]) -> bytes:
+    out = bytearray()
+    _put_zigzags(out, cents)
+    return bytes(out)
+
+
+def frame_bet_response(header: bytes, *sections) -> bytes:
+    """MAGIC, header length, header JSON, then the sections as they are"""
+    prefix = bytearray(MAGIC)
+    _put_uvarint(prefix, len(header))
+    return b''.join((prefix, header) + sections)
+
+
+# ============================================================================
+# DECODE
+# ============================================================================
+
+def _get_positions(reader: _Reader) -> Tuple[List[int], List[int], List[int]]:
+    n = reader.uvarint()
+    index = [reader.uvarint() for _ in range(n)]
+    ys = []
+    for i in range(n):
+        ys.append(reader.zigzag() if i == 0 else ys[-1] + reader.uvarint())
+    xs = [reader.zigzag() for _ in range(n)]
+    return index, ys, xs
+
+
+def _get_clouds(reader: _Reader, codec: Dict, out: List):
+    index, ys, xs = _get_positions(reader)
+    offsets = [reader.zigzag() for _ in index]
+    radii = [reader.uvarint() for _ in index]
+    roles = [reader.uvarint() for _ in index]
+    presets = [reader.uvarint() for _ in index]
+    for k, i in enumerate(index):
+        out[i] = {
+            'type': 'cloud',
+            'x': xs[k],
+            'y': ys[k],
+            'centerY': ys[k] + offsets[k],
+            'radius': radii[k],
+            'role': codec['roles'][roles[k]],
+            'influence': dict(codec['presets'][presets[k]]),
+        }
+
+
+def decode_bet_response(data: bytes) -> Dict:
+    """Inverse of encode_bet_response (reference for scriptcodec.js)"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a compact script payload")
+
+    reader = _Reader(data, len(MAGIC))
+    header_len = reader.uvarint()
+    header = json.loads(data[reader.pos:reader.pos + header_len])
+    reader.pos += header_len
+
+    codec = header.pop('codec')
+    spawns = [None] * codec['spawns']
+    collectibles = [None] * codec['collectibles']
+
+    _get_clouds(reader, codec, spawns)
+
+    index, ys, xs = _get_positions(reader)
+    for k, i in enumerate(index):
+        spawns[i] = {'type': 'darkcloud', 'x': xs[k], 'y': ys[k]}
+
+    index, ys, xs = _get_positions(reader)
+    kinds = [reader.uvarint() for _ in index]
+    for k, i in enumerate(index):
+        collectibles[i] = {'type': codec['kinds'][kinds[k]], 'x': xs[k], 'y': ys[k]}
+
+    render_only = None
+    if codec['renderOnly'] is not None:
+        render_only = [None] * codec['renderOnly']
+        _get_clouds(reader, codec, render_only)
+
+    for i, s in codec['extraSpawns']:
+        spawns[i] = s
+    for i, c in codec['extraCollectibles']:
+        collectibles[i] = c
+    for i, c in codec['extraRenderOnly']:
+        render_only[i] = c
+
+    milestones = codec['scoreProgression']
+    if milestones is None:
+        n = reader.uvarint()
+        milestone_ys, y = [], 0
+        for _ in range(n):
+            y += reader.zigzag()
+            milestone_ys.append(y)
+        milestones = [{'y': y, 'score': reader.zigzag() / 100} for y in milestone_ys]
+
+    script = header['script']
+    script['spawns'] = spawns
+    script['collectibles'] = collectibles
+    script['scoreProgression'] = milestones
+    if render_only is not None:
+        script['renderOnly'] = render_only
+    return header
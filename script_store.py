@@ -0,0 +1,438 @@
+"""
+DROP THE BOSS - Precomputed Script Store
+========================================
+
+Bulk-generated unit-bet games per outcome tier in one memory-mapped file,
+so /api/bet can serve a validated script without running physics. A bet
+gets its response by filling the bet-dependent values (session id, bet,
+payout, balance, score milestones, as rescale_game recomputes them) into
+a stored payload. Every worker maps the same file, so the scripts live
+once in the page cache.
+
+take() replays generate_game's retry chain: each attempt rolls a tier
+and draws a stored game of it, and the attempt passes if that game's
+first attempt was accepted when it was built. After max_retries misses
+the bet gets the stored death fallback. So tiers are re-rolled on
+validation failures at the rate they fail, as in inline generation.
+
+File layout (little-endian):
+
+    header   MAGIC, version, index offset, entries, meta offset, meta length
+    records  appended as generated, one per game:
+               JSON template | compact header template
+               | compact body | score fractions
+    index    fixed-width entries grouped by tier, then the fallback's:
+             record offset, seed, multiplier, stopAtY, outcome code,
+             flags (fallback, first attempt accepted)
+    meta     JSON: tier -> [first entry, count], fallback entry,
+             engine settings
+
+A template is the payload text with its bet-dependent values cut out:
+a slot table (text offset, kind, score fraction) and the remaining text.
+Serving joins memoryview slices of the map with the slot values, so the
+stored bytes are copied once, into the response body. The compact body
+is script_codec's section stream up to the score cents, which are
+computed per bet from the fractions.
+
+Replays (/script) regenerate from the stored seed, so a store only
+serves under the engine settings it was built with (configured()).
+
+Usage:
+    python script_store.py build --out scripts.bin --per-tier 1000 [--workers N]
+    python script_store.py check --path scripts.bin [--samples 50]
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import struct
+import random
+import hashlib
+import argparse
+import threading
+import contextlib
+import multiprocessing
+from typing import Dict, List, Tuple
+
+from game_engine import GameEngine, OUTCOMES, configure, configured
+from script_codec import (MEDIA_TYPE as SCRIPT_MEDIA_TYPE, encode_bet_sections,
+                          encode_score_cents, frame_bet_response, decode_bet_response)
+
+
+MAGIC = b'DTBS'
+VERSION = 2
+
+HEADER = struct.Struct('<4sHQIQI')
+ENTRY = struct.Struct('<QIdiBB')
+TEMPLATE = struct.Struct('<HI')
+SLOT = struct.Struct('<IBd')
+LENGTH = struct.Struct('<I')
+FRACTION = struct.Struct('<d')
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+# Stored games are generated for this bet (see GamePool)
+UNIT_BET = 1.0
+
+# Slot kinds
+SESSION, PAYOUT, BET, BALANCE, SCORE = range(5)
+
+# Entry flags
+FALLBACK, FIRST_ATTEMPT = 1, 2
+
+# Attempts per bet, as generate_game's max_retries
+MAX_RETRIES = 5
+
+SENTINEL = re.compile(rb'"@@(\d+)@@"')
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+class _Slots:
+    """Sentinel strings standing in for bet-dependent values"""
+
+    def __init__(self):
+        self.slots: List[Tuple[int, float]] = []
+
+    def __call__(self, kind: int, value: float = 0.0) -> str:
+        self.slots.append((kind, value))
+        return f"@@{len(self.slots) - 1}@@"
+
+    def template(self, text: bytes) -> bytes:
+        """TEMPLATE, slot table and the text with the sentinels cut out"""
+        table, kept, pos = bytearray(), bytearray(), 0
+        for match in SENTINEL.finditer(text):
+            kept += text[pos:match.start()]
+            kind, value = self.slots[int(match.group(1))]
+            table += SLOT.pack(len(kept), kind, value)
+            pos = match.end()
+        kept += text[pos:]
+        return TEMPLATE.pack(len(table) // SLOT.size, len(kept)) + table + kept
+
+
+def _payload(game: Dict, slots: _Slots, fractions: List[float],
+             score_slots: bool) -> Dict:
+    """The /api/bet payload of a unit game with sentinels for every value
+    rescale_game recomputes (scores too if score_slots)"""
+    payout = slots(PAYOUT)
+    script = dict(game['script'])
+    script['spawns'] = [dict(s, payout=payout) if s['type'] == 'blackhole' else s
+                        for s in script['spawns']]
+    script['groundObjects'] = [dict(o, payout=payout) if o['payout'] else o
+                               for o in script['groundObjects']]
+    if score_slots:
+        script['scoreProgression'] = [{'y': m['y'], 'score': slots(SCORE, f)}
+                                      for m, f in zip(script['scoreProgression'], fractions)]
+    script['targetPayout'] = payout
+    script['betAmount'] = slots(BET)
+
+    return {
+        'sessionId': slots(SESSION),
+        'seed': game['seed'],
+        'targetPayout': payout,
+        'multiplier': game['multiplier'],
+        'outcomeType': game['outcomeType'],
+        'script': script,
+        'balance': slots(BALANCE),
+    }
+
+
+def encode_record(engine: GameEngine, game: Dict) -> bytes:
+    """One record (see module docstring) for a unit-bet game"""
+    milestones = game['script']['scoreProgression']
+    num_steps = len(milestones) - 1
+    fractions = [engine._ease(i / num_steps if num_steps else 1.0)
+                 for i in range(len(milestones))]
+
+    slots = _Slots()
+    text = json.dumps(_payload(game, slots, fractions, True), separators=(',', ':'))
+    record = slots.template(text.encode())
+
+    slots = _Slots()
+    header, body, cents = encode_bet_sections(_payload(game, slots, fractions, False))
+    if cents is None:
+        raise ValueError(f"seed {game['seed']}: score milestones are not whole cents")
+    record += slots.template(header)
+    record += LENGTH.pack(len(body)) + body
+
+    record += LENGTH.pack(len(fractions)) + b''.join(FRACTION.pack(f) for f in fractions)
+    return record
+
+
+def _build_one(job: Tuple[str, int]) -> Tuple[int, bytes, Tuple]:
+    """Worker entry point: a unit game of the tier, as (tier, record, entry fields)"""
+    tier, seed = job
+    engine = GameEngine()
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = engine.generate_game_from_seed(seed, UNIT_BET, outcome_type=tier)
+    fallback = game.get('fallback', False)
+    # Retries run under retry_seeds(seed), so the seed tells the attempt
+    flags = FALLBACK if fallback else FIRST_ATTEMPT if game['seed'] == seed else 0
+    fields = (game['seed'], game['multiplier'], game['script']['stopAtY'],
+              TIERS.index(game['outcomeType']), flags)
+    return TIERS.index(tier), encode_record(engine, game), fields
+
+
+def build(path: str, per_tier: int, workers: int = None, seed: int = 1):
+    """Generate per_tier games of every tier into a new store at path"""
+    rng = random.Random(seed)
+    jobs = [(tier, rng.getrandbits(32)) for tier in TIERS for _ in range(per_tier)]
+    rng.shuffle(jobs)
+
+    started = time.perf_counter()
+    entries: List[Tuple[int, Tuple]] = []
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f, multiprocessing.Pool(
+            workers or multiprocessing.cpu_count(),
+            initializer=configure, initargs=configured()) as pool:
+        f.write(b'\0' * HEADER.size)
+        for n, (tier, record, fields) in enumerate(
+                pool.imap_unordered(_build_one, jobs, chunksize=8), 1):
+            entries.append((tier, (f.tell(),) + fields))
+            f.write(record)
+            if n % 1000 == 0:
+                print(f"  {n}/{len(jobs)} games, {time.perf_counter() - started:.0f}s")
+
+        entries.sort(key=lambda entry: entry[0])
+
+        engine = GameEngine()
+        fallback = engine._generate_death_fallback(UNIT_BET, False, rng.getrandbits(32))
+        entries.append((len(TIERS), (f.tell(), fallback['seed'], 0, 0,
+                                     TIERS.index('dead'), FALLBACK)))
+        f.write(encode_record(engine, fallback))
+
+        index_at = f.tell()
+        tiers = {}
+        for i, (tier, fields) in enumerate(entries[:-1]):
+            first, count = tiers.get(TIERS[tier], (i, 0))
+            tiers[TIERS[tier]] = (first, count + 1)
+        for _, fields in entries:
+            f.write(ENTRY.pack(*fields))
+
+        meta_at = f.tell()
+        meta = json.dumps({'tiers': tiers, 'fallback': len(entries) - 1,
+                           'settings': configured(),
+                           'unitBet': UNIT_BET}).encode()
+        f.write(meta)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, index_at, len(entries), meta_at, len(meta)))
+    os.replace(tmp, path)
+
+    store = ScriptStore(path)
+    print(f"{path}: {store.metrics()} in {time.perf_counter() - started:.1f}s")
+    store.close()
+
+
+# ============================================================================
+# SERVE
+# ============================================================================
+
+class ScriptStore:
+    """Memory-mapped store file (see module docstring)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.data)
+
+        magic, version, self.index_at, self.entries, meta_at, meta_len = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} script store")
+
+        meta = json.loads(self.data[meta_at:meta_at + meta_len])
+        self.tiers = {tier: tuple(span) for tier, span in meta['tiers'].items()}
+        missing = [tier for tier in TIERS if not self.tiers.get(tier, (0, 0))[1]]
+        if missing:
+            raise ValueError(f"{path}: no games for {', '.join(missing)}")
+        self.fallback = meta['fallback']
+        self.settings = tuple(meta['settings'])
+
+        self.lock = threading.Lock()
+        self.engine = GameEngine()
+        self.served = 0
+
+    def close(self):
+        self.view.release()
+        self.data.close()
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def _entry(self, k: int) -> Tuple:
+        return ENTRY.unpack_from(self.data, self.index_at + k * ENTRY.size)
+
+    def take(self, bet_amount: float, bonus_mode: bool = False) -> Dict:
+        """
+        Pick a stored game for this bet through the retry chain (see the
+        module docstring). The result has the session fields of a
+        generated game; render() builds the response body.
+        """
+        rng = self.engine.mulberry32(self.engine.generate_seed())
+        for _ in range(MAX_RETRIES):
+            first, count = self.tiers[self.engine.roll_outcome(rng)['type']]
+            k = first + int(rng() * count)
+            if self._entry(k)[-1] & FIRST_ATTEMPT:
+                return self.entry(k, bet_amount, bonus_mode)
+        return self.entry(self.fallback, bet_amount, bonus_mode)
+
+    def entry(self, k: int, bet_amount: float, bonus_mode: bool = False) -> Dict:
+        offset, seed, multiplier, stop_at_y, outcome, flags = self._entry(k)
+        with self.lock:
+            self.served += 1
+
+        effective_bet = bet_amount * (10 if bonus_mode else 1)
+        return {
+            'sessionId': hashlib.sha256(f"{seed}{time.time()}".encode()).hexdigest()[:16],
+            'seed': seed,
+            'multiplier': multiplier,
+            'targetPayout': round(effective_bet * multiplier, 2),
+            'outcomeType': TIERS[outcome],
+            'fallback': bool(flags & FALLBACK),
+            'stopAtY': stop_at_y,
+            'betAmount': effective_bet,
+            '_record': offset,
+        }
+
+    def _template(self, at: int, values: Dict[int, bytes], payout: float) -> Tuple[List, int]:
+        """Slices and slot values of the template at `at`, and where it ends"""
+        n, length = TEMPLATE.unpack_from(self.data, at)
+        text_at = at + TEMPLATE.size + n * SLOT.size
+        parts, pos = [], text_at
+        for offset, kind, value in SLOT.iter_unpack(self.view[at + TEMPLATE.size:text_at]):
+            parts.append(self.view[pos:text_at + offset])
+            parts.append(values[kind] if kind != SCORE
+                         else json.dumps(round(payout * value, 2)).encode())
+            pos = text_at + offset
+        parts.append(self.view[pos:text_at + length])
+        return parts, text_at + length
+
+    def render(self, game: Dict, balance: float, media_type: str) -> bytes:
+        """/api/bet response body for a take()n game, JSON or compact"""
+        payout = game['targetPayout']
+        values = {
+            SESSION: json.dumps(game['sessionId']).encode(),
+            PAYOUT: json.dumps(payout).encode(),
+            BET: json.dumps(game['betAmount']).encode(),
+            BALANCE: json.dumps(balance).encode(),
+        }
+
+        parts, at = self._template(game['_record'], values, payout)
+        if media_type != SCRIPT_MEDIA_TYPE:
+            return b''.join(parts)
+
+        parts, at = self._template(at, values, payout)
+        (body_len,) = LENGTH.unpack_from(self.data, at)
+        body = self.view[at + LENGTH.size:at + LENGTH.size + body_len]
+        at += LENGTH.size + body_len
+        (n,) = LENGTH.unpack_from(self.data, at)
+        fractions = self.view[at + LENGTH.size:at + LENGTH.size + n * FRACTION.size]
+        cents = [round(round(payout * f, 2) * 100) for (f,) in FRACTION.iter_unpack(fractions)]
+        return frame_bet_response(b''.join(parts), body, encode_score_cents(cents))
+
+    def metrics(self) -> Dict:
+        return {
+            'path': self.path,
+            'games': self.entries,
+            'tiers': {tier: count for tier, (_, count) in self.tiers.items()},
+            'bytes': len(self.data),
+            'served': self.served,
+        }
+
+
+# ============================================================================
+# CHECK
+# ============================================================================
+
+def check(path: str, samples: int, seed: int = 1) -> Dict:
+    """
+    Render sampled entries at random bets and compare them (both formats)
+    with the game /script would replay for that session.
+    """
+    store = ScriptStore(path)
+    configure(*store.settings)
+    engine = GameEngine()
+    rng = random.Random(seed)
+
+    mismatches = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(samples):
+            k = rng.randrange(len(store))
+            bet_amount = rng.choice([1.0, 2.5, 10.0, 37.0, 100.0])
+            bonus_mode = rng.random() < 0.2
+            balance = round(rng.uniform(0, 5000), 2)
+            game = store.entry(k, bet_amount, bonus_mode)
+
+            if game['fallback']:
+                replay = engine._generate_death_fallback(bet_amount, bonus_mode, game['seed'])
+            else:
+                replay = engine.generate_game_from_seed(game['seed'], bet_amount, bonus_mode,
+                                                        game['outcomeType'])
+            expected = {
+                'sessionId': game['sessionId'],
+                'seed': replay['seed'],
+                'targetPayout': replay['targetPayout'],
+                'multiplier': replay['multiplier'],
+                'outcomeType': replay['outcomeType'],
+                'script': replay['script'],
+                'balance': balance,
+            }
+            expected = json.loads(json.dumps(expected))
+            served = json.loads(store.render(game, balance, 'application/json'))
+            compact = decode_bet_response(store.render(game, balance, SCRIPT_MEDIA_TYPE))
+            if served != expected or json.loads(json.dumps(compact)) != expected:
+                mismatches.append({'entry': k, 'seed': game['seed'], 'bet': bet_amount,
+                                   'bonusMode': bonus_mode})
+
+    report = {'path': path, 'samples': samples, 'mismatches': mismatches,
+              'holds': not mismatches}
+    store.close()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_parser = sub.add_parser('build', help='generate a store file')
+    build_parser.add_argument('--out', default='scripts.bin')
+    build_parser.add_argument('--per-tier', type=int, default=1000,
+                              help='games generated per outcome tier')
+    build_parser.add_argument('--workers', type=int, default=None)
+    build_parser.add_argument('--seed', type=int, default=1)
+    build_parser.add_argument('--render-only-strength', type=float, default=None,
+                              help='engine setting to build (and serve) with')
+    build_parser.add_argument('--atlas', default=None,
+                              help='trajectory atlas to build (and serve) with')
+    check_parser = sub.add_parser('check', help='compare served scripts with replays')
+    check_parser.add_argument('--path', default='scripts.bin')
+    check_parser.add_argument('--samples', type=int, default=50)
+    check_parser.add_argument('--json', action='store_true',
+                              help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        configure(args.render_only_strength, args.atlas)
+        build(args.out, args.per_tier, args.workers, args.seed)
+        return
+
+    report = check(args.path, args.samples)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['samples']} sampled scripts: "
+              f"{len(report['mismatches'])} differ from their replay")
+        for m in report['mismatches']:
+            print(f"  {m}")
+    if not report['holds']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""
+DROP THE BOSS - Wallet & Session Stores
+=======================================
+
+Atomic wallet and session storage for the API.
+
+- MemoryStore: in-process, sharded dicts behind striped locks. Safe
+  under a multi-threaded server, but each process has its own balances.
+- SQLiteStore: one SQLite file in WAL mode, shared by every worker
+  process on the box. Debits are a single conditional UPDATE, so two
+  workers can never spend the same balance twice.
+
+Sessions expire SESSION_TTL seconds after the bet. A SessionSweeper pops
+expired sessions and settles the unresolved bet per EXPIRY_POLICIES.
+"""
+
+import json
+import time
+import heapq
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+DEFAULT_BALANCE = 1000.0
+
+# Seconds an unresolved session lives before the sweeper expires it
+SESSION_TTL = 600.0
+
+# What happens to the stake of an expired, unresolved bet:
+#   forfeit - nothing is paid (same as /cancel)
+#   refund  - the bet amount is returned
+#   settle  - the predetermined payout is paid (as if /resolve was called)
+EXPIRY_POLICIES = ('forfeit', 'refund', 'settle')
+
+
+class InsufficientBalance(Exception):
+    """Debit larger than the wallet balance"""
+
+
+class Store(ABC):
+    """Wallet + session store interface"""
+
+    # ========================================================================
+    # WALLETS
+    # ========================================================================
+
+    @abstractmethod
+    def balance(self, user_id: str) -> float:
+        ...
+
+    @abstractmethod
+    def debit(self, user_id: str, amount: float) -> float:
+        """Atomically take amount; returns the new balance"""
+
+    @abstractmethod
+    def credit(self, user_id: str, amount: float) -> float:
+        """Atomically add amount; returns the new balance"""
+
+    # ========================================================================
+    # SESSIONS
+    # ========================================================================
+
+    @abstractmethod
+    def open_session(self, session_id: str, session: Dict):
+        """Store a session; it expires session_ttl seconds from now"""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def claim_session(self, session_id: str) -> Optional[Dict]:
+        """Atomically remove and return a session (None if already gone)"""
+
+    @abstractmethod
+    def pop_expired(self, now: float = None) -> List[Dict]:
+        """Atomically remove and return every session past its expiry"""
+
+    @abstractmethod
+    def session_count(self) -> int:
+        ...
+
+
+class MemoryStore(Store):
+    """In-process store with per-key lock striping"""
+
+    def __init__(self, stripes: int = 64, session_ttl: float = SESSION_TTL):
+        self.stripes = stripes
+        self.session_ttl = session_ttl
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.wallets = [{} for _ in range(stripes)]
+        self.sessions = [{} for _ in range(stripes)]
+
+        # (expiresAt, session_id), oldest first. Entries for sessions
+        # claimed early are left in place and skipped when they fall due.
+        self.expiry_heap = []
+        self.expiry_lock = threading.Lock()
+
+    def _stripe(self, key: str) -> int:
+        return hash(key) % self.stripes
+
+    def balance(self, user_id: str) -> float:
+        i = self._stripe(user_id)
+        with self.locks[i]:
+            return self.wallets[i].setdefault(user_id, DEFAULT_BALANCE)
+
+    def debit(self, user_id: str, amount: float) -> float:
+        i = self._stripe(user_id)
+        with self.locks[i]:
+            balance = self.wallets[i].setdefault(user_id, DEFAULT_BALANCE)
+            if amount > balance:
+                raise InsufficientBalance(user_id)
+            balance -= amount
+            self.wallets[i][user_id] = balance
+            return balance
+
+    def credit(self, user_id: str, amount: float) -> float:
+        i = self._stripe(user_id)
+        with self.locks[i]:
+            balance = self.wallets[i].setdefault(user_id, DEFAULT_BALANCE) + amount
+            self.wallets[i][user_id] = balance
+            return balance
+
+    def open_session(self, session_id: str, session: Dict):
+        expires_at = time.time() + self.session_ttl
+        session = dict(session, expiresAt=expires_at)
+
+        i = self._stripe(session_id)
+        with self.locks[i]:
+            self.sessions[i][session_id] = session
+        with self.expiry_lock:
+            heapq.heappush(self.expiry_heap, (expires_at, session_id))
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        i = self._stripe(session_id)
+        with self.locks[i]:
+            return self.sessions[i].get(session_id)
+
+    def claim_session(self, session_id: str) -> Optional[Dict]:
+        i = self._stripe(session_id)
+        with self.locks[i]:
+            return self.sessions[i].pop(session_id, None)
+
+    def pop_expired(self, now: float = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        expired = []
+
+        while True:
+            with self.expiry_lock:
+                if not self.expiry_heap or self.expiry_heap[0][0] > now:
+                    break
+                expires_at, session_id = heapq.heappop(self.expiry_heap)
+
+            i = self._stripe(session_id)
+            with self.locks[i]:
+                session = self.sessions[i].get(session_id)
+                # Already claimed, or reopened with a later expiry
+                if session is None or session['expiresAt'] != expires_at:
+                    continue
+                del self.sessions[i][session_id]
+            expired.append(session)
+
+        return expired
+
+    def session_count(self) -> int:
+        return sum(len(shard) for shard in self.sessions)
+
+
+class SQLiteStore(Store):
+    """SQLite (WAL) store shared across worker processes"""
+
+    def __init__(self, path: str, timeout: float = 5.0,
+                 session_ttl: float = SESSION_TTL):
+        self.path = path
+        self.timeout = timeout
+        self.session_ttl = session_ttl
+        self.local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS wallets (
+                            user_id TEXT PRIMARY KEY,
+                            balance REAL NOT NULL)""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                            session_id TEXT PRIMARY KEY,
+                            expires_at REAL NOT NULL,
+                            data TEXT NOT NULL)""")
+        conn.execute("""CREATE INDEX IF NOT EXISTS sessions_expiry
+                        ON sessions (expires_at)""")
+
+    def _conn(self) -> sqlite3.Connection:
+        """One autocommit connection per thread"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout,
+                                   isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _ensure_wallet(self, conn: sqlite3.Connection, user_id: str):
+        conn.execute("INSERT OR IGNORE INTO wallets VALUES (?, ?)",
+                     (user_id, DEFAULT_BALANCE))
+
+    def balance(self, user_id: str) -> float:
+        conn = self._conn()
+        self._ensure_wallet(conn, user_id)
+        row = conn.execute("SELECT balance FROM wallets WHERE user_id = ?",
+                           (user_id,)).fetchone()
+        return row[0]
+
+    def debit(self, user_id: str, amount: float) -> float:
+        conn = self._conn()
+        self._ensure_wallet(conn, user_id)
+        row = conn.execute("""UPDATE wallets SET balance = balance - ?
+                              WHERE user_id = ? AND balance >= ?
+                              RETURNING balance""",
+                           (amount, user_id, amount)).fetchone()
+        if row is None:
+            raise InsufficientBalance(user_id)
+        return row[0]
+
+    def credit(self, user_id: str, amount: float) -> float:
+        conn = self._conn()
+        self._ensure_wallet(conn, user_id)
+        row = conn.execute("""UPDATE wallets SET balance = balance + ?
+                              WHERE user_id = ? RETURNING balance""",
+                           (amount, user_id)).fetchone()
+        return row[0]
+
+    def open_session(self, session_id: str, session: Dict):
+        expires_at = time.time() + self.session_ttl
+        session = dict(session, expiresAt=expires_at)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+            (session_id, expires_at, json.dumps(session)))
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT data FROM sessions WHERE session_id = ?",
+            (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def claim_session(self, session_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "DELETE FROM sessions WHERE session_id = ? RETURNING data",
+            (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pop_expired(self, now: float = None) -> List[Dict]:
+        now = time.time() if now is None else now
+        rows = self._conn().execute(
+            "DELETE FROM sessions WHERE expires_at <= ? RETURNING data",
+            (now,)).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def session_count(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+class SessionSweeper:
+    """Background thread that expires abandoned sessions"""
+
+    def __init__(self, store: Store, policy: str = 'forfeit',
+                 interval: float = 5.0):
+        if policy not in EXPIRY_POLICIES:
+            raise ValueError(f"policy must be one of {EXPIRY_POLICIES}")
+
+        self.store = store
+        self.policy = policy
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # Metrics
+        self.expired = 0
+        self.paid_out = 0.0
+        self.sweeps = 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True,
+                                           name='session-sweeper')
+            self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+            self.stop_event.clear()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[SWEEP] failed: {e}")
+
+    def sweep(self, now: float = None) -> int:
+        """Expire due sessions and apply the policy; returns the count"""
+        expired = self.store.pop_expired(now)
+
+        for session in expired:
+            if self.policy == 'refund':
+                amount = session['betAmount']
+            elif self.policy == 'settle':
+                amount = session['targetPayout']
+            else:
+                amount = 0.0
+
+            if amount > 0:
+                self.store.credit(session['userId'], amount)
+                self.paid_out += amount
+
+        self.expired += len(expired)
+        self.sweeps += 1
+        if expired:
+            print(f"[SWEEP] expired {len(expired)} sessions ({self.policy})")
+        return len(expired)
+
+    def metrics(self) -> Dict:
+        return {
+            'live': self.store.session_count(),
+            'expired': self.expired,
+            'paidOut': self.paid_out,
+            'policy': self.policy,
+            'ttl': self.store.session_ttl,
+            'sweeps': self.sweeps,
+        }
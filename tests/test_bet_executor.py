@@ -0,0 +1,58 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from bet_executor import BetExecutor, Saturated
+
+
+class FailingPool:
+    def __init__(self, error):
+        self.error = error
+
+    def submit(self, *args):
+        raise self.error
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def executor():
+    executor = BetExecutor(workers=1)
+    yield executor
+    executor.close()
+
+
+def test_failed_submit_releases_its_slot(executor):
+    executor.pool.shutdown()
+    executor.pool = FailingPool(RuntimeError('cannot schedule new futures'))
+
+    for _ in range(executor.max_pending + 1):
+        with pytest.raises(RuntimeError):
+            executor.submit(1.0, False)
+
+    assert executor.pending == 0
+
+
+def test_broken_pool_is_replaced(executor):
+    executor.pool.shutdown()
+    executor.pool = FailingPool(BrokenProcessPool('worker died'))
+
+    game = executor.generate_game(1.0)
+
+    assert game['script'] is not None
+    assert executor.restarts == 1
+
+
+def test_retry_after_is_the_time_to_drain_the_backlog(executor):
+    executor.pending = executor.max_pending
+    assert executor._retry_after() == 1
+
+    # 2 jobs per worker at 1.5 s each
+    executor.avg_ms = 1500.0
+    assert executor._retry_after() == 3
+
+    with pytest.raises(Saturated) as error:
+        executor.submit(1.0, False)
+    assert error.value.retry_after == 3
+    executor.pending = 0
@@ -0,0 +1,58 @@
+import io
+import contextlib
+
+import pytest
+from flask import Flask
+
+import api
+from game_pool import GamePool, _pregenerate
+from metrics import GenerationMetrics
+from script_cache import ScriptCache
+from stores import MemoryStore
+
+
+@pytest.fixture
+def pool():
+    # Not started: queues are filled by hand and never refilled
+    return GamePool(workers=1)
+
+
+@pytest.fixture
+def client(monkeypatch, pool):
+    monkeypatch.setattr(api, 'store', MemoryStore())
+    monkeypatch.setattr(api, 'script_cache', ScriptCache())
+    monkeypatch.setattr(api, 'game_pool', pool)
+    monkeypatch.setattr(api, 'generation_metrics', GenerationMetrics())
+    app = Flask(__name__)
+    app.register_blueprint(api.api_blueprint, url_prefix='/api')
+    return app.test_client()
+
+
+def test_pooled_games_are_rescaled_and_tagged(pool):
+    with contextlib.redirect_stdout(io.StringIO()):
+        unit = _pregenerate(False)
+    pool.queues[False].append(unit)
+
+    game = pool.take(25.0)
+
+    assert game['source'] == 'pool'
+    assert game['seed'] == unit['seed']
+    assert game['targetPayout'] == pytest.approx(unit['targetPayout'] * 25.0)
+    assert pool.served_pooled == 1
+
+
+def test_pool_refill_work_is_not_bet_latency(client, pool):
+    with contextlib.redirect_stdout(io.StringIO()):
+        pool.queues[False].append(_pregenerate(False))
+
+    assert client.post('/api/bet', json={'betAmount': 10}).status_code == 200
+    metrics = api.generation_metrics.snapshot()
+    assert metrics['games'] == 0
+    assert metrics['sources']['pool']['games'] == 1
+
+    # Empty queue: generated while the bet waits
+    assert client.post('/api/bet', json={'betAmount': 10}).status_code == 200
+    metrics = api.generation_metrics.snapshot()
+    assert metrics['games'] == 1
+    assert metrics['sources']['pool']['games'] == 1
+    assert pool.served_inline == 1
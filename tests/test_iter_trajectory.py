@@ -0,0 +1,90 @@
+import pytest
+
+from game_engine import GameEngine, TrajectoryPoint
+
+
+class CountingEngine(GameEngine):
+    """Counts physics steps"""
+
+    steps = 0
+
+    def _step(self, *args):
+        self.steps += 1
+        return super()._step(*args)
+
+
+def layout(engine, seed, tier='medium'):
+    """Pipeline and searched correction clouds of one seed"""
+    rng = engine.mulberry32(seed)
+    outcome = engine.roll_outcome(rng, tier)
+    target_x, target_y, _ = engine._determine_target(outcome, rng)
+    segments = engine.generate_pipeline(target_x, target_y, outcome, rng)
+    return segments, engine.place_correction_clouds(segments, rng)
+
+
+def eager_verify(engine, segments, clouds):
+    """verify_corrections on a full run"""
+    check_ys, check_segs, ideal_xs = engine._correction_checks(segments)
+    points = engine.find_points_at_ys(engine.simulate_trajectory(clouds), check_ys)
+    return all(point is None or abs(point.x - ideal_x) <= (seg.tolerance if seg else 200)
+               for point, seg, ideal_x in zip(points, check_segs, ideal_xs))
+
+
+@pytest.fixture
+def engine():
+    return CountingEngine()
+
+
+def test_stream_yields_the_simulated_samples(engine):
+    _, clouds = layout(engine, 1)
+    start = TrajectoryPoint(300, 150, 2, 4, 7)
+
+    for kwargs in ({}, {'start': start, 'sample_interval': 1}, {'stop_y': 2500}):
+        assert list(engine.iter_trajectory(clouds, **kwargs)) == \
+            list(engine.simulate_trajectory(clouds, **kwargs))
+
+
+def test_stream_stops_where_the_consumer_does(engine):
+    _, clouds = layout(engine, 2)
+    full = engine.simulate_trajectory(clouds)
+    target_y = full.y[len(full) // 4]
+
+    engine.steps = 0
+    point = engine.find_point_at_y(engine.iter_trajectory(clouds), target_y)
+
+    assert point == engine.find_point_at_y(full, target_y)
+    assert 0 < engine.steps < full.step[-1] / 2
+
+
+def test_points_on_a_stream_match_the_index(engine):
+    _, clouds = layout(engine, 3)
+    full = engine.simulate_trajectory(clouds)
+    ys = sorted([-500.0, full.y[0], full.y[5], 1234.5, full.y[-1], 1e9] +
+                [full.y[len(full) // 2] + 0.25] * 2)
+
+    assert list(engine.iter_points_at_ys(engine.iter_trajectory(clouds), ys)) == \
+        engine.find_points_at_ys(full, ys)
+    assert list(engine.iter_points_at_ys(iter([]), ys)) == [None] * len(ys)
+
+
+def test_verify_corrections_stops_at_the_first_miss(engine):
+    verdicts = set()
+    streamed = simulated = 0
+    for seed in range(8):
+        segments, clouds = layout(engine, seed)
+        other_segments, _ = layout(engine, seed + 100, 'low')
+        for pipeline in (segments, other_segments):
+            engine.steps = 0
+            verified = engine.verify_corrections(pipeline, clouds)
+            steps = engine.steps
+
+            assert verified == eager_verify(engine, pipeline, clouds)
+            full_steps = engine.simulate_trajectory(clouds).step[-1]
+            assert steps <= full_steps
+            verdicts.add(verified)
+            streamed += steps
+            simulated += full_steps
+
+    assert verdicts == {True, False}
+    # Misses stop at the failing check, passes after the last one
+    assert streamed < 0.9 * simulated
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from game_engine import (GameEngine, PathSegment, PipelineIndex, TensionLevel,
+                         Trajectory, TrajectoryIndex, TrajectoryPoint)
+
+
+# The linear scans the indexes replace
+
+def linear_point_at_y(trajectory, target_y):
+    for i, point in enumerate(trajectory):
+        if point.y >= target_y:
+            if i == 0:
+                return point.copy()
+
+            prev = trajectory[i - 1]
+            if abs(point.y - prev.y) < 0.001:
+                return point.copy()
+
+            t = (target_y - prev.y) / (point.y - prev.y)
+            return TrajectoryPoint(
+                prev.x + (point.x - prev.x) * t,
+                target_y,
+                prev.vx + (point.vx - prev.vx) * t,
+                prev.vy + (point.vy - prev.vy) * t,
+                prev.step
+            )
+
+    return trajectory[-1].copy() if trajectory else None
+
+
+def linear_ideal_x_at_y(segments, y):
+    for seg in segments:
+        if seg.y_start <= y <= seg.y_end:
+            if abs(seg.y_end - seg.y_start) < 0.001:
+                return seg.ideal_x_start
+
+            t = (y - seg.y_start) / (seg.y_end - seg.y_start)
+            return seg.ideal_x_start + (seg.ideal_x_end - seg.ideal_x_start) * t
+
+    if y < segments[0].y_start:
+        return segments[0].ideal_x_start
+    return segments[-1].ideal_x_end
+
+
+def linear_tolerance_at_y(segments, y):
+    for seg in segments:
+        if seg.y_start <= y <= seg.y_end:
+            return seg.tolerance
+    return 200
+
+
+# Random inputs
+
+def random_trajectory(rng):
+    """Falls with bounces (y going back up) and repeated ys"""
+    points, y = [], rng.uniform(-100, 100)
+    for step in range(rng.randint(0, 60)):
+        points.append(TrajectoryPoint(rng.uniform(0, 800), y, rng.uniform(-5, 5),
+                                      rng.uniform(-5, 5), step * 3))
+        roll = rng.random()
+        y += 0 if roll < 0.1 else rng.uniform(-40, -1) if roll < 0.3 else rng.uniform(1, 60)
+    return points
+
+
+def random_pipeline(rng):
+    """Ordered, overlapping, empty or upward spans"""
+    segments, y = [], rng.uniform(-100, 100)
+    for _ in range(rng.randint(1, 12)):
+        roll = rng.random()
+        length = (0 if roll < 0.1 else rng.uniform(-80, -1) if roll < 0.2
+                  else rng.uniform(1, 300))
+        y_start = y - rng.uniform(0, 50) if rng.random() < 0.1 else y
+        segments.append(PathSegment(y_start, y_start + length, rng.uniform(0, 800),
+                                    rng.uniform(0, 800), rng.uniform(20, 200),
+                                    rng.choice(list(TensionLevel)), 0.0))
+        y = y_start + max(length, 0)
+    return segments
+
+
+def queries(rng, ys):
+    """Sample ys themselves, points between them and both ends"""
+    picks = [rng.choice(ys) for _ in range(10)] if ys else []
+    return picks + [rng.uniform(-300, max(ys, default=0) + 300) for _ in range(30)]
+
+
+@pytest.fixture
+def engine():
+    return GameEngine()
+
+
+def test_point_lookups_match_the_linear_scan(engine):
+    rng = random.Random(19)
+    for _ in range(500):
+        points = random_trajectory(rng)
+        ys = queries(rng, [p.y for p in points])
+        expected = [linear_point_at_y(points, y) for y in ys]
+
+        trajectory = Trajectory.from_points(points)
+        for source in (points, trajectory, TrajectoryIndex(trajectory)):
+            assert [engine.find_point_at_y(source, y) for y in ys] == expected
+            assert engine.find_points_at_ys(source, ys) == expected
+
+
+def test_pipeline_lookups_match_the_linear_scan(engine):
+    rng = random.Random(20)
+    ordered = 0
+    for _ in range(500):
+        segments = random_pipeline(rng)
+        ys = queries(rng, [seg.y_start for seg in segments] + [seg.y_end for seg in segments])
+        expected = [linear_ideal_x_at_y(segments, y) for y in ys]
+        pipeline = PipelineIndex(segments)
+        ordered += pipeline.ordered
+
+        for source in (segments, pipeline):
+            assert [engine.get_ideal_x_at_y(source, y) for y in ys] == expected
+            assert engine.get_ideal_xs_at_ys(source, ys) == expected
+            assert [engine.get_tolerance_at_y(source, y) for y in ys] == \
+                [linear_tolerance_at_y(segments, y) for y in ys]
+
+    # Both the bisect path and the linear fallback were exercised
+    assert 0 < ordered < 500
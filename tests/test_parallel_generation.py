@@ -0,0 +1,73 @@
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from game_engine import GameEngine
+
+
+class RecordingExecutor:
+    """Submits to a pool, noting whether earlier attempts were all done"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.futures = []
+        self.overlapped = False
+
+    def submit(self, *args):
+        self.overlapped |= not all(f.done() for f in self.futures)
+        future = self.pool.submit(*args)
+        self.futures.append(future)
+        return future
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(2) as pool:
+        yield pool
+
+
+def test_parallel_generate_game_returns_profiled_game(executor):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = GameEngine().generate_game(10, executor=executor, workers=2)
+
+    assert game['script']['spawns'] is not None
+    assert 'validation' in game['profile']['stages']
+    assert 'parallel_wait' in game['profile']['stages']
+
+
+def test_parallel_generate_game_matches_seeded_replay(executor):
+    engine = GameEngine()
+    engine.generate_seed = lambda: 12345
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = engine.generate_game(10, executor=executor, workers=2)
+        replay = GameEngine().generate_game_from_seed(12345, 10)
+
+    assert game['seed'] == replay['seed']
+    assert game['script'] == replay['script']
+
+
+def test_parallel_fallback_is_seeded(executor):
+    engine = GameEngine()
+    engine.generate_seed = lambda: 777
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = engine.generate_game(10, max_retries=0, executor=executor, workers=2)
+
+    assert game['fallback']
+    assert game['seed'] == 777
+
+
+def test_parallel_attempts_stay_within_workers(executor):
+    # Root seed 2 is only accepted on a retry
+    recording = RecordingExecutor(executor)
+    engine = GameEngine()
+    engine.generate_seed = lambda: 2
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = engine.generate_game(10, executor=recording, workers=1)
+        replay = GameEngine().generate_game_from_seed(2, 10)
+
+    assert game['seed'] != 2
+    assert game['script'] == replay['script']
+    assert len(recording.futures) > 1
+    assert not recording.overlapped
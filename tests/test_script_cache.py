@@ -0,0 +1,85 @@
+import sys
+
+import pytest
+
+import script_cache
+from script_cache import ScriptCache, SESSION_ENTRY_BYTES
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(script_cache, 'time', clock)
+    return clock
+
+
+BODY = b'x' * 1000
+BODY_BYTES = sys.getsizeof(BODY)
+
+
+def test_least_recently_used_is_evicted_first(clock):
+    cache = ScriptCache(max_bytes=3 * BODY_BYTES)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, 'application/json', BODY)
+
+    assert cache.get('a', 'application/json') == BODY
+    cache.put('d', 'application/json', BODY)
+
+    assert cache.get('b', 'application/json') is None
+    assert [cache.get(key, 'application/json') for key in ('a', 'c', 'd')] == [BODY] * 3
+    assert cache.evictions == 1
+    assert len(cache.entries) == 3
+
+
+def test_byte_budget_counts_every_entry(clock):
+    cache = ScriptCache(max_bytes=2 * BODY_BYTES + SESSION_ENTRY_BYTES)
+    cache.remember('s1', {'seed': 1})
+    cache.put('a', 'application/json', BODY)
+    cache.put('a', 'application/vnd.dtb.script', BODY)
+    assert cache.bytes == 2 * BODY_BYTES + SESSION_ENTRY_BYTES
+    assert cache.evictions == 0
+
+    # Replacing an entry releases its old size first
+    cache.put('a', 'application/json', BODY)
+    assert cache.bytes == 2 * BODY_BYTES + SESSION_ENTRY_BYTES
+
+    cache.put('b', 'application/json', BODY)
+    assert cache.session('s1') is None
+    assert cache.get('a', 'application/vnd.dtb.script') is None
+    assert cache.bytes <= cache.max_bytes
+    assert cache.evictions == 2
+
+    # Larger than the whole budget: not cached, nothing evicted for it
+    cache.put('huge', 'application/json', b'x' * cache.max_bytes)
+    assert cache.get('huge', 'application/json') is None
+    assert cache.evictions == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ScriptCache(ttl=60)
+    cache.remember('s1', {'seed': 1})
+    cache.put('a', 'application/json', BODY)
+
+    clock.now += 59
+    assert cache.session('s1') == {'seed': 1}
+
+    # Reading doesn't extend the lifetime; a new put does
+    cache.put('a', 'application/json', BODY)
+    clock.now += 2
+    assert cache.session('s1') is None
+    assert cache.get('a', 'application/json') == BODY
+    assert cache.expirations == 1
+    assert cache.bytes == BODY_BYTES
+
+    clock.now += 60
+    assert cache.get('a', 'application/json') is None
+    assert cache.expirations == 2
+    assert cache.bytes == 0
@@ -0,0 +1,107 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from game_engine import GameEngine
+from script_codec import MAGIC, _Reader, encode_bet_response, decode_bet_response
+
+DECODER = Path(__file__).resolve().parent.parent / 'public' / 'scriptcodec.js'
+
+GAME_KEYS = ('sessionId', 'seed', 'targetPayout', 'multiplier', 'outcomeType', 'script')
+
+
+def bet_response(seed, tier, bonus_mode=False, render_only_strength=None):
+    engine = GameEngine(render_only_strength=render_only_strength)
+    game = engine.generate_game_from_seed(seed, 10.0, bonus_mode, tier)
+    return dict({k: game[k] for k in GAME_KEYS}, balance=990.0)
+
+
+def synthetic_response():
+    """Negative zigzags, multi-byte varints and records that travel as extras"""
+    big = 2 ** 40
+    preset = {'strength': 0.3, 'spread': 2}
+    spawns = [
+        {'type': 'cloud', 'x': -big, 'y': big, 'centerY': -big,
+         'radius': big, 'role': 'correction', 'influence': preset},
+        {'type': 'darkcloud', 'x': -1, 'y': -big},
+        {'type': 'cloud', 'x': 0, 'y': -5, 'centerY': 130, 'radius': 0,
+         'role': 'ambient', 'influence': {}},
+        {'type': 'blackhole', 'x': 12.5, 'y': 300},
+        {'type': 'darkcloud', 'x': 200, 'y': -big},
+    ]
+    return {
+        'sessionId': 'synthetic',
+        'seed': 2 ** 32 - 1,
+        'targetPayout': 0.0,
+        'multiplier': 0,
+        'outcomeType': 'dead',
+        'script': {
+            'stopAtY': -big,
+            'spawns': spawns,
+            'collectibles': [{'type': 'coin', 'x': -300, 'y': big},
+                             {'type': 'coin', 'x': 3, 'y': 7, 'value': 2}],
+            'renderOnly': [{'type': 'cloud', 'x': -7, 'y': -7, 'centerY': -9,
+                            'radius': 200, 'role': 'decor', 'influence': preset},
+                           {'type': 'cloud', 'x': 1.5, 'y': 0}],
+            'scoreProgression': [{'y': big, 'score': -12.34},
+                                 {'y': -big, 'score': big / 100}],
+        },
+        'balance': -0.01,
+    }
+
+
+@pytest.fixture(scope='module')
+def responses():
+    return {
+        'dead': bet_response(11, 'dead'),
+        'low': bet_response(22, 'low'),
+        'low-bonus': bet_response(33, 'low', bonus_mode=True),
+        'jackpot': bet_response(44, 'jackpot'),
+        'render-only': bet_response(55, 'low', render_only_strength=0.5),
+        'fallback': dict({k: v for k, v in GameEngine()._generate_death_fallback(
+            5.0, False, 66).items() if k in GAME_KEYS}, balance=1.0),
+        'synthetic': synthetic_response(),
+    }
+
+
+def test_decode_inverts_encode(responses):
+    assert responses['render-only']['script']['renderOnly']
+
+    for name, response in responses.items():
+        assert decode_bet_response(encode_bet_response(response)) == response, name
+
+
+def test_synthetic_records_use_the_sections(responses):
+    data = encode_bet_response(responses['synthetic'])
+    reader = _Reader(data, len(MAGIC))
+    header_len = reader.uvarint()
+    codec = json.loads(data[reader.pos:reader.pos + header_len])['codec']
+
+    # Only the records that can't be columns travel in the header
+    assert [i for i, _ in codec['extraSpawns']] == [3]
+    assert [i for i, _ in codec['extraCollectibles']] == [1]
+    assert [i for i, _ in codec['extraRenderOnly']] == [1]
+    assert codec['scoreProgression'] is None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_client_decoder_matches(responses, tmp_path):
+    cases = {name: encode_bet_response(r).hex() for name, r in responses.items()}
+    (tmp_path / 'cases.json').write_text(json.dumps(cases))
+    script = (f"import {{ decodeBetResponse }} from '{DECODER.as_uri()}';\n"
+              "import fs from 'fs';\n"
+              "const cases = JSON.parse(fs.readFileSync(process.argv[1]));\n"
+              "const out = {};\n"
+              "for (const [name, hex] of Object.entries(cases))\n"
+              "    out[name] = decodeBetResponse(Buffer.from(hex, 'hex'));\n"
+              "process.stdout.write(JSON.stringify(out));\n")
+
+    decoded = json.loads(subprocess.run(
+        ['node', '--input-type=module', '-e', script, str(tmp_path / 'cases.json')],
+        capture_output=True, text=True, check=True).stdout)
+
+    for name, response in responses.items():
+        assert decoded[name] == response, name
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from flask import Flask
+
+import api
+from script_cache import ScriptCache
+from script_codec import MEDIA_TYPE, decode_bet_response
+from stores import MemoryStore
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, 'store', MemoryStore())
+    monkeypatch.setattr(api, 'script_cache', ScriptCache())
+    app = Flask(__name__)
+    app.register_blueprint(api.api_blueprint, url_prefix='/api')
+    return app.test_client()
+
+
+def script_bytes(payload):
+    return json.dumps(payload['script'], sort_keys=True).encode()
+
+
+def test_replay_matches_the_served_script(client):
+    for _ in range(3):
+        bet = client.post('/api/bet', json={'userId': 'alice', 'betAmount': 10})
+        assert bet.status_code == 200
+        served = bet.get_json()
+        session_id = served['sessionId']
+
+        replayed = client.get(f'/api/script/{session_id}').get_json()
+        assert script_bytes(replayed) == script_bytes(served)
+        assert replayed['seed'] == served['seed']
+        assert replayed['targetPayout'] == served['targetPayout']
+
+        # Still replayable from the cache once /resolve removed the session
+        client.post('/api/resolve', json={'sessionId': session_id})
+        binary = client.get(f'/api/script/{session_id}', headers={'Accept': MEDIA_TYPE})
+        assert binary.mimetype == MEDIA_TYPE
+        assert script_bytes(decode_bet_response(binary.data)) == script_bytes(served)
+
+
+def test_replay_of_an_unknown_session_is_404(client):
+    assert client.get('/api/script/missing').status_code == 404
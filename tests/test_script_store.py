@@ -0,0 +1,103 @@
+import io
+import json
+import contextlib
+
+import pytest
+
+import api
+import script_store
+from game_engine import GameEngine
+from script_codec import MEDIA_TYPE, decode_bet_response
+from script_store import ScriptStore, FALLBACK, FIRST_ATTEMPT, TIERS, build
+
+
+@pytest.fixture(scope='module')
+def store(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('store') / 'scripts.bin')
+    with contextlib.redirect_stdout(io.StringIO()):
+        build(path, per_tier=3, workers=1)
+    store = ScriptStore(path)
+    yield store
+    store.close()
+
+
+def flags_by_record(store):
+    return {store._entry(k)[0]: store._entry(k)[-1] for k in range(len(store))}
+
+
+def session(game):
+    """The session /api/bet opens for a stored game"""
+    return {'seed': game['seed'], 'betAmount': game['betAmount'] / (10 if game['bonusMode'] else 1),
+            'bonusMode': game['bonusMode'], 'outcomeType': game['outcomeType'],
+            'fallback': game['fallback']}
+
+
+def served_and_replayed(store, game, balance=500.0):
+    """Both response formats of a stored game, and its /script replay as a response"""
+    served = json.loads(store.render(game, balance, 'application/json'))
+    compact = json.loads(json.dumps(decode_bet_response(store.render(game, balance, MEDIA_TYPE))))
+    with contextlib.redirect_stdout(io.StringIO()):
+        replay = api.replay_game(session(game))
+    expected = json.loads(json.dumps({
+        'sessionId': game['sessionId'],
+        'seed': replay['seed'],
+        'targetPayout': replay['targetPayout'],
+        'multiplier': replay['multiplier'],
+        'outcomeType': replay['outcomeType'],
+        'script': replay['script'],
+        'balance': balance,
+    }))
+    return served, compact, expected
+
+
+def test_take_serves_first_attempts_that_replay(store, monkeypatch):
+    flags = flags_by_record(store)
+    seeds = iter(range(1, 1000))
+    monkeypatch.setattr(store.engine, 'generate_seed', lambda: next(seeds))
+
+    tiers = set()
+    for n in range(40):
+        bet_amount, bonus_mode = (2.5, False) if n % 3 else (10.0, True)
+        game = dict(store.take(bet_amount, bonus_mode), bonusMode=bonus_mode)
+        assert flags[game['_record']] & (FIRST_ATTEMPT | FALLBACK)
+        tiers.add(game['outcomeType'])
+
+        served, compact, expected = served_and_replayed(store, game)
+        assert served == expected
+        assert compact == expected
+
+    assert len(tiers) > 2
+
+
+def test_retried_seeds_replay_on_their_first_attempt(store):
+    retried = [k for k in range(len(store))
+               if not store._entry(k)[-1] & (FIRST_ATTEMPT | FALLBACK)]
+    # The build seed gives some games that were only accepted on a retry
+    assert retried
+
+    for k in retried:
+        game = dict(store.entry(k, 10.0), bonusMode=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            replay = GameEngine().generate_game_from_seed(game['seed'], 10.0, False,
+                                                          game['outcomeType'])
+        served, compact, expected = served_and_replayed(store, game)
+
+        assert replay['seed'] == game['seed']
+        assert served == expected
+        assert served['script'] == json.loads(json.dumps(replay['script']))
+
+
+def test_exhausted_retries_serve_the_seeded_fallback(store, monkeypatch):
+    monkeypatch.setattr(script_store, 'MAX_RETRIES', 0)
+
+    game = dict(store.take(5.0), bonusMode=False)
+    served, compact, expected = served_and_replayed(store, game)
+
+    assert game['fallback'] and game['outcomeType'] == 'dead'
+    assert store._entry(store.fallback)[-1] & FALLBACK
+    assert served == expected == compact
+
+
+def test_every_tier_is_stored(store):
+    assert sorted(store.tiers) == sorted(TIERS)
+    assert all(count == 3 for _, count in store.tiers.values())
@@ -0,0 +1,67 @@
+"""
+Fixed-seed output snapshots.
+
+Digests of generate_game_from_seed results (minus sessionId and
+profile). Performance work must keep them; a change that is meant to
+alter game output re-records them with `python -m tests.test_snapshots`.
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from game_engine import GameEngine
+
+
+# (seed, bonus mode, forced tier or None for a rolled one)
+CASES = [(seed, bonus, None) for bonus in (False, True) for seed in range(1, 11)] + \
+    [(11, False, 'high'), (12, False, 'jackpot'), (13, False, 'mega'), (14, True, 'mega')]
+
+
+def digest(seed, bonus_mode, tier):
+    game = GameEngine().generate_game_from_seed(seed, 10.0, bonus_mode, tier)
+    game = {k: v for k, v in game.items() if k not in ('sessionId', 'profile')}
+    return hashlib.sha256(json.dumps(game, sort_keys=True).encode()).hexdigest()
+
+
+SNAPSHOTS = {
+    (1, False, None): '9c9a08fa5bedac1ea93934dc09a3af759fb3c20f8af9843e2d2fcfb8423fcd6d',
+    (2, False, None): '368f9ae5e0db03b6de8807ae25c5394550a1c8c0f0072966a4f6fafd22cdb64e',
+    (3, False, None): '6000e93b66b6f25c91401908382c37a8e03bb2d9cd35248caf3874460d3b47b8',
+    (4, False, None): 'd0f4feacbb2f6e0215383a0b54fe83ed42bfefe240d257b72f6794e014762807',
+    (5, False, None): '57fa9fac4cc2326cf4a0dc5f3b853835c0f0cae5e6546dfa3084b6e972780cbc',
+    (6, False, None): '94d65b03bb5059fc5bd12d2bffc64c55222a874539db5c9f559394ce7c6c0ba4',
+    (7, False, None): 'c0998240cb35ee6246a9842a82bdef66b24c77405cdd2bcfa68a77993f679d6c',
+    (8, False, None): 'b6a52f89ad418f7416d1d36e6e4b15b91682bcedb4067c34e64b88dde7346f07',
+    (9, False, None): 'c617b870fb5c5a6058156e10c822547216e9c7dd2e512bfed47134437176e41e',
+    (10, False, None): '9f65c1008f65fc22260bdd647b675292135e7cd90f36b5151038bbe75fa58d9c',
+    (1, True, None): '5142b350bb3060cb2c1fb2695be5f0ffc0a6387c6e30ae73fcd806f799b70f32',
+    (2, True, None): '0e9d2979e9f634c40eb004c8027d3a598675bc525232898d2b9b17cd44a0e03f',
+    (3, True, None): '759dcac03a2b7d41210d1abcd9f9ce34afa04ebd931e53834934d7e861773e47',
+    (4, True, None): 'f0e8f8222274673cce559f24c9aff01dc842fb8c502a95b3314f5e3c3b60956e',
+    (5, True, None): 'b71aa1cd73a1f61b40fa80f5a4f95465e4f1889ef75e1880e724fae75d23a60e',
+    (6, True, None): '4fc4bacf9a081ceded96600b9fd5e1a5f0d8082cf49299e93fd2bcf21329da46',
+    (7, True, None): '4abbcf114d52787531d078d7f96b14bc2c6502945426f4d46beb77e42d7c3ba5',
+    (8, True, None): '0588cfc77620e738c0d13efb2f575965895bbecb84c8d2eb19b819c600ac05bb',
+    (9, True, None): '440dada622b720661a91ade1afdd56793de14e4c5ef2eb39ae43d3047cd692de',
+    (10, True, None): 'efdf3b0e78919425920d899b81a2b1ce4a76179cae08e8cfb4fa9165d54135e4',
+    (11, False, 'high'): 'c44b489b0f836afc57fc98360eba54da8da561bf2574156e280a2b9349841639',
+    (12, False, 'jackpot'): 'c3e9d667aaf9ec0a23c86158c49fc6fced013390d05f62d1982f979b2fe7a08b',
+    (13, False, 'mega'): '8c7aa7bfeb25d32afd81096ac0c29ba2b99183de3f8a4c83f0b64e63ab828bb3',
+    (14, True, 'mega'): '5d21364978758d64f0e5a187d9f9a70ea46d1a6991c0e9a76f574263ae129b2f',
+}
+
+
+@pytest.mark.parametrize('seed, bonus_mode, tier', CASES)
+def test_output_matches_the_snapshot(seed, bonus_mode, tier):
+    assert digest(seed, bonus_mode, tier) == SNAPSHOTS[seed, bonus_mode, tier]
+
+
+if __name__ == '__main__':
+    import io
+    import contextlib
+    for case in CASES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = digest(*case)
+        print(f"    {case!r}: '{value}',")
@@ -0,0 +1,145 @@
+import threading
+
+import pytest
+from flask import Flask
+
+import api
+from stores import (MemoryStore, SQLiteStore, SessionSweeper, InsufficientBalance,
+                    DEFAULT_BALANCE)
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryStore(session_ttl=60)
+    # A file, not :memory:, so every thread's connection sees the same wallets
+    return SQLiteStore(str(tmp_path / 'wallets.db'), session_ttl=60)
+
+
+def session(user_id='alice', bet=10.0, payout=25.0):
+    return {'userId': user_id, 'betAmount': bet, 'targetPayout': payout}
+
+
+def test_overdraft_raises_and_keeps_the_balance(store):
+    with pytest.raises(InsufficientBalance):
+        store.debit('alice', DEFAULT_BALANCE + 0.01)
+
+    assert store.balance('alice') == DEFAULT_BALANCE
+    assert store.debit('alice', DEFAULT_BALANCE) == 0
+
+
+def test_threaded_debits_never_overdraw(store):
+    bet = 7.0
+    debited = []
+    lock = threading.Lock()
+
+    def spend():
+        while True:
+            try:
+                balance = store.debit('alice', bet)
+            except InsufficientBalance:
+                return
+            assert balance >= 0
+            with lock:
+                debited.append(bet)
+
+    threads = [threading.Thread(target=spend) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(debited) == int(DEFAULT_BALANCE // bet)
+    assert store.balance('alice') == pytest.approx(DEFAULT_BALANCE - sum(debited))
+    assert 0 <= store.balance('alice') < bet
+
+
+def test_claim_session_returns_it_once(store):
+    store.open_session('s1', session())
+
+    claimed = store.claim_session('s1')
+
+    assert claimed['targetPayout'] == 25.0
+    assert store.claim_session('s1') is None
+    assert store.get_session('s1') is None
+
+
+def test_pop_expired_skips_claimed_and_reopened_sessions(store):
+    store.open_session('claimed', session())
+    store.open_session('reopened', session())
+    store.open_session('abandoned', session())
+    expires_at = store.get_session('abandoned')['expiresAt']
+
+    store.claim_session('claimed')
+    store.session_ttl = 3600
+    store.open_session('reopened', session(payout=40.0))
+
+    expired = store.pop_expired(expires_at + 1)
+
+    assert [s['targetPayout'] for s in expired] == [25.0]
+    assert store.get_session('reopened')['targetPayout'] == 40.0
+    assert store.pop_expired(expires_at + 1) == []
+    assert store.session_count() == 1
+
+
+def test_double_resolve_pays_once(monkeypatch):
+    store = MemoryStore()
+    monkeypatch.setattr(api, 'store', store)
+    app = Flask(__name__)
+    app.register_blueprint(api.api_blueprint, url_prefix='/api')
+    client = app.test_client()
+
+    store.debit('alice', 10.0)
+    store.open_session('s1', session())
+
+    first = client.post('/api/resolve', json={'sessionId': 's1'})
+    second = client.post('/api/resolve', json={'sessionId': 's1'})
+
+    assert first.get_json() == {'payout': 25.0, 'balance': DEFAULT_BALANCE + 15.0}
+    assert second.status_code == 400
+    assert store.balance('alice') == DEFAULT_BALANCE + 15.0
+
+
+@pytest.mark.parametrize('policy, paid', [('forfeit', 0.0), ('refund', 10.0),
+                                          ('settle', 25.0)])
+def test_sweep_applies_the_expiry_policy(store, policy, paid):
+    sweeper = SessionSweeper(store, policy=policy)
+    store.debit('alice', 10.0)
+    store.open_session('s1', session())
+    expires_at = store.get_session('s1')['expiresAt']
+
+    assert sweeper.sweep(expires_at - 1) == 0
+    assert sweeper.sweep(expires_at + 1) == 1
+
+    assert store.balance('alice') == DEFAULT_BALANCE - 10.0 + paid
+    assert sweeper.paid_out == paid
+    assert sweeper.expired == 1
+    assert store.session_count() == 0
+
+
+def test_sweep_does_not_pay_a_resolved_session(store):
+    sweeper = SessionSweeper(store, policy='settle')
+    store.debit('alice', 10.0)
+    store.open_session('s1', session())
+    expires_at = store.get_session('s1')['expiresAt']
+
+    resolved = store.claim_session('s1')
+    store.credit(resolved['userId'], resolved['targetPayout'])
+
+    assert sweeper.sweep(expires_at + 1) == 0
+    assert store.balance('alice') == DEFAULT_BALANCE + 15.0
+    assert sweeper.paid_out == 0
+
+
+def test_init_store_uses_the_expiry_policy(monkeypatch):
+    monkeypatch.setattr(api, 'store', api.store)
+    monkeypatch.setattr(api, 'session_sweeper', None)
+    api.init_store(session_ttl=30, expiry_policy='refund')
+    try:
+        assert api.session_sweeper.policy == 'refund'
+        assert api.store.session_ttl == 30
+    finally:
+        api.session_sweeper.stop()
+
+    with pytest.raises(ValueError):
+        api.init_store(expiry_policy='void')
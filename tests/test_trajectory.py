@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from game_engine import GameEngine, Trajectory, TrajectoryPoint
+
+
+@pytest.fixture
+def points():
+    rng = random.Random(20)
+    return [TrajectoryPoint(rng.uniform(0, 800), rng.uniform(-200, 3000),
+                            rng.uniform(-5, 5), rng.uniform(-5, 5), step)
+            for step in range(0, 90, 3)]
+
+
+def test_indexing_and_iteration_behave_like_the_list(points):
+    trajectory = Trajectory.from_points(points)
+
+    assert len(trajectory) == len(points)
+    assert list(trajectory) == points
+    assert [trajectory[i] for i in range(-len(points), len(points))] == \
+        [points[i] for i in range(-len(points), len(points))]
+    for i in (len(points), -len(points) - 1):
+        with pytest.raises(IndexError):
+            trajectory[i]
+
+    # Items are copies, like TrajectoryPoint.copy()
+    trajectory[0].x = -1.0
+    assert trajectory[0] == points[0]
+
+
+def test_slices_behave_like_the_list(points):
+    trajectory = Trajectory.from_points(points)
+    rng = random.Random(2)
+
+    for _ in range(200):
+        part = slice(rng.choice([None, *range(-40, 40)]),
+                     rng.choice([None, *range(-40, 40)]),
+                     rng.choice([None, 1, 2, 5, -1, -3]))
+        sliced = trajectory[part]
+        assert isinstance(sliced, Trajectory)
+        assert list(sliced) == points[part]
+        assert list(sliced.peak) == list(trajectory.peak)[part]
+
+    # A slice owns its columns
+    head = trajectory[:5]
+    head.append(0.0, 0.0, 0.0, 0.0, 99, 0.0)
+    assert len(trajectory) == len(points)
+
+
+def test_equality_with_lists_and_trajectories(points):
+    trajectory = Trajectory.from_points(points)
+
+    assert trajectory == points
+    assert trajectory == Trajectory.from_points(points)
+    assert trajectory != points[:-1]
+    assert Trajectory() == []
+
+    moved = [p.copy() for p in points]
+    moved[7].vy += 1e-9
+    assert trajectory != moved
+
+
+def test_peaks(points):
+    trajectory = Trajectory.from_points(points)
+    running = [max(p.y for p in points[:i + 1]) for i in range(len(points))]
+    assert list(trajectory.peak) == running
+
+    start = TrajectoryPoint(400, 120, 0, 5)
+    assert list(Trajectory(start).peak) == [120]
+    assert Trajectory(start) == [start]
+
+
+def test_sampled_runs_keep_the_unsampled_peaks():
+    engine = GameEngine()
+    game = engine.generate_game_from_seed(6, 10.0, outcome_type='low')
+    clouds = [s for s in game['script']['spawns'] if s['type'] == 'cloud']
+
+    every_step = engine.simulate_trajectory(clouds, sample_interval=1)
+    sampled = engine.simulate_trajectory(clouds, sample_interval=3)
+    by_step = {step: i for i, step in enumerate(every_step.step)}
+
+    assert len(sampled) < len(every_step)
+    for k, step in enumerate(sampled.step):
+        i = by_step[step]
+        assert sampled[k] == every_step[i]
+        assert sampled.peak[k] == every_step.peak[i] == max(every_step.y[:i + 1])
@@ -0,0 +1,78 @@
+import pytest
+from flask import Flask
+
+import api
+from game_engine import GameEngine, configure, configured, _run_validated_attempt
+from script_cache import ScriptCache
+from stores import MemoryStore
+from trajectory_atlas import HEADER, TrajectoryAtlas, write_atlas
+
+
+def layout(x):
+    return [{'type': 'cloud', 'x': x, 'y': 900, 'centerY': 930, 'radius': 60,
+             'role': 'guide', 'influence': {'bounce': 0.4, 'friction': 0.9,
+                                            'vx_delta': 0.0}}]
+
+
+@pytest.fixture
+def atlas_path(tmp_path):
+    path = str(tmp_path / 'atlas.bin')
+    write_atlas(path, {('ground', 8, 3): [layout(400), layout(420)]})
+    yield path
+    configure()
+
+
+def test_digest_identifies_the_build(atlas_path):
+    configure(None, atlas_path)
+    settings = configured()
+    digest = GameEngine.atlas.digest
+
+    assert settings == (None, atlas_path, digest)
+    assert GameEngine.atlas.metrics()['digest'] == digest
+    assert GameEngine.atlas.layout(400, 1700, 'ground', 1) == layout(420)
+
+    # Same contents, same build
+    write_atlas(atlas_path, {('ground', 8, 3): [layout(400), layout(420)]})
+    configure(*settings)
+    assert configured() == settings
+
+    # A fresh worker, after the file was rebuilt in place
+    write_atlas(atlas_path, {('ground', 8, 3): [layout(500)]})
+    configure()
+    with pytest.raises(ValueError):
+        configure(*settings)
+    with pytest.raises(ValueError):
+        _run_validated_attempt(10.0, False, 'low', 0, 1, settings)
+    assert GameEngine.atlas is None
+
+    # Without a digest the new build is taken
+    configure(None, atlas_path)
+    assert GameEngine.atlas.digest != digest
+
+
+def test_corrupt_atlas_is_refused(atlas_path):
+    with open(atlas_path, 'r+b') as f:
+        f.seek(HEADER.size + 2)
+        f.write(b'\xff')
+
+    with pytest.raises(ValueError):
+        TrajectoryAtlas(atlas_path)
+
+
+def test_replay_refuses_a_rebuilt_atlas(atlas_path, monkeypatch):
+    monkeypatch.setattr(api, 'store', MemoryStore())
+    monkeypatch.setattr(api, 'script_cache', ScriptCache())
+    app = Flask(__name__)
+    app.register_blueprint(api.api_blueprint, url_prefix='/api')
+    client = app.test_client()
+
+    configure(None, atlas_path)
+    bet = client.post('/api/bet', json={'userId': 'alice', 'betAmount': 10}).get_json()
+    script = f"/api/script/{bet['sessionId']}"
+    assert client.get(script).get_json()['script'] == bet['script']
+
+    # Restarted on a rebuilt atlas
+    write_atlas(atlas_path, {('ground', 8, 3): [layout(500)]})
+    configure()
+    configure(None, atlas_path)
+    assert client.get(script).status_code == 409
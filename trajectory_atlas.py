@@ -0,0 +1,257 @@
+"""
+DROP THE BOSS - Trajectory Atlas
+================================
+
+Offline-built control-cloud layouts, indexed by outcome target:
+
+    (stop_method, target x bucket, target y bucket) -> layouts
+
+Every layout is the correction-cloud set place_correction_clouds found
+for a pipeline ending at the bucket's center, kept only if its run stays
+within the pipeline tolerance at every check point. At bet time the
+engine picks one for the rolled target, jitters it and re-verifies it
+against the bet's own pipeline (GameEngine.atlas_corrections), falling
+back to the multi-pass search when it doesn't hold.
+
+File layout (little-endian), read through mmap:
+
+    header   MAGIC, version, x bucket, y bucket, keys, layouts, clouds,
+             digest (first 16 bytes of the SHA-256 of everything after
+             the header)
+    keys     method code, x bucket, y bucket, first layout, layout count
+    layouts  first cloud, cloud count
+    clouds   x, y, centerY, radius, role code, bounce, friction, vx_delta
+
+Only the key table is decoded at load; layouts are read on lookup.
+The digest identifies the build: configured() carries it, so workers
+and replays refuse an atlas rebuilt under the same path.
+
+Usage:
+    python trajectory_atlas.py build --out trajectory_atlas.bin [--layouts 4]
+"""
+
+import io
+import os
+import mmap
+import hashlib
+import time
+import struct
+import argparse
+import contextlib
+from typing import Dict, List, Tuple
+
+from game_engine import GameEngine, OUTCOMES
+
+
+MAGIC = b'DTBT'
+VERSION = 2
+
+HEADER = struct.Struct('<4sHHHIII16s')
+KEY = struct.Struct('<BhhIH')
+LAYOUT = struct.Struct('<IH')
+CLOUD = struct.Struct('<hhhhBddd')
+
+X_BUCKET = 50
+Y_BUCKET = 500
+
+METHODS = ('trap', 'ground', 'tank', 'camp', 'blackhole')
+FIXED_Y_METHODS = ('ground', 'tank', 'camp')  # always land at GROUND_COLLISION_Y
+ROLES = ('guide', 'redirect')
+
+TIERS = [outcome_type for _, _, _, outcome_type in OUTCOMES]
+
+
+def digest(body) -> bytes:
+    return hashlib.sha256(body).digest()[:16]
+
+
+def bucket(target_x: float, target_y: float) -> Tuple[int, int]:
+    return int(target_x // X_BUCKET), int(target_y // Y_BUCKET)
+
+
+class TrajectoryAtlas:
+    """Memory-mapped atlas file (see module docstring)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, x_bucket, y_bucket, n_keys, n_layouts, n_clouds, build = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a version {VERSION} trajectory atlas")
+        if (x_bucket, y_bucket) != (X_BUCKET, Y_BUCKET):
+            raise ValueError(f"{path}: built for {x_bucket}x{y_bucket} buckets")
+        if digest(self.data[HEADER.size:]) != build:
+            raise ValueError(f"{path}: contents don't match the header digest")
+        self.digest = build.hex()
+
+        self.layouts_at = HEADER.size + n_keys * KEY.size
+        self.clouds_at = self.layouts_at + n_layouts * LAYOUT.size
+        self.layout_count = n_layouts
+        self.cloud_count = n_clouds
+
+        self.keys: Dict[Tuple[str, int, int], Tuple[int, int]] = {}
+        for method, xb, yb, first, count in KEY.iter_unpack(
+                self.data[HEADER.size:self.layouts_at]):
+            self.keys[(METHODS[method], xb, yb)] = (first, count)
+
+    def close(self):
+        self.data.close()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def layout_count_at(self, target_x: float, target_y: float,
+                        stop_method: str) -> int:
+        entry = self.keys.get((stop_method,) + bucket(target_x, target_y))
+        return entry[1] if entry else 0
+
+    def layout(self, target_x: float, target_y: float, stop_method: str,
+               k: int) -> List[Dict]:
+        """Cloud dicts of layout k for the target's bucket"""
+        first, count = self.keys[(stop_method,) + bucket(target_x, target_y)]
+        if not 0 <= k < count:
+            raise IndexError(k)
+
+        cloud_first, cloud_count = LAYOUT.unpack_from(
+            self.data, self.layouts_at + (first + k) * LAYOUT.size)
+        clouds = []
+        for i in range(cloud_first, cloud_first + cloud_count):
+            x, y, center_y, radius, role, bounce, friction, vx_delta = \
+                CLOUD.unpack_from(self.data, self.clouds_at + i * CLOUD.size)
+            clouds.append({
+                'type': 'cloud',
+                'x': x,
+                'y': y,
+                'centerY': center_y,
+                'radius': radius,
+                'role': ROLES[role],
+                'influence': {'bounce': bounce, 'friction': friction,
+                              'vx_delta': vx_delta},
+            })
+        return clouds
+
+    def metrics(self) -> Dict:
+        return {
+            'path': self.path,
+            'digest': self.digest,
+            'keys': len(self.keys),
+            'layouts': self.layout_count,
+            'clouds': self.cloud_count,
+            'bytes': len(self.data),
+        }
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def atlas_keys(engine: GameEngine, samples: int) -> Dict[Tuple[str, int, int], float]:
+    """Every (method, x bucket, y bucket) _determine_target produced in
+    `samples` draws per tier, with a target y to build it for"""
+    keys = {}
+    for t, tier in enumerate(TIERS):
+        for n in range(samples):
+            rng = engine.mulberry32(t * 1_000_003 + n)
+            outcome = engine.roll_outcome(rng, tier)
+            target_x, target_y, stop_method = engine._determine_target(outcome, rng)
+            if stop_method not in METHODS:
+                continue
+            xb, yb = bucket(target_x, target_y)
+            # Bucket middle for banded targets, the exact y for fixed ones
+            y = target_y if stop_method in FIXED_Y_METHODS else (yb + 0.5) * Y_BUCKET
+            keys[(stop_method, xb, yb)] = y
+    return keys
+
+
+def build_layouts(engine: GameEngine, stop_method: str, xb: int, target_y: float,
+                  count: int, attempts: int) -> List[List[Dict]]:
+    """Up to count verified correction layouts for one key"""
+    target_x = (xb + 0.5) * X_BUCKET
+    tier = {'trap': 'low', 'ground': 'low', 'tank': 'medium',
+            'camp': 'high', 'blackhole': 'jackpot'}[stop_method]
+
+    layouts, seen = [], set()
+    for n in range(attempts):
+        if len(layouts) == count:
+            break
+        rng = engine.mulberry32((METHODS.index(stop_method) << 24) + (xb << 16)
+                                + (int(target_y) // Y_BUCKET << 8) + n)
+        outcome = engine.roll_outcome(rng, tier)
+        segments = engine.generate_pipeline(target_x, target_y, outcome, rng)
+        clouds = engine.place_correction_clouds(segments, rng)
+
+        key = tuple((c['x'], c['centerY']) for c in clouds)
+        if not clouds or key in seen or not engine.verify_corrections(segments, clouds):
+            continue
+        seen.add(key)
+        layouts.append(clouds)
+    return layouts
+
+
+def write_atlas(path: str, entries: Dict[Tuple[str, int, int], List[List[Dict]]]):
+    keys, layouts, clouds = bytearray(), bytearray(), bytearray()
+    n_layouts = n_clouds = 0
+
+    for (method, xb, yb), key_layouts in sorted(entries.items()):
+        if not key_layouts:
+            continue
+        keys += KEY.pack(METHODS.index(method), xb, yb, n_layouts, len(key_layouts))
+        for layout in key_layouts:
+            layouts += LAYOUT.pack(n_clouds, len(layout))
+            n_layouts += 1
+            for c in layout:
+                influence = c['influence']
+                clouds += CLOUD.pack(c['x'], c['y'], c['centerY'], c['radius'],
+                                     ROLES.index(c['role']), influence['bounce'],
+                                     influence['friction'], influence.get('vx_delta', 0))
+                n_clouds += 1
+
+    body = keys + layouts + clouds
+    header = HEADER.pack(MAGIC, VERSION, X_BUCKET, Y_BUCKET,
+                         len(keys) // KEY.size, n_layouts, n_clouds, digest(body))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(header + body)
+    os.replace(tmp, path)
+
+
+def build(path: str, layouts: int = 4, attempts: int = 24, samples: int = 400):
+    engine = GameEngine()
+    started = time.perf_counter()
+
+    entries = {}
+    keys = atlas_keys(engine, samples)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for (method, xb, yb), target_y in keys.items():
+            entries[(method, xb, yb)] = build_layouts(engine, method, xb, target_y,
+                                                      layouts, attempts)
+
+    write_atlas(path, entries)
+    atlas = TrajectoryAtlas(path)
+    print(f"{path}: {atlas.metrics()} from {len(keys)} target buckets "
+          f"in {time.perf_counter() - started:.1f}s")
+    atlas.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    build_parser = sub.add_parser('build', help='build an atlas file')
+    build_parser.add_argument('--out', default='trajectory_atlas.bin')
+    build_parser.add_argument('--layouts', type=int, default=4,
+                              help='layouts kept per target bucket')
+    build_parser.add_argument('--attempts', type=int, default=24,
+                              help='searches tried per target bucket')
+    build_parser.add_argument('--samples', type=int, default=400,
+                              help='targets drawn per tier to find the buckets')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        build(args.out, args.layouts, args.attempts, args.samples)
+
+
+if __name__ == '__main__':
+    main()